@@ -0,0 +1,119 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from datetime import date as date_type
+
+from app.core.database import get_async_db
+from app.crud.batch import BATCH_TABLES, load_batch_columns_async
+from app.services.export import MEDIA_TYPES, arrow_available, export_indicators
+from app.services.indicator_registry import DEFAULT_INDICATORS, PUBLIC_INDICATORS, REGISTRY
+from app.crud.technical_indicator import INDICATOR_COLUMNS
+from app.schemas.technical_indicator import IndicatorBatchRequest
+from app.schemas.job import JobResponse
+from app.services.jobs import UNIVERSE, job_runner, recompute_all_pipeline
+
+router = APIRouter(prefix="/indicators", tags=["indicators"])
+
+@router.get("/registry", response_model=List[dict])
+def list_registered_indicators():
+    """
+    Indicators that can be computed, with their inputs, parameters, lookback
+    and warm-up (bars of history loaded before the first output, null when
+    the whole history is needed), whether they are stored in their own
+    column or in `extra`, and whether they are computed by default (indicators
+    needing the whole history are only computed when requested by name).
+    """
+    return [
+        {
+            **REGISTRY[name].describe(),
+            "storage": "column" if name in INDICATOR_COLUMNS else "extra",
+            "default": name in DEFAULT_INDICATORS
+        }
+        for name in PUBLIC_INDICATORS
+    ]
+
+@router.post("/batch")
+async def read_indicators_batch(request: IndicatorBatchRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Indicators (and prices) of many symbols in one call, for dashboards.
+    
+    Runs one query per table touched by `columns`, filtering with
+    symbol = ANY(...); `last_n` keeps the most recent rows of each symbol
+    (1 = latest) with a window function. The response is columnar:
+    `{"indicators": {"symbol": [...], "date": [...], "rsi_14": [...]},
+    "prices": {...}, "missing": [...]}`, rows grouped by symbol then sorted by date,
+    one block per table and `missing` listing symbols without any row.
+    """
+    # Drop duplicates, keep request order
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in request.symbols))
+    columns = request.columns or INDICATOR_COLUMNS
+    
+    known = {name for _, names in BATCH_TABLES.values() for name in names}
+    unknown = [name for name in columns if name not in known]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+    
+    payload = {}
+    found = set()
+    for block, (table, names) in BATCH_TABLES.items():
+        selected = [name for name in dict.fromkeys(columns) if name in names]
+        if not selected:
+            continue
+        payload[block] = await load_batch_columns_async(
+            db, table, symbols, selected, request.start_date, request.end_date, request.last_n
+        )
+        found.update(payload[block]['symbol'])
+    payload['missing'] = [symbol for symbol in symbols if symbol not in found]
+    
+    # Plain lists of str/float/None, serialized by orjson without FastAPI's encoder
+    return ORJSONResponse(payload)
+
+@router.post("/recompute-all", status_code=202, response_model=JobResponse)
+def recompute_all_indicators(
+    days: Optional[int] = Query(None, ge=1),
+    engine: Literal["panel", "talib"] = "panel",
+    workers: Optional[int] = Query(None, ge=1, le=os.cpu_count())
+):
+    """
+    Recompute technical indicators for the whole universe, as a background job.
+    
+    engine=panel runs vectorized NumPy passes over the symbols,
+    engine=talib splits symbols across a process pool running TA-Lib
+    (`workers` processes, default CPU count). Symbols are processed and
+    committed in chunks (INDICATOR_RECOMPUTE_CHUNK symbols at a time).
+    
+    Uses the most recent `days` bars of every symbol, or their full history
+    when `days` is omitted.
+    Returns the job right away; poll GET /jobs/{job_id} for symbol/row
+    counts and load/compute/write timings.
+    """
+    return job_runner.submit("recompute-all", UNIVERSE, recompute_all_pipeline(days, engine, workers))
+
+@router.get("/export")
+def export_all_indicators(
+    symbols: Optional[List[str]] = Query(None),
+    start_date: Optional[date_type] = None,
+    end_date: Optional[date_type] = None,
+    format: Literal["ndjson", "csv", "arrow"] = "ndjson"
+):
+    """
+    Stream every indicator row for the given symbols and date range.
+    
+    Meant for BI refreshes: rows are read with a server-side cursor and sent
+    in chunks (NDJSON, CSV or Arrow IPC stream), with no row limit and
+    constant memory.
+    """
+    if format == "arrow" and not arrow_available():
+        raise HTTPException(status_code=400, detail="format=arrow requires the pyarrow package")
+    if symbols:
+        # Drop duplicates, keep request order
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    
+    extension = "arrows" if format == "arrow" else format
+    return StreamingResponse(
+        export_indicators(format, symbols, start_date, end_date),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="indicators.{extension}"'}
+    )
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException
+
+from app.schemas.job import JobResponse
+from app.services.jobs import job_runner
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str):
+    """
+    Get the state of a background job, with per-stage status and timings.
+    """
+    job = job_runner.get(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    return job
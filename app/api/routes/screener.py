@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date as date_type
+
+from app.core.database import get_async_db
+from app.crud.screener import screen_async
+from app.schemas.screener import ScreenerResult
+from app.services.screener import SCREENER_FIELDS, parse_filters, parse_sort
+
+router = APIRouter(prefix="/screener", tags=["screener"])
+
+@router.get("", response_model=List[ScreenerResult])
+async def screen_symbols(
+    filters: Optional[List[str]] = Query(None, alias="filter"),
+    sort: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    min_date: Optional[date_type] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Find the symbols whose latest indicators match every filter.
+    
+    Each `filter` is `<field> <op> <number or field>` with op one of
+    < <= > >= = !=, e.g. `filter=rsi_14<30&filter=close>sma_200`.
+    Fields are close, volume and the indicators (see GET /indicators/registry).
+    `sort` is a field, prefixed with `-` for descending (default: symbol).
+    `min_date` skips symbols without indicators on or after that date.
+    """
+    try:
+        parsed = parse_filters(filters)
+        sort_field, descending = parse_sort(sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return await screen_async(db, parsed, sort_field, descending, limit, min_date)
+
+@router.get("/fields", response_model=List[str])
+def list_screener_fields():
+    """
+    Fields usable in screener filters and sorting.
+    """
+    return SCREENER_FIELDS
@@ -1,55 +1,184 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
 
 # import for stock prices api
-from app.core.database import get_db
-from app.schemas.stock import StockPriceCreate, StockPriceResponse
-from app.crud.stock import create_stock_price, get_stock_prices, get_stock_price_by_id
-from app.services.ingestion import ingest_stock_data
+from app.core.cache import indicator_cache
+from app.core.database import get_db, get_async_db
+from app.core.pagination import MAX_PAGE_SIZE, encode_cursor, decode_cursor
+from app.core.price_store import price_store
+from app.schemas.stock import SYMBOL_PATTERN, StockPriceCreate, StockPriceResponse, StockIngestRequest
+from app.crud.projection import parse_fields
+from app.crud.stock import create_stock_price, get_stock_prices_async, get_stock_price_rows_async, get_stock_price_by_id_async
+from app.crud.rollup import (
+    Interval, get_rollup_prices_async, get_rollup_price_rows_async, get_rollup_indicators_async, get_rollup_indicator_rows_async
+)
+from app.models.rollup import PriceRollup
+from app.models.stock import StockPrice
+from app.models.technical_indicator import TechnicalIndicator
+from app.services.rollups import refresh_rollups
+from app.services.ingestion import IngestionMode, ingest_stock_data, ingest_many_stock_data
 
 # import for technical indicators api
 from app.services.technical_indicator import TechnicalIndicatorsService
-from app.crud.technical_indicator import save_indicators, get_latest_indicators, get_indicators_by_date_range
+from app.services.indicator_registry import unknown_indicators
+from app.crud.technical_indicator import (
+    save_indicators, get_latest_indicators, get_latest_indicators_async, get_indicators_by_date_range_async,
+    get_indicator_rows_async
+)
 from app.schemas.technical_indicator import TechnicalIndicatorResponse
+
+# import for background jobs
+from app.schemas.job import JobResponse
+from app.services.jobs import job_runner, full_ingest_pipeline
 from datetime import date as date_type
 
 router = APIRouter(prefix="/stocks", tags=["stocks"])
 
+def _fields(fields: Optional[List[str]], model) -> Optional[list[str]]:
+    try:
+        return parse_fields(fields, model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _ingest_symbol(symbol: str = Path(..., pattern=SYMBOL_PATTERN)) -> str:
+    # Validated and upper-cased like the batch endpoints, so "aapl" and
+    # "AAPL" are the same symbol
+    return symbol.upper()
+
+def _fast_response(rows: list[dict], last_key: Optional[tuple], limit: int, symbol: Optional[str] = None) -> ORJSONResponse:
+    response = ORJSONResponse(rows)
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(symbol or last_key[0], last_key[1])
+    return response
+
 # stock prices api
 @router.post("/", response_model=StockPriceResponse)
 def add_stock_price(stock_data: StockPriceCreate, db: Session = Depends(get_db)):
-    return create_stock_price(db, stock_data)
+    try:
+        stock = create_stock_price(db, stock_data)
+    except IntegrityError as e:
+        db.rollback()
+        if 'uix_stock_prices_symbol_date' not in str(e.orig):
+            raise
+        raise HTTPException(status_code=409, detail="Stock price already exists for this symbol and date")
+    # The bar and its rollups are committed together, then the caches dropped
+    refresh_rollups(db, stock_data.symbol, since=stock_data.date)
+    db.commit()
+    indicator_cache.invalidate(stock_data.symbol)
+    price_store.invalidate(stock_data.symbol)
+    return stock
 
 @router.get("/", response_model=List[StockPriceResponse])
-def list_stock_prices(symbol: Optional[str] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return get_stock_prices(db, symbol, skip, limit)
+async def list_stock_prices(
+    response: Response,
+    symbol: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    after_date: Optional[date_type] = None,
+    cursor: Optional[str] = None,
+    interval: Interval = "1d",
+    fields: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List stock prices grouped by symbol and sorted by date.
+    
+    Use `cursor` (from the X-Next-Cursor header of the previous page) or
+    `after_date` for keyset pagination; `skip` is kept for compatibility.
+    interval=1w|1mo|1q returns pre-aggregated bars dated by period start.
+    
+    `fields` (e.g. `fields=date,close`, `*` for every column) returns only
+    those columns through the fast path: plain rows serialized by orjson,
+    without per-row response model validation. Use it for large pages.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    projected = _fields(fields, StockPrice if interval == "1d" else PriceRollup)
+    if projected:
+        if interval == "1d":
+            rows, last_key = await get_stock_price_rows_async(db, projected, symbol, skip, limit, after_date=after_date, after=after)
+        else:
+            rows, last_key = await get_rollup_price_rows_async(db, projected, interval, symbol, skip, limit, after_date=after_date, after=after)
+        return _fast_response(rows, last_key, limit)
+    
+    if interval == "1d":
+        prices = await get_stock_prices_async(db, symbol, skip, limit, after_date=after_date, after=after)
+    else:
+        prices = await get_rollup_prices_async(db, interval, symbol, skip, limit, after_date=after_date, after=after)
+    
+    if len(prices) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(prices[-1].symbol, prices[-1].date)
+    return prices
 
 @router.get("/{stock_id}", response_model=StockPriceResponse)
-def get_stock_price(stock_id: int, db: Session = Depends(get_db)):
-    stock = get_stock_price_by_id(db, stock_id)
+async def get_stock_price(stock_id: int, db: AsyncSession = Depends(get_async_db)):
+    stock = await get_stock_price_by_id_async(db, stock_id)
     if not stock:
         raise HTTPException(status_code=404, detail="Stock price not found")
     return stock
 
+@router.post("/ingest")
+async def ingest_stocks(request: StockIngestRequest):
+    """
+    Ingest several symbols concurrently.
+    
+    Downloads share the Alpha Vantage token bucket, so the API quota is kept
+    fully used without blocking the event loop.
+    """
+    # Drop duplicates, keep request order
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in request.symbols))
+    results = await ingest_many_stock_data(symbols, request.mode)
+    
+    return {
+        "results": results,
+        "succeeded": sum(1 for r in results if r["status"] == "success"),
+        "failed": sum(1 for r in results if r["status"] == "error")
+    }
+
 @router.post("/ingest/{symbol}")
-def ingest_stock(symbol: str, db: Session = Depends(get_db)):
-    result = ingest_stock_data(db, symbol)
+def ingest_stock(symbol: str = Depends(_ingest_symbol), mode: IngestionMode = "auto", db: Session = Depends(get_db)):
+    result = ingest_stock_data(db, symbol, mode)
     return result
 
 # technical indicators api
 @router.post("/{symbol}/indicators", response_model=dict)
-def calculate_and_save_indicators(symbol: str, db: Session = Depends(get_db)):
+def calculate_and_save_indicators(
+    symbol: str,
+    mode: Literal["full", "incremental"] = "full",
+    indicators: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_db)
+):
     """
     Calculate technical indicators for a symbol and save to database.
     
+    mode=full recomputes the latest 200 days with TA-Lib, mode=incremental
+    only computes bars newer than the symbol's stored rolling state.
+    `indicators` restricts mode=full to some registry indicators (see
+    GET /indicators/registry), the other stored values are kept. Without
+    it, every indicator with a bounded warm-up is computed; indicators
+    needing the whole history (obv) have to be requested by name.
+    
     Returns summary of calculation results.
     """
+    unknown = unknown_indicators(indicators or [])
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown indicators: {', '.join(unknown)}")
+    
     service = TechnicalIndicatorsService(db)
     
     try:
         # Calculate indicators
-        df = service.calculate_indicators(symbol, days=200)
+        if mode == "incremental":
+            df = service.update_indicators_incremental(symbol)
+        else:
+            df = service.calculate_indicators(symbol, days=200, indicators=indicators)
         
         # Save to database
         saved_count = save_indicators(db, df)
@@ -59,6 +188,7 @@ def calculate_and_save_indicators(symbol: str, db: Session = Depends(get_db)):
         
         return {
             "symbol": symbol,
+            "mode": mode,
             "calculated": len(df),
             "saved": saved_count,
             "latest_date": str(latest.date) if latest else None,
@@ -70,11 +200,11 @@ def calculate_and_save_indicators(symbol: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error calculating indicators: {str(e)}")
 
 @router.get("/{symbol}/indicators/latest", response_model=TechnicalIndicatorResponse)
-def get_latest_indicator(symbol: str, db: Session = Depends(get_db)):
+async def get_latest_indicator(symbol: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get the most recent technical indicators for a symbol.
     """
-    indicator = get_latest_indicators(db, symbol)
+    indicator = await get_latest_indicators_async(db, symbol)
     
     if not indicator:
         raise HTTPException(
@@ -85,60 +215,71 @@ def get_latest_indicator(symbol: str, db: Session = Depends(get_db)):
     return indicator
 
 @router.get("/{symbol}/indicators", response_model=List[TechnicalIndicatorResponse])
-def list_indicators(
+async def list_indicators(
     symbol: str,
+    response: Response,
     start_date: Optional[date_type] = None,
     end_date: Optional[date_type] = None,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    interval: Interval = "1d",
+    fields: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get technical indicators for a symbol, optionally filtered by date range.
+    
+    Results are newest first; pass the X-Next-Cursor header of a page as
+    `cursor` to get the next (older) page; a cursor past the oldest row
+    gives an empty page. interval=1w|1mo|1q returns the indicators computed
+    on weekly, monthly or quarterly bars.
+    `fields` selects columns through the fast path, as for GET /stocks/.
     """
-    indicators = get_indicators_by_date_range(db, symbol, start_date, end_date, limit)
+    before_date = None
+    if cursor:
+        try:
+            cursor_symbol, before_date = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if cursor_symbol != symbol:
+            raise HTTPException(status_code=400, detail=f"Cursor does not belong to symbol {symbol}")
+    
+    projected = _fields(fields, TechnicalIndicator if interval == "1d" else PriceRollup)
+    if projected:
+        if interval == "1d":
+            rows, last_key = await get_indicator_rows_async(db, projected, symbol, start_date, end_date, limit, before_date=before_date)
+        else:
+            rows, last_key = await get_rollup_indicator_rows_async(db, projected, symbol, interval, start_date, end_date, limit, before_date=before_date)
+        if not rows and before_date is None:
+            raise HTTPException(status_code=404, detail=f"No indicators found for symbol {symbol}")
+        return _fast_response(rows, last_key, limit, symbol)
     
-    if not indicators:
+    if interval == "1d":
+        indicators = await get_indicators_by_date_range_async(db, symbol, start_date, end_date, limit, before_date=before_date)
+    else:
+        indicators = await get_rollup_indicators_async(db, symbol, interval, start_date, end_date, limit, before_date=before_date)
+    
+    # The previous page may have ended exactly on the oldest row
+    if not indicators and before_date is None:
         raise HTTPException(
             status_code=404,
             detail=f"No indicators found for symbol {symbol}"
         )
     
+    if len(indicators) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(symbol, indicators[-1].date)
     return indicators
 
-@router.post("/{symbol}/full-ingest")
-def full_ingest_with_indicators(symbol: str, db: Session = Depends(get_db)):
-    """
-    Complete ingestion: download prices + calculate indicators.
-    
-    This is a convenience endpoint that combines:
-    1. POST /stocks/ingest/{symbol}
-    2. POST /stocks/{symbol}/indicators
+@router.post("/{symbol}/full-ingest", status_code=202, response_model=JobResponse)
+def full_ingest_with_indicators(symbol: str = Depends(_ingest_symbol), mode: IngestionMode = "auto"):
     """
-    # Step 1: Ingest prices
-    try:
-        price_result = ingest_stock_data(db, symbol)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Price ingestion failed: {str(e)}")
+    Complete ingestion: download prices + calculate indicators, as a background job.
     
-    # Step 2: Calculate indicators
-    try:
-        service = TechnicalIndicatorsService(db)
-        df = service.calculate_indicators(symbol, days=200)
-        saved_count = save_indicators(db, df)
-        latest = get_latest_indicators(db, symbol)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Indicator calculation failed: {str(e)}")
+    Returns the job right away; it runs fetch -> persist -> compute -> save
+    (the work of POST /stocks/ingest/{symbol} then incremental indicators)
+    on the job worker pool. Poll GET /jobs/{job_id} for progress and results.
     
-    return {
-        "symbol": symbol,
-        "prices": {
-            "saved": price_result["saved"],
-            "skipped": price_result["skipped"]
-        },
-        "indicators": {
-            "calculated": len(df),
-            "saved": saved_count,
-            "latest_date": str(latest.date) if latest else None
-        },
-        "status": "success"
-    }
\ No newline at end of file
+    mode=auto backfills the full history the first time, then only fetches,
+    writes and computes bars newer than the latest stored date.
+    """
+    return job_runner.submit("full-ingest", symbol, full_ingest_pipeline(mode))
@@ -0,0 +1,264 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.config import settings
+
+
+class MemoryBackend:
+    """
+    In-process LRU store with per-entry TTL, bounded by total value size in bytes.
+    Entries can be tagged (with a symbol) and dropped by tag.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, bytes, Optional[str]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, key: str):
+        _, value, tag = self._entries.pop(key)
+        self.size -= len(value)
+        if tag is not None:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: int, tag: Optional[str] = None):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tag)
+            self.size += len(value)
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def delete_tag(self, tag: str):
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def info(self) -> dict:
+        return {"backend": "memory", "entries": len(self._entries), "bytes": self.size, "max_bytes": self.max_bytes}
+
+    # Async interface used by async routes, nothing here blocks on I/O
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: bytes, ttl: int, tag: Optional[str] = None):
+        self.set(key, value, ttl, tag)
+
+    async def aget_counter(self, key: str) -> int:
+        return self.get_counter(key)
+
+    async def aclose(self):
+        pass
+
+
+class RedisBackend:
+    """
+    Store backed by a Redis-compatible client (anything exposing get, set(ex=), incr).
+    Stale entries are never read after an invalidation (the symbol generation
+    changes) and expire through their TTL; Redis handles memory eviction.
+
+    `async_client` (e.g. redis.asyncio.Redis, same calls as coroutines)
+    serves async routes without blocking the event loop; without it the
+    sync client is called from a worker thread.
+    """
+
+    def __init__(self, client, async_client=None):
+        self.client = client
+        self.async_client = async_client
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int, tag: Optional[str] = None):
+        self.client.set(key, value, ex=ttl)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(key))
+
+    def get_counter(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value is not None else 0
+
+    def delete_tag(self, tag: str):
+        pass
+
+    def info(self) -> dict:
+        return {"backend": "redis"}
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        if self.async_client is None:
+            return await asyncio.to_thread(self.get, key)
+        return await self.async_client.get(key)
+
+    async def aset(self, key: str, value: bytes, ttl: int, tag: Optional[str] = None):
+        if self.async_client is None:
+            return await asyncio.to_thread(self.set, key, value, ttl, tag)
+        await self.async_client.set(key, value, ex=ttl)
+
+    async def aget_counter(self, key: str) -> int:
+        value = await self.aget(key)
+        return int(value) if value is not None else 0
+
+    async def aclose(self):
+        if self.async_client is not None:
+            await self.async_client.aclose()
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class QueryCache:
+    """
+    Read-through cache for per-symbol queries.
+
+    Keys combine the symbol, its current generation, a query name and the
+    query parameters. invalidate(symbol) bumps the generation, so every
+    cached query of that symbol is missed afterwards, and drops the entries
+    eagerly when the backend supports it. Values must be JSON serializable
+    (dates are stored as ISO strings).
+    """
+
+    def __init__(self, backend, ttl: int, namespace: str = "fad", enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.namespace = namespace
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        # Sync routes read the cache from threadpool threads
+        self._lock = threading.Lock()
+
+    def _generation_key(self, symbol: str) -> str:
+        return f"{self.namespace}:gen:{symbol}"
+
+    def _key(self, symbol: str, query: str, params: dict, generation: int) -> str:
+        return f"{self.namespace}:{symbol}:{generation}:{query}:{json.dumps(params, sort_keys=True, default=_json_default)}"
+
+    def _decode(self, cached: Optional[bytes]) -> tuple[bool, Any]:
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if cached is None:
+            return False, None
+        return True, json.loads(cached)
+
+    def _encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=_json_default).encode()
+
+    def get_or_load(self, symbol: str, query: str, params: dict, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached result of `query` for `symbol` and `params`, calling `loader` on a miss.
+        """
+        if not self.enabled:
+            return loader()
+
+        key = self._key(symbol, query, params, self.backend.get_counter(self._generation_key(symbol)))
+        found, value = self._decode(self.backend.get(key))
+        if not found:
+            value = loader()
+            self.backend.set(key, self._encode(value), self.ttl, tag=symbol)
+        return value
+
+    async def aget_or_load(self, symbol: str, query: str, params: dict, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Same as get_or_load with an async loader.
+        """
+        if not self.enabled:
+            return await loader()
+
+        key = self._key(symbol, query, params, await self.backend.aget_counter(self._generation_key(symbol)))
+        found, value = self._decode(await self.backend.aget(key))
+        if not found:
+            value = await loader()
+            await self.backend.aset(key, self._encode(value), self.ttl, tag=symbol)
+        return value
+
+    def invalidate(self, symbol: str):
+        """
+        Drop every cached query of a symbol (call after writing its rows).
+        """
+        if not self.enabled:
+            return
+        self.backend.incr(self._generation_key(symbol))
+        self.backend.delete_tag(symbol)
+
+    async def aclose(self):
+        await self.backend.aclose()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "evictions": self.backend.evictions,
+            **self.backend.info()
+        }
+
+
+def build_cache() -> QueryCache:
+    """
+    Create the query cache configured in settings (CACHE_BACKEND = memory | redis).
+    """
+    if settings.CACHE_BACKEND == "redis":
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise ImportError("CACHE_BACKEND=redis requires the 'redis' package")
+        # Sync client for threadpool routes and writes, asyncio client for async routes
+        backend = RedisBackend(redis.Redis.from_url(settings.REDIS_URL), redis.asyncio.Redis.from_url(settings.REDIS_URL))
+    else:
+        backend = MemoryBackend(settings.CACHE_MAX_BYTES)
+
+    return QueryCache(backend, settings.CACHE_TTL_SECONDS, enabled=settings.CACHE_ENABLED)
+
+
+indicator_cache = build_cache()
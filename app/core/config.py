@@ -1,10 +1,44 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     APP_NAME: str
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None           # default: DATABASE_URL with the asyncpg driver
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    DATABASE_STATEMENT_TIMEOUT_MS: Optional[int] = 30000   # None = no server-side timeout
+    PARTITION_INTERVAL: str = "year"                   # year | month, date range of each partition
+    PARTITION_PREMAKE: int = 1                         # future partitions created ahead of time
     ALPHA_VANTAGE_API_KEY: str
-    ALPHA_VANTAGE_RATE_LIMIT: int = 5
+    ALPHA_VANTAGE_RATE_LIMIT: int = 5                  # calls per minute
+    ALPHA_VANTAGE_DAILY_LIMIT: Optional[int] = None    # calls per day (None = no daily cap)
+    ALPHA_VANTAGE_MAX_CONNECTIONS: int = 10            # pooled connections of the async client
+    ALPHA_VANTAGE_CACHE_DIR: Optional[str] = None      # on-disk raw response cache (None = disabled)
+    ALPHA_VANTAGE_OFFLINE: bool = False                # serve only from the cache, never call the API
+    MARKET_DATA_PROVIDER: str = "alpha_vantage"        # alpha_vantage | local
+    MARKET_DATA_DIR: Optional[str] = None              # directory of CSV/Parquet dumps (local provider)
+    MARKET_DATA_CHUNK_ROWS: int = 100_000              # rows per chunk read from local files
+    INDICATOR_WORKERS: Optional[int] = None            # processes for parallel recompute (None = CPU count)
+    INDICATOR_RECOMPUTE_CHUNK: int = 200               # symbols loaded and committed together by recompute-all
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"                      # memory | redis
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024            # memory backend size bound
+    CACHE_TTL_SECONDS: int = 300
+    PRICE_STORE_ENABLED: bool = True                   # in-process price history of hot symbols
+    PRICE_STORE_MAX_BYTES: int = 128 * 1024 * 1024     # memory budget, LRU eviction beyond it
+    PRICE_STORE_DTYPE: str = "float64"                 # float64 | float32 (OHLC precision, float32 halves their size)
+    PRICE_STORE_TTL_SECONDS: int = 900                 # reload after this long (writes from other processes)
+    REDIS_URL: Optional[str] = None
+    JOB_BACKEND: str = "database"                      # database | memory
+    JOB_WORKERS: int = 4                               # background job threads
+    JOB_MAX_RETRIES: int = 2                           # retries per pipeline stage
+    JOB_RETRY_DELAY_SECONDS: float = 5.0
+    JOB_HEARTBEAT_SECONDS: float = 30.0                # how often a process touches the jobs it runs
+    JOB_STALE_SECONDS: float = 120.0                   # unfinished jobs silent this long are failed at startup
+    METRICS_LOG_QUERIES: Optional[int] = None          # log requests running at least this many queries (None = off)
     
     class Config:
         env_file = ".env"
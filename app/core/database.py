@@ -1,10 +1,55 @@
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
-engine = create_engine(settings.DATABASE_URL)
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+    }
+
+def _sync_connect_args() -> dict:
+    # libpq startup option, applies to every statement of the connection
+    if settings.DATABASE_STATEMENT_TIMEOUT_MS is None:
+        return {}
+    return {"options": f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT_MS}"}
+
+def _async_connect_args() -> dict:
+    if settings.DATABASE_STATEMENT_TIMEOUT_MS is None:
+        return {}
+    return {"server_settings": {"statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT_MS)}}
+
+def async_database_url() -> str:
+    """
+    ASYNC_DATABASE_URL, or DATABASE_URL switched to the asyncpg driver.
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+engine = create_engine(settings.DATABASE_URL, connect_args=_sync_connect_args(), **_pool_options())
+instrument_engine(engine)
 Session = sessionmaker(engine)
 
+# The async engine is created on first use, so the asyncpg driver is only
+# needed by processes that serve async routes
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSession: Optional[async_sessionmaker] = None
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _AsyncSession
+    if _async_engine is None:
+        _async_engine = create_async_engine(async_database_url(), connect_args=_async_connect_args(), **_pool_options())
+        instrument_engine(_async_engine.sync_engine)
+        _AsyncSession = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
 class Base(DeclarativeBase):
     pass
 
@@ -13,4 +58,13 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSession() as db:
+        yield db
+
+async def dispose_async_engine():
+    if _async_engine is not None:
+        await _async_engine.dispose()
@@ -0,0 +1,66 @@
+import importlib.util
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+# Schema migrations live in <repo>/migrations as NNNN_description.sql or
+# NNNN_description.py (defining upgrade(connection)). They run in name order,
+# each in its own transaction, and applied versions are recorded in the
+# schema_migrations table so running migrate() again only applies new files.
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+
+def _ensure_version_table(engine: Engine):
+    with engine.begin() as connection:
+        connection.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(100) PRIMARY KEY,
+                applied_at TIMESTAMP NOT NULL DEFAULT now()
+            )
+        """))
+
+
+def migration_files() -> list[Path]:
+    return sorted(
+        path for path in MIGRATIONS_DIR.iterdir()
+        if path.suffix in (".sql", ".py") and path.name[:4].isdigit()
+    )
+
+
+def applied_versions(connection: Connection) -> set[str]:
+    return set(connection.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+
+def _apply(connection: Connection, path: Path):
+    if path.suffix == ".sql":
+        connection.exec_driver_sql(path.read_text())
+        return
+    spec = importlib.util.spec_from_file_location(f"migrations.{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.upgrade(connection)
+
+
+def migrate(engine: Engine) -> list[str]:
+    """
+    Apply every pending migration.
+
+    Returns:
+        the versions (file stems) applied by this call
+    """
+    _ensure_version_table(engine)
+    with engine.connect() as connection:
+        done = applied_versions(connection)
+
+    applied = []
+    for path in migration_files():
+        if path.stem in done:
+            continue
+        with engine.begin() as connection:
+            _apply(connection, path)
+            connection.execute(text("INSERT INTO schema_migrations (version) VALUES (:version)"), {"version": path.stem})
+        print(f"Applied {path.name}")
+        applied.append(path.stem)
+    return applied
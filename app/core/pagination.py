@@ -0,0 +1,28 @@
+import base64
+from datetime import date
+
+# Opaque keyset cursors for list endpoints.
+# A cursor encodes the sort key of the last row of a page, the next page
+# starts right after it (WHERE (symbol, date) > cursor), so deep pages cost
+# the same as the first one, unlike OFFSET.
+
+# Largest `limit` accepted by the list endpoints
+MAX_PAGE_SIZE = 10000
+
+def encode_cursor(symbol: str, row_date: date) -> str:
+    raw = f"{symbol}|{row_date.isoformat()}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[str, date]:
+    """
+    Decode a cursor created by encode_cursor.
+    
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        symbol, raw_date = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return symbol, date.fromisoformat(raw_date)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
@@ -0,0 +1,144 @@
+import re
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+
+# stock_prices and technical_indicators are range partitioned by date, one
+# partition per year or month (PARTITION_INTERVAL). Date filtered queries
+# only scan the partitions overlapping their range (partition pruning), and
+# old history can be detached without rewriting the table.
+
+PARTITIONED_TABLES = ("stock_prices", "technical_indicators")
+
+_BOUNDS = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+
+def period_start(day: date, interval: Optional[str] = None) -> date:
+    interval = interval or settings.PARTITION_INTERVAL
+    return date(day.year, 1, 1) if interval == "year" else date(day.year, day.month, 1)
+
+
+def next_period(start: date, interval: Optional[str] = None) -> date:
+    interval = interval or settings.PARTITION_INTERVAL
+    if interval == "year":
+        return date(start.year + 1, 1, 1)
+    return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+
+def partition_name(table: str, start: date, interval: Optional[str] = None) -> str:
+    interval = interval or settings.PARTITION_INTERVAL
+    return f"{table}_y{start.year}" if interval == "year" else f"{table}_m{start.year}_{start.month:02d}"
+
+
+def list_partitions(connection: Connection, table: str) -> list[tuple[str, date, date]]:
+    """
+    Attached partitions of `table` as (name, lower bound, upper bound), oldest first.
+    """
+    rows = connection.execute(text("""
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+    """), {"table": table}).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUNDS.search(bound or "")
+        if match:
+            partitions.append((name, date.fromisoformat(match[1]), date.fromisoformat(match[2])))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def is_partitioned(connection: Connection, table: str) -> bool:
+    kind = connection.execute(
+        text("SELECT relkind FROM pg_class WHERE relname = :table AND relkind IN ('r', 'p')"), {"table": table}
+    ).scalar()
+    return kind == "p"
+
+
+# Periods known to have a committed partition, per table
+_covered: set[tuple[str, date]] = set()
+
+
+def ensure_partitions(connection: Connection, table: str, first: date, last: date, interval: Optional[str] = None) -> list[str]:
+    """
+    Create the missing partitions covering every date from `first` to `last`.
+    Cheap when nothing is missing: known partitions are remembered in process.
+
+    Returns:
+        the names of the created partitions
+    """
+    interval = interval or settings.PARTITION_INTERVAL
+    periods = []
+    start = period_start(first, interval)
+    while start <= last:
+        periods.append(start)
+        start = next_period(start, interval)
+    if all((table, start) in _covered for start in periods):
+        return []
+
+    existing = {name for name, _, _ in list_partitions(connection, table)}
+    created = []
+    for start in periods:
+        name = partition_name(table, start, interval)
+        if name in existing:
+            # Only partitions already committed are remembered, a created one
+            # disappears if the caller's transaction rolls back
+            _covered.add((table, start))
+            continue
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{next_period(start, interval).isoformat()}')"
+        ))
+        created.append(name)
+    return created
+
+
+def ensure_partitions_for(connection: Connection, table: str, dates: Iterable) -> list[str]:
+    """
+    ensure_partitions for the range of `dates` (date, datetime or pandas Timestamp values).
+    """
+    dates = [day.date() if hasattr(day, "date") else day for day in dates]
+    if not dates:
+        return []
+    return ensure_partitions(connection, table, min(dates), max(dates))
+
+
+def create_upcoming_partitions(connection: Connection, today: Optional[date] = None, ahead: Optional[int] = None) -> list[str]:
+    """
+    Make sure the current period and the next `ahead` ones (PARTITION_PREMAKE)
+    have partitions in every partitioned table. Safe to run repeatedly.
+    """
+    today = today or date.today()
+    ahead = settings.PARTITION_PREMAKE if ahead is None else ahead
+    last = period_start(today)
+    for _ in range(ahead):
+        last = next_period(last)
+
+    created = []
+    for table in PARTITIONED_TABLES:
+        created += ensure_partitions(connection, table, today, last)
+    return created
+
+
+def detach_partitions_before(connection: Connection, cutoff: date, drop: bool = False) -> list[str]:
+    """
+    Detach (and optionally drop) every partition whose dates all fall before `cutoff`.
+    Detached partitions stay as standalone tables, e.g. to be archived.
+    """
+    detached = []
+    for table in PARTITIONED_TABLES:
+        for name, lower, upper in list_partitions(connection, table):
+            if upper > cutoff:
+                continue
+            connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            _covered.discard((table, lower))
+            if drop:
+                connection.execute(text(f"DROP TABLE {name}"))
+            detached.append(name)
+    return detached
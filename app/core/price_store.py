@@ -0,0 +1,272 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+# In-process store of the daily bars of hot symbols, so repeated indicator
+# calculations do not reload the same history from Postgres.
+#
+# Each symbol's whole history is held as contiguous NumPy columns: dates as
+# int32 day ordinals (days since 1970-01-01), open/high/low/close as float64
+# (or float32 to halve their size) and volume as int64. Buffers grow by
+# doubling, so appending the bars of a daily ingestion is amortized O(1).
+# Symbols are evicted least recently used first once the allocated bytes
+# exceed the budget. Ingestion writes new bars through after committing
+# them; entries also expire after a TTL, for writes made by other processes.
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+COLUMNS = ("date",) + PRICE_FIELDS + ("volume",)
+INITIAL_CAPACITY = 256
+
+
+class SymbolSeries:
+    """
+    Growable columnar buffer of one symbol's bars, sorted by date without duplicates.
+    """
+    __slots__ = ("dates", "prices", "volume", "length", "loaded_at")
+
+    def __init__(self, capacity: int, price_dtype):
+        self.dates = np.empty(capacity, dtype=np.int32)
+        self.prices = {name: np.empty(capacity, dtype=price_dtype) for name in PRICE_FIELDS}
+        self.volume = np.empty(capacity, dtype=np.int64)
+        self.length = 0
+        self.loaded_at = time.monotonic()
+
+    @property
+    def capacity(self) -> int:
+        return len(self.dates)
+
+    @property
+    def nbytes(self) -> int:
+        return self.dates.nbytes + self.volume.nbytes + sum(array.nbytes for array in self.prices.values())
+
+    def _reserve(self, needed: int):
+        if needed <= self.capacity:
+            return
+        capacity = max(self.capacity, INITIAL_CAPACITY)
+        while capacity < needed:
+            capacity *= 2
+        n = self.length
+        for name in ("dates", "volume"):
+            grown = np.empty(capacity, dtype=getattr(self, name).dtype)
+            grown[:n] = getattr(self, name)[:n]
+            setattr(self, name, grown)
+        for name, array in self.prices.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:n] = array[:n]
+            self.prices[name] = grown
+
+    def merge(self, columns: dict):
+        """
+        Add bars (date + OHLCV columns); bars already present for a date are replaced.
+        """
+        dates = np.asarray(columns["date"]).astype("datetime64[D]").astype(np.int32)
+        k, n = len(dates), self.length
+        if k == 0:
+            return
+
+        if (n == 0 or dates[0] > self.dates[n - 1]) and (k == 1 or np.all(dates[1:] > dates[:-1])):
+            # Only newer bars, in order: append in place
+            self._reserve(n + k)
+            self.dates[n:n + k] = dates
+            for name in PRICE_FIELDS:
+                self.prices[name][n:n + k] = columns[name]
+            self.volume[n:n + k] = columns["volume"]
+            self.length = n + k
+            return
+
+        # Corrections or out of order bars: rebuild, the new value wins on equal dates
+        combined = np.concatenate([self.dates[:n], dates])
+        order = np.argsort(combined, kind="stable")
+        ordered = combined[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[:-1] = ordered[1:] != ordered[:-1]
+        index = order[keep]
+
+        merged = {name: np.concatenate([self.prices[name][:n], np.asarray(columns[name], dtype=self.prices[name].dtype)])[index]
+                  for name in PRICE_FIELDS}
+        volume = np.concatenate([self.volume[:n], np.asarray(columns["volume"], dtype=np.int64)])[index]
+        self.length = 0
+        self._reserve(len(index))
+        self.dates[:len(index)] = combined[index]
+        for name in PRICE_FIELDS:
+            self.prices[name][:len(index)] = merged[name]
+        self.volume[:len(index)] = volume
+        self.length = len(index)
+
+    def select(self, start_date: Optional[date] = None, last_n: Optional[int] = None) -> dict:
+        """
+        Copies of the bars from `start_date` and/or the last `last_n` ones,
+        as load_price_columns returns them (datetime64[D] dates, float64 prices).
+        """
+        first = 0
+        if start_date is not None:
+            ordinal = np.datetime64(start_date, "D").astype(np.int32)
+            first = int(np.searchsorted(self.dates[:self.length], ordinal))
+        if last_n:
+            first = max(first, self.length - last_n)
+        end = self.length
+        return {
+            "date": self.dates[first:end].astype("datetime64[D]"),
+            **{name: self.prices[name][first:end].astype(np.float64) for name in PRICE_FIELDS},
+            "volume": self.volume[first:end].copy()
+        }
+
+
+class PriceStore:
+    """
+    LRU map of symbol -> SymbolSeries, bounded by allocated bytes.
+    """
+
+    def __init__(self, max_bytes: int, ttl: int, price_dtype="float64", enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.price_dtype = np.dtype(price_dtype)
+        self.enabled = enabled
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._series: OrderedDict[str, SymbolSeries] = OrderedDict()
+        # Loads in flight per symbol and the writes seen while they run, a
+        # history loaded while bars were written is not kept. Both entries
+        # go away when the last load of the symbol finishes.
+        self._loading: dict[str, int] = {}
+        self._writes: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, symbol: str):
+        self.size -= self._series.pop(symbol).nbytes
+
+    def _evict(self):
+        while self.size > self.max_bytes and self._series:
+            self._remove(next(iter(self._series)))
+            self.evictions += 1
+
+    def _note_write(self, symbol: str):
+        if symbol in self._loading:
+            self._writes[symbol] = self._writes.get(symbol, 0) + 1
+
+    def _finish_load(self, symbol: str) -> int:
+        """
+        Writes seen while loads of `symbol` were in flight.
+        """
+        writes = self._writes.get(symbol, 0)
+        self._loading[symbol] -= 1
+        if not self._loading[symbol]:
+            del self._loading[symbol]
+            self._writes.pop(symbol, None)
+        return writes
+
+    def _lookup(self, symbol: str) -> Optional[SymbolSeries]:
+        series = self._series.get(symbol)
+        if series is not None and series.loaded_at + self.ttl < time.monotonic():
+            self._remove(symbol)
+            series = None
+        if series is not None:
+            self._series.move_to_end(symbol)
+        return series
+
+    def get_or_load(
+        self,
+        symbol: str,
+        loader: Callable[[Optional[date], Optional[int]], dict],
+        start_date: Optional[date] = None,
+        last_n: Optional[int] = None
+    ) -> dict:
+        """
+        Bars of `symbol` from `start_date` and/or the last `last_n` ones.
+
+        `loader(start_date, last_n)` reads the date and OHLCV columns from the
+        database. On a miss the whole history is loaded (loader(None, None))
+        and kept, unless it is empty (unknown symbol); with the store disabled
+        the filtered rows are loaded directly.
+        """
+        if not self.enabled:
+            return loader(start_date, last_n)
+
+        with self._lock:
+            series = self._lookup(symbol)
+            if series is not None:
+                self.hits += 1
+                return series.select(start_date, last_n)
+            self.misses += 1
+            self._loading[symbol] = self._loading.get(symbol, 0) + 1
+            writes = self._writes.get(symbol, 0)
+
+        try:
+            columns = loader(None, None)
+            series = SymbolSeries(max(len(columns["date"]), INITIAL_CAPACITY), self.price_dtype)
+            series.merge(columns)
+            # Selected before the series is shared, write_through may change it afterwards
+            selected = series.select(start_date, last_n)
+        except BaseException:
+            with self._lock:
+                self._finish_load(symbol)
+            raise
+        with self._lock:
+            written = self._finish_load(symbol) != writes
+            if series.length and not written and series.nbytes <= self.max_bytes:
+                if symbol in self._series:
+                    self._remove(symbol)
+                self._series[symbol] = series
+                self.size += series.nbytes
+                self._evict()
+        return selected
+
+    def write_through(self, symbol: str, columns: dict):
+        """
+        Add committed bars of a symbol that is already held (others are
+        loaded in full on their first read).
+        """
+        if not self.enabled or len(columns["date"]) == 0:
+            return
+        with self._lock:
+            self._note_write(symbol)
+            series = self._lookup(symbol)
+            if series is None:
+                return
+            before = series.nbytes
+            series.merge(columns)
+            self.size += series.nbytes - before
+            self._evict()
+
+    def invalidate(self, symbol: str):
+        with self._lock:
+            self._note_write(symbol)
+            if symbol in self._series:
+                self._remove(symbol)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "symbols": len(self._series),
+                "bars": sum(series.length for series in self._series.values()),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "price_dtype": self.price_dtype.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+def build_price_store() -> PriceStore:
+    """
+    Create the price store configured in settings (PRICE_STORE_*).
+    """
+    return PriceStore(
+        settings.PRICE_STORE_MAX_BYTES,
+        settings.PRICE_STORE_TTL_SECONDS,
+        settings.PRICE_STORE_DTYPE,
+        enabled=settings.PRICE_STORE_ENABLED
+    )
+
+
+price_store = build_price_store()
@@ -0,0 +1,88 @@
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import Float, String, Table, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.stock import PRICE_COLUMNS
+from app.crud.technical_indicator import EXTRA_INDICATORS, INDICATOR_COLUMNS
+from app.models.stock import StockPrice
+from app.models.symbol import Symbol
+from app.models.technical_indicator import TechnicalIndicator
+
+# Columns readable by the batch endpoint, grouped by the table they come from
+BATCH_TABLES = {
+    'indicators': (TechnicalIndicator.__table__, INDICATOR_COLUMNS + EXTRA_INDICATORS),
+    'prices': (StockPrice.__table__, PRICE_COLUMNS),
+}
+
+def _column(table: Table, name: str):
+    if name in table.c:
+        return table.c[name]
+    # Registry indicators without a dedicated column
+    return table.c.extra[name].astext.cast(Float).label(name)
+
+def _batch_query(
+    table: Table,
+    symbols: List[str],
+    columns: List[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    last_n: Optional[int]
+):
+    # One array parameter whatever the number of symbols, so the statement text stays the same
+    filters = [Symbol.symbol == any_(bindparam('symbols', symbols, type_=ARRAY(String)))]
+    if start_date:
+        filters.append(table.c.date >= start_date)
+    if end_date:
+        filters.append(table.c.date <= end_date)
+    
+    joined = table.join(Symbol.__table__, Symbol.id == table.c.symbol_id)
+    selected = [Symbol.symbol, table.c.date] + [_column(table, name) for name in columns]
+    if not last_n:
+        return select(*selected).select_from(joined).where(*filters).order_by(table.c.symbol_id, table.c.date)
+    
+    ranked = select(
+        *selected,
+        table.c.symbol_id,
+        func.row_number().over(partition_by=table.c.symbol_id, order_by=table.c.date.desc()).label('rn')
+    ).select_from(joined).where(*filters).subquery()
+    return select(*[ranked.c[name] for name in ['symbol', 'date'] + columns]).where(
+        ranked.c.rn <= last_n
+    ).order_by(ranked.c.symbol_id, ranked.c.date)
+
+async def load_batch_columns_async(
+    db: AsyncSession,
+    table: Table,
+    symbols: List[str],
+    columns: List[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    last_n: Optional[int] = None
+) -> dict[str, list]:
+    """
+    Read `columns` of many symbols from one table in a single query.
+    
+    Args:
+        db: Database session
+        table: technical_indicators or stock_prices
+        symbols: symbols to read
+        columns: columns to return besides symbol and date
+        start_date: first date to include (optional)
+        end_date: last date to include (optional)
+        last_n: keep only the most recent `last_n` rows of each symbol (optional)
+    
+    Returns:
+        a dict of column name -> list of values (dates as ISO strings),
+        rows grouped by symbol then sorted by date
+    """
+    result = await db.execute(_batch_query(table, symbols, columns, start_date, end_date, last_n))
+    rows = result.all()
+    names = ['symbol', 'date'] + columns
+    if not rows:
+        return {name: [] for name in names}
+    
+    values = dict(zip(names, map(list, zip(*rows))))
+    values['date'] = [day.isoformat() for day in values['date']]
+    return values
@@ -0,0 +1,77 @@
+from typing import List, Optional
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Fast read path for list endpoints: only the requested columns are selected
+# and rows come back as plain dicts, serialized straight to JSON by orjson.
+# No ORM objects are built and no response model revalidates every row.
+
+# Sort key of the list endpoints, always selected to build the next cursor
+KEY_FIELDS = ('symbol', 'date')
+
+def field_columns(model) -> dict:
+    """
+    Selectable fields of a fact table model, in column order: its columns,
+    with the ticker (read from the symbol dimension) in place of symbol_id.
+    """
+    fields = {}
+    for name, column in model.__table__.c.items():
+        if name == 'symbol_id':
+            fields['symbol'] = model.symbol
+        else:
+            fields[name] = column
+    return fields
+
+def parse_fields(fields: Optional[List[str]], model) -> Optional[list[str]]:
+    """
+    Resolve a `fields=` parameter (repeated and/or comma separated names,
+    "*" for every column) against the fields of `model` (see field_columns).
+    
+    Returns:
+        the field names in request order, or None when `fields` is not given
+    
+    Raises:
+        ValueError: unknown field
+    """
+    if not fields:
+        return None
+    available = field_columns(model)
+    names = [name.strip() for value in fields for name in value.split(',') if name.strip()]
+    if '*' in names:
+        return list(available)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(names))
+
+async def fetch_projected_async(
+    db: AsyncSession,
+    query: Select,
+    model,
+    fields: list[str]
+) -> tuple[list[dict], Optional[tuple]]:
+    """
+    Run a list query selecting only `fields` (keeping its filters, order and limit).
+    
+    Args:
+        db: Database session
+        query: select() over `model`, as built for the regular path
+        model: fact table model the query reads
+        fields: fields to return
+    
+    Returns:
+        the rows as dicts of `fields`, and the (symbol, date) of the last row
+        (None when there are no rows) for the next cursor
+    """
+    available = field_columns(model)
+    columns = list(dict.fromkeys([*fields, *KEY_FIELDS]))
+    result = await db.execute(query.with_only_columns(*[available[name] for name in columns]))
+    rows = result.all()
+    if not rows:
+        return [], None
+    
+    last = rows[-1]
+    last_key = (last[columns.index('symbol')], last[columns.index('date')])
+    count = len(fields)
+    return [dict(zip(fields, row[:count])) for row in rows], last_key
@@ -0,0 +1,189 @@
+from datetime import date
+from typing import List, Literal, Optional
+
+from sqlalchemy import Date, literal, literal_column, select, func, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert, array_agg, aggregate_order_by
+
+from app.core.cache import indicator_cache
+from app.crud.projection import fetch_projected_async
+from app.crud.symbol import symbol_id_of
+from app.crud.technical_indicator import INDICATOR_COLUMNS
+from app.models.rollup import PriceRollup
+from app.models.stock import StockPrice
+from app.schemas.technical_indicator import TechnicalIndicatorResponse
+
+# API interval -> date_trunc unit of the rollup periods ("1d" reads the daily tables)
+ROLLUP_INTERVALS = {"1w": "week", "1mo": "month", "1q": "quarter"}
+
+Interval = Literal["1d", "1w", "1mo", "1q"]
+
+ROLLUP_PRICE_COLUMNS = ['period_end', 'open', 'high', 'low', 'close', 'volume', 'bars']
+
+def upsert_rollup_bars(db: Session, symbol: str, interval: str, start: Optional[date] = None) -> int:
+    """
+    Aggregate the daily bars of `symbol` from `start` (a period start, None = all
+    history) into rollup bars and upsert them, leaving the indicators untouched.
+
+    Returns:
+        Number of rollup bars written
+    """
+    unit = ROLLUP_INTERVALS[interval]
+    # Inlined so the SELECT and GROUP BY expressions are identical
+    period = func.date_trunc(literal_column(f"'{unit}'"), StockPrice.date).cast(Date)
+
+    source = select(
+        StockPrice.symbol_id,
+        literal(interval),
+        period,
+        func.max(StockPrice.date),
+        array_agg(aggregate_order_by(StockPrice.open, StockPrice.date.asc()))[1],
+        func.max(StockPrice.high),
+        func.min(StockPrice.low),
+        array_agg(aggregate_order_by(StockPrice.close, StockPrice.date.desc()))[1],
+        func.sum(StockPrice.volume),
+        func.count()
+    ).where(StockPrice.symbol_id == symbol_id_of(symbol))
+    if start:
+        source = source.where(StockPrice.date >= start)
+    source = source.group_by(StockPrice.symbol_id, period)
+
+    stmt = insert(PriceRollup).from_select(['symbol_id', 'interval', 'date'] + ROLLUP_PRICE_COLUMNS, source)
+    stmt = stmt.on_conflict_do_update(
+        constraint='uix_price_rollups_symbol_interval_date',
+        set_={key: stmt.excluded[key] for key in ROLLUP_PRICE_COLUMNS}
+    )
+    return db.execute(stmt).rowcount
+
+def load_rollup_rows(db: Session, symbol: str, interval: str) -> list[dict]:
+    """
+    Every rollup bar of a symbol and interval (OHLCV columns), oldest first.
+    """
+    table = PriceRollup.__table__
+    query = select(*[table.c[name] for name in ['symbol_id', 'interval', 'date'] + ROLLUP_PRICE_COLUMNS]).where(
+        table.c.symbol_id == symbol_id_of(symbol), table.c.interval == interval
+    ).order_by(table.c.date)
+    return [dict(row) for row in db.execute(query).mappings()]
+
+def save_rollup_rows(db: Session, records: list[dict]) -> int:
+    """
+    Upsert full rollup rows (prices and indicators) in one statement.
+    """
+    if not records:
+        return 0
+    stmt = insert(PriceRollup).values(records)
+    stmt = stmt.on_conflict_do_update(
+        constraint='uix_price_rollups_symbol_interval_date',
+        set_={key: stmt.excluded[key] for key in ROLLUP_PRICE_COLUMNS + INDICATOR_COLUMNS}
+    )
+    return db.execute(stmt).rowcount
+
+def _rollup_prices_query(
+    interval: str,
+    symbol: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after_date: Optional[date] = None,
+    after: Optional[tuple[str, date]] = None
+):
+    query = select(PriceRollup).where(PriceRollup.interval == interval)
+    if symbol:
+        query = query.where(PriceRollup.symbol_id == symbol_id_of(symbol))
+    if after_date:
+        query = query.where(PriceRollup.date > after_date)
+    if after:
+        query = query.where(tuple_(PriceRollup.symbol_id, PriceRollup.date) > tuple_(symbol_id_of(after[0]), after[1]))
+    return query.order_by(PriceRollup.symbol_id, PriceRollup.date).offset(skip).limit(limit)
+
+async def get_rollup_prices_async(
+    db: AsyncSession,
+    interval: str,
+    symbol: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after_date: Optional[date] = None,
+    after: Optional[tuple[str, date]] = None
+):
+    """
+    Rollup bars grouped by symbol then sorted by period start, paged like get_stock_prices.
+    """
+    result = await db.execute(_rollup_prices_query(interval, symbol, skip, limit, after_date, after))
+    return result.scalars().all()
+
+async def get_rollup_price_rows_async(
+    db: AsyncSession,
+    fields: list[str],
+    interval: str,
+    symbol: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after_date: Optional[date] = None,
+    after: Optional[tuple[str, date]] = None
+) -> tuple[list[dict], Optional[tuple[str, date]]]:
+    """
+    Same rows as get_rollup_prices_async, as plain dicts of `fields`.
+    """
+    query = _rollup_prices_query(interval, symbol, skip, limit, after_date, after)
+    return await fetch_projected_async(db, query, PriceRollup, fields)
+
+def _rollup_indicators_query(
+    symbol: str,
+    interval: str,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    limit: int,
+    before_date: Optional[date]
+):
+    query = select(PriceRollup).where(PriceRollup.symbol_id == symbol_id_of(symbol), PriceRollup.interval == interval)
+
+    if start_date:
+        query = query.where(PriceRollup.date >= start_date)
+    if end_date:
+        query = query.where(PriceRollup.date <= end_date)
+    if before_date:
+        query = query.where(PriceRollup.date < before_date)
+
+    return query.order_by(PriceRollup.date.desc()).limit(limit)
+
+async def get_rollup_indicators_async(
+    db: AsyncSession,
+    symbol: str,
+    interval: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 100,
+    before_date: Optional[date] = None
+) -> List[TechnicalIndicatorResponse]:
+    """
+    Indicators of a symbol's rollup bars (dated by period start), newest first.
+
+    Served from the query cache, which refresh_rollups invalidates.
+    """
+    async def load():
+        result = await db.execute(_rollup_indicators_query(symbol, interval, start_date, end_date, limit, before_date))
+        return [
+            TechnicalIndicatorResponse.model_validate(rollup).model_dump(mode='json')
+            for rollup in result.scalars().all()
+        ]
+
+    params = {"interval": interval, "start_date": start_date, "end_date": end_date, "limit": limit, "before_date": before_date}
+    rows = await indicator_cache.aget_or_load(symbol, "rollup_range", params, load)
+    return [TechnicalIndicatorResponse.model_validate(row) for row in rows]
+
+async def get_rollup_indicator_rows_async(
+    db: AsyncSession,
+    fields: list[str],
+    symbol: str,
+    interval: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 100,
+    before_date: Optional[date] = None
+) -> tuple[list[dict], Optional[tuple[str, date]]]:
+    """
+    Same rows as get_rollup_indicators_async, as plain dicts of `fields`
+    (read from the database, not the query cache).
+    """
+    query = _rollup_indicators_query(symbol, interval, start_date, end_date, limit, before_date)
+    return await fetch_projected_async(db, query, PriceRollup, fields)
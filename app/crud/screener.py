@@ -0,0 +1,60 @@
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import Float, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.indicator_snapshot import IndicatorSnapshot
+from app.services.screener import OPERATORS, ScreenerFilter
+
+def _field(name: str):
+    column = IndicatorSnapshot.__table__.c.get(name)
+    if column is not None:
+        return column
+    return IndicatorSnapshot.extra[name].astext.cast(Float)
+
+def _screener_query(
+    filters: List[ScreenerFilter],
+    sort: str,
+    descending: bool,
+    limit: int,
+    min_date: Optional[date]
+):
+    query = select(IndicatorSnapshot)
+    for condition in filters:
+        right = condition.value if isinstance(condition.value, float) else _field(condition.value)
+        query = query.where(OPERATORS[condition.op](_field(condition.field), right))
+    if min_date:
+        query = query.where(IndicatorSnapshot.date >= min_date)
+    
+    key = _field(sort)
+    key = key.desc().nulls_last() if descending else key.asc().nulls_last()
+    # Symbol as tie breaker keeps results stable
+    return query.order_by(key, IndicatorSnapshot.symbol).limit(limit)
+
+async def screen_async(
+    db: AsyncSession,
+    filters: List[ScreenerFilter],
+    sort: str = 'symbol',
+    descending: bool = False,
+    limit: int = 100,
+    min_date: Optional[date] = None
+) -> List[IndicatorSnapshot]:
+    """
+    Symbols whose latest indicators match every filter, in one query on the
+    latest_indicators snapshot (one row per symbol, so a full universe of
+    10k+ symbols is a single small scan plus a top-N sort).
+    
+    Args:
+        db: Database session
+        filters: parsed filter expressions, all must match
+        sort: field to sort on
+        descending: sort order
+        limit: maximum number of symbols
+        min_date: skip symbols whose latest indicators are older (stale or delisted)
+    
+    Returns:
+        List of IndicatorSnapshot
+    """
+    result = await db.execute(_screener_query(filters, sort, descending, limit, min_date))
+    return result.scalars().all()
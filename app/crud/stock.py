@@ -1,20 +1,262 @@
-from typing import Optional
+from datetime import date
+from typing import Optional, Sequence
+import numpy as np
+from sqlalchemy import or_, literal_column, select, func, tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from app.core.partitions import ensure_partitions_for
+from app.crud.projection import fetch_projected_async
+from app.crud.symbol import register_symbols, symbol_id_of
+from app.crud.technical_indicator import refresh_snapshot_prices
 from app.models.stock import StockPrice
+from app.models.symbol import Symbol
 from app.schemas.stock import StockPriceCreate
 
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Rows per INSERT statement (7 params per row)
+UPSERT_BATCH_SIZE = 2000
+
+# NumPy dtype of each column returned by load_price_columns
+COLUMN_DTYPES = {
+    'symbol': object,
+    'date': 'datetime64[D]',
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.int64,
+}
+
+# Rows fetched per round trip by the server-side cursor
+LOAD_CHUNK_SIZE = 50000
+
 def create_stock_price(db: Session, stock_data: StockPriceCreate):
-    db_stock = StockPrice(**stock_data.model_dump())
+    """
+    Insert one daily bar, part of the caller's transaction: the caller
+    commits (with the rollups of the bar) and then invalidates the caches
+    of the symbol.
+    
+    Raises:
+        IntegrityError: a bar is already stored for this symbol and date
+    """
+    values = stock_data.model_dump()
+    symbol = values.pop('symbol')
+    ensure_partitions_for(db.connection(), 'stock_prices', [values['date']])
+    db_stock = StockPrice(symbol_id=register_symbols(db, [symbol])[symbol], **values)
     db.add(db_stock)
-    db.commit()
-    db.refresh(db_stock)
+    db.flush()
+    refresh_snapshot_prices(db, [symbol], since=values['date'])
     return db_stock
 
-def get_stock_prices(db: Session, symbol: Optional[str] = None, skip: int = 0, limit: int = 100):
-    query = db.query(StockPrice)
+def upsert_stock_prices(db: Session, records: list[dict], batch_size: int = UPSERT_BATCH_SIZE) -> dict:
+    """
+    Insert or update daily bars, part of the caller's transaction: the caller
+    commits (with whatever depends on the bars, e.g. rollups) and then
+    invalidates the indicator cache of the symbols.
+    
+    Each batch is one multi-row INSERT ... ON CONFLICT (symbol_id, date) DO UPDATE.
+    The update only fires when a value actually changed, so rows returned by
+    the statement are either inserts (xmax = 0) or real updates, and every
+    other row of the batch is unchanged. Corrected bars are copied into the
+    screener snapshot (refresh_snapshot_prices).
+    
+    Args:
+        db: Database session
+        records: validated rows with symbol, date, open, high, low, close, volume
+        batch_size: number of rows per INSERT statement
+    
+    Returns:
+        a dict with keys 'inserted', 'updated', 'unchanged' and 'changed_from'
+        (earliest inserted or updated date, None when nothing changed)
+    """
+    inserted = 0
+    updated = 0
+    changed_from = None
+    
+    ensure_partitions_for(db.connection(), 'stock_prices', [record['date'] for record in records])
+    symbol_ids = register_symbols(db, [record['symbol'] for record in records])
+    rows = [
+        {'symbol_id': symbol_ids[record['symbol']], 'date': record['date'], **{key: record[key] for key in PRICE_COLUMNS}}
+        for record in records
+    ]
+    
+    for start in range(0, len(rows), batch_size):
+        stmt = insert(StockPrice).values(rows[start:start + batch_size])
+        stmt = stmt.on_conflict_do_update(
+            constraint='uix_stock_prices_symbol_date',
+            set_={key: stmt.excluded[key] for key in PRICE_COLUMNS},
+            where=or_(*[getattr(StockPrice, key).is_distinct_from(stmt.excluded[key]) for key in PRICE_COLUMNS])
+        ).returning(literal_column("xmax = 0").label("inserted"), StockPrice.date)
+        
+        for row in db.execute(stmt):
+            if row.inserted:
+                inserted += 1
+            else:
+                updated += 1
+            if changed_from is None or row.date < changed_from:
+                changed_from = row.date
+    
+    if changed_from is not None:
+        refresh_snapshot_prices(db, list(symbol_ids), since=changed_from)
+    
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": len(records) - inserted - updated,
+        "changed_from": changed_from
+    }
+
+def _stock_prices_query(
+    symbol: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after_date: Optional[date] = None,
+    after: Optional[tuple[str, date]] = None
+):
+    query = select(StockPrice)
     if symbol:
-        query = query.filter(StockPrice.symbol == symbol)
-    return query.offset(skip).limit(limit).all()
+        query = query.where(StockPrice.symbol_id == symbol_id_of(symbol))
+    if after_date:
+        query = query.where(StockPrice.date > after_date)
+    if after:
+        query = query.where(tuple_(StockPrice.symbol_id, StockPrice.date) > tuple_(symbol_id_of(after[0]), after[1]))
+    return query.order_by(StockPrice.symbol_id, StockPrice.date).offset(skip).limit(limit)
+
+def get_stock_prices(
+    db: Session,
+    symbol: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after_date: Optional[date] = None,
+    after: Optional[tuple[str, date]] = None
+):
+    """
+    List stock prices grouped by symbol (in symbol id order) then sorted by date.
+    
+    Pages can be walked with OFFSET (skip) or, much cheaper on deep pages,
+    with a keyset: `after` = (symbol, date) of the last row already seen,
+    or `after_date` when listing a single symbol.
+    """
+    return db.execute(_stock_prices_query(symbol, skip, limit, after_date, after)).scalars().all()
 
+async def get_stock_prices_async(
+    db: AsyncSession,
+    symbol: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after_date: Optional[date] = None,
+    after: Optional[tuple[str, date]] = None
+):
+    """
+    Async version of get_stock_prices.
+    """
+    result = await db.execute(_stock_prices_query(symbol, skip, limit, after_date, after))
+    return result.scalars().all()
+
+async def get_stock_price_rows_async(
+    db: AsyncSession,
+    fields: list[str],
+    symbol: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after_date: Optional[date] = None,
+    after: Optional[tuple[str, date]] = None
+) -> tuple[list[dict], Optional[tuple[str, date]]]:
+    """
+    Same rows as get_stock_prices_async, as plain dicts of `fields` (see
+    app.crud.projection), plus the (symbol, date) of the last row.
+    """
+    query = _stock_prices_query(symbol, skip, limit, after_date, after)
+    return await fetch_projected_async(db, query, StockPrice, fields)
+
+def get_latest_price_date(db: Session, symbol: str) -> Optional[date]:
+    """
+    Date of the most recent stored bar for a symbol, or None.
+    """
+    return db.execute(select(func.max(StockPrice.date)).where(StockPrice.symbol_id == symbol_id_of(symbol))).scalar_one()
+
+# The primary key is (id, date) since the table is partitioned, ids are still unique
 def get_stock_price_by_id(db: Session, stock_id: int):
-    return db.query(StockPrice).filter(StockPrice.id == stock_id).first()
\ No newline at end of file
+    return db.execute(select(StockPrice).where(StockPrice.id == stock_id)).scalar_one_or_none()
+
+async def get_stock_price_by_id_async(db: AsyncSession, stock_id: int):
+    result = await db.execute(select(StockPrice).where(StockPrice.id == stock_id))
+    return result.scalar_one_or_none()
+
+def load_price_columns(
+    db: Session,
+    symbols: Optional[Sequence[str]] = None,
+    columns: Sequence[str] = ('date', 'close'),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    last_n: Optional[int] = None
+) -> dict[str, np.ndarray]:
+    """
+    Load price columns straight into NumPy arrays, without ORM objects.
+    
+    Runs a Core select() over the requested columns only and fills growable
+    arrays chunk by chunk from a server-side cursor. Rows are grouped by
+    symbol (in symbol id order) and sorted by date.
+    
+    Args:
+        db: Database session
+        symbols: symbols to load (None = every symbol)
+        columns: columns to return, any of symbol, date, open, high, low, close, volume
+        start_date: first date to include (optional)
+        end_date: last date to include (optional)
+        last_n: keep only the most recent `last_n` bars of each symbol (optional)
+    
+    Returns:
+        a dict of column name -> array (dates as datetime64[D])
+    """
+    filters = []
+    if symbols is not None:
+        filters.append(StockPrice.symbol_id.in_(select(Symbol.id).where(Symbol.symbol.in_(list(symbols)))))
+    if start_date:
+        filters.append(StockPrice.date >= start_date)
+    if end_date:
+        filters.append(StockPrice.date <= end_date)
+    
+    # Tickers come from the symbol dimension
+    joined = StockPrice.__table__.join(Symbol.__table__, Symbol.id == StockPrice.symbol_id)
+    if last_n:
+        ranked = select(
+            StockPrice.__table__, Symbol.symbol,
+            func.row_number().over(partition_by=StockPrice.symbol_id, order_by=StockPrice.date.desc()).label('rn')
+        ).select_from(joined).where(*filters).subquery()
+        query = select(*[ranked.c[name] for name in columns]).where(ranked.c.rn <= last_n)
+        query = query.order_by(ranked.c.symbol_id, ranked.c.date)
+    else:
+        source = {**StockPrice.__table__.c, 'symbol': Symbol.symbol}
+        query = select(*[source[name] for name in columns]).select_from(joined).where(*filters)
+        query = query.order_by(StockPrice.symbol_id, StockPrice.date)
+    
+    # One statement, so the rows come from a single snapshot; buffers grow by
+    # doubling instead of trusting a separate COUNT
+    capacity = 0
+    arrays = {name: np.empty(capacity, dtype=COLUMN_DTYPES[name]) for name in columns}
+    
+    result = db.execute(query.execution_options(stream_results=True, yield_per=LOAD_CHUNK_SIZE))
+    position = 0
+    symbol_cache = {}
+    for chunk in result.partitions():
+        end = position + len(chunk)
+        if end > capacity:
+            capacity = max(end, capacity * 2)
+            for name, array in arrays.items():
+                grown = np.empty(capacity, dtype=array.dtype)
+                grown[:position] = array[:position]
+                arrays[name] = grown
+        for name, values in zip(columns, zip(*chunk)):
+            if name == 'symbol':
+                # Share one string object per symbol instead of one per row
+                values = [symbol_cache.setdefault(value, value) for value in values]
+            arrays[name][position:end] = values
+        position = end
+    
+    # Trim the unused tail in place (nothing else references the buffers)
+    for array in arrays.values():
+        array.resize(position, refcheck=False)
+    return arrays
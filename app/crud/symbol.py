@@ -0,0 +1,46 @@
+from typing import Iterable
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from app.models.symbol import Symbol
+
+# The fact tables (stock_prices, technical_indicators, price_rollups) store
+# a symbol_id into the symbol dimension instead of the ticker text. Rows of
+# several symbols are ordered by (symbol_id, date), the order of their
+# unique index, so multi-symbol scans need no sort.
+
+def symbol_id_of(symbol: str):
+    """
+    Id of a ticker as a scalar subquery, to filter a fact table on its
+    (symbol_id, date) index without a join.
+    """
+    return select(Symbol.id).where(Symbol.symbol == symbol).scalar_subquery()
+
+def register_symbols(db: Session, symbols: Iterable[str]) -> dict[str, int]:
+    """
+    Add unknown symbols to the symbol dimension (part of the caller's transaction).
+
+    Returns:
+        the id of every given symbol
+    """
+    wanted = sorted(set(symbols))
+    if not wanted:
+        return {}
+    # Look up first so known symbols do not burn sequence values
+    ids = dict(db.execute(select(Symbol.symbol, Symbol.id).where(Symbol.symbol.in_(wanted))).all())
+    missing = [symbol for symbol in wanted if symbol not in ids]
+    if missing:
+        stmt = insert(Symbol).values([{'symbol': symbol} for symbol in missing])
+        stmt = stmt.on_conflict_do_nothing(index_elements=['symbol']).returning(Symbol.symbol, Symbol.id)
+        ids.update(db.execute(stmt).all())
+        # Symbols added meanwhile by a concurrent transaction
+        missing = [symbol for symbol in missing if symbol not in ids]
+        if missing:
+            ids.update(db.execute(select(Symbol.symbol, Symbol.id).where(Symbol.symbol.in_(missing))).all())
+    return ids
+
+def list_symbols(db: Session) -> list[str]:
+    """
+    Every known symbol, in alphabetical order (no scan of the price table).
+    """
+    return list(db.execute(select(Symbol.symbol).order_by(Symbol.symbol)).scalars())
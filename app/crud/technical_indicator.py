@@ -1,15 +1,191 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from datetime import date, datetime
 import pandas as pd
 from typing import List, Optional
 
+from app.core.cache import indicator_cache
+from app.core.metrics import span
+from app.core.partitions import ensure_partitions_for
+from app.crud.projection import fetch_projected_async
+from app.crud.symbol import register_symbols, symbol_id_of
+from app.models.indicator_snapshot import IndicatorSnapshot
+from app.models.stock import StockPrice
+from app.models.symbol import Symbol
 from app.models.technical_indicator import TechnicalIndicator
+from app.schemas.technical_indicator import TechnicalIndicatorResponse
+from app.services.indicator_registry import PUBLIC_INDICATORS
 
-def save_indicators(db: Session, df: pd.DataFrame) -> int:
+INDICATOR_COLUMNS = [
+    'sma_20', 'sma_50', 'sma_200', 'ema_12', 'ema_26',
+    'rsi_14', 'macd', 'macd_signal', 'macd_histogram',
+    'bb_upper', 'bb_middle', 'bb_lower', 'bb_width'
+]
+
+# Registry indicators without a dedicated column, stored in the `extra` JSONB column
+EXTRA_INDICATORS = [name for name in PUBLIC_INDICATORS if name not in INDICATOR_COLUMNS]
+
+# Rows per INSERT statement (13 indicators + symbol_id/date = 15 params per row)
+UPSERT_BATCH_SIZE = 1000
+
+def _indicator_records(df: pd.DataFrame) -> tuple[list[dict], list[str]]:
+    """
+    Convert an indicators DataFrame into a list of insert-ready dicts.
+    
+    The DataFrame may hold any subset of the registry indicators: column
+    indicators map to their columns, the others are gathered in an `extra`
+    dict (without NaN). Rows where every indicator is NaN (warm-up period)
+    are dropped, dates are normalized to python dates and NaN values become
+    None (NULL).
+    
+    Returns:
+        the records and the indicator columns they contain
+    """
+    columns = [name for name in INDICATOR_COLUMNS if name in df]
+    extra = [name for name in EXTRA_INDICATORS if name in df]
+    if df.empty or not (columns or extra):
+        return [], columns
+    
+    df = df[df[columns + extra].notna().any(axis=1)]
+    if df.empty:
+        return [], columns
+    
+    frame = df[['symbol', 'date'] + columns].copy()
+    frame['date'] = pd.to_datetime(frame['date']).dt.date
+    
+    # Vectorized NaN -> None conversion (object dtype keeps None as is)
+    frame = frame.astype(object).where(frame.notna(), None)
+    if extra:
+        frame['extra'] = [
+            {name: float(value) for name, value in zip(extra, row) if value == value}
+            for row in df[extra].itertuples(index=False)
+        ]
+    return frame.to_dict('records'), columns
+
+def _upsert_set(stmt, columns: list[str], has_extra: bool) -> dict:
+    """
+    Columns updated on conflict: the computed ones only, and `extra` is
+    merged so computing a subset keeps the other stored indicators.
+    """
+    values = {key: stmt.excluded[key] for key in columns}
+    if has_extra:
+        values['extra'] = TechnicalIndicator.extra.op('||')(stmt.excluded.extra)
+    return values
+
+def refresh_latest_indicators(db: Session, symbols: Optional[List[str]] = None) -> int:
+    """
+    Copy the newest indicator row of each symbol (with that day's close and
+    volume) into the latest_indicators snapshot read by the screener.
+    Part of the caller's transaction.
+    
+    Args:
+        db: Database session
+        symbols: symbols to refresh (None = every symbol)
+    
+    Returns:
+        Number of snapshot rows written
+    """
+    columns = ['symbol', 'date', 'close', 'volume'] + INDICATOR_COLUMNS + ['extra']
+    indicators = TechnicalIndicator.__table__.c
+    
+    # DISTINCT ON walks uix_symbol_date backwards, one row per symbol
+    source = select(
+        Symbol.symbol, indicators.date, StockPrice.close, StockPrice.volume,
+        *[indicators[name] for name in INDICATOR_COLUMNS], indicators.extra
+    ).distinct(indicators.symbol_id).join(
+        Symbol, Symbol.id == indicators.symbol_id
+    ).outerjoin(
+        StockPrice, and_(StockPrice.symbol_id == indicators.symbol_id, StockPrice.date == indicators.date)
+    ).order_by(indicators.symbol_id, indicators.date.desc())
+    if symbols is not None:
+        source = source.where(Symbol.symbol.in_(symbols))
+    
+    stmt = insert(IndicatorSnapshot).from_select(columns, source)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['symbol'],
+        set_={**{key: stmt.excluded[key] for key in columns[1:]}, 'updated_at': func.now()}
+    )
+    return db.execute(stmt).rowcount
+
+def refresh_snapshot_prices(db: Session, symbols: List[str], since: Optional[date] = None) -> int:
+    """
+    Copy rewritten closes and volumes into the latest_indicators snapshot,
+    for snapshot rows dated on a bar written from `since`. Called by the
+    price write paths, part of the caller's transaction.
+    
+    Returns:
+        Number of snapshot rows updated
+    """
+    snapshot = IndicatorSnapshot.__table__.c
+    stmt = update(IndicatorSnapshot).values(
+        close=StockPrice.close, volume=StockPrice.volume, updated_at=func.now()
+    ).where(
+        snapshot.symbol.in_(symbols),
+        Symbol.symbol == snapshot.symbol,
+        StockPrice.symbol_id == Symbol.id,
+        StockPrice.date == snapshot.date,
+        or_(snapshot.close.is_distinct_from(StockPrice.close), snapshot.volume.is_distinct_from(StockPrice.volume))
+    )
+    if since:
+        stmt = stmt.where(snapshot.date >= since, StockPrice.date >= since)
+    return db.execute(stmt).rowcount
+
+def save_indicators(db: Session, df: pd.DataFrame, batch_size: int = UPSERT_BATCH_SIZE) -> int:
     """
     Save technical indicators from DataFrame to database.
     
+    Rows are written in batches with a single
+    INSERT ... ON CONFLICT (symbol_id, date) DO UPDATE per batch. Only the
+    indicators present in `df` are written (see _indicator_records), and
+    the latest_indicators snapshot of the saved symbols is refreshed in the
+    same transaction.
+    
+    Args:
+        db: Database session
+        df: DataFrame with calculated indicators
+        batch_size: number of rows per INSERT statement
+    
+    Returns:
+        Number of records saved (inserted or updated)
+    """
+    records, columns = _indicator_records(df)
+    saved_count = 0
+    
+    ensure_partitions_for(db.connection(), 'technical_indicators', [record['date'] for record in records])
+    symbols = sorted({record['symbol'] for record in records})
+    symbol_ids = register_symbols(db, symbols)
+    for record in records:
+        record['symbol_id'] = symbol_ids[record.pop('symbol')]
+    
+    with span("indicators.upsert"):
+        for start in range(0, len(records), batch_size):
+            stmt = insert(TechnicalIndicator).values(records[start:start + batch_size])
+            stmt = stmt.on_conflict_do_update(
+                constraint='uix_symbol_date',
+                set_=_upsert_set(stmt, columns, 'extra' in records[0])
+            )
+            result = db.execute(stmt)
+            saved_count += result.rowcount
+    
+    if symbols:
+        with span("indicators.snapshot"):
+            refresh_latest_indicators(db, symbols)
+    with span("db.commit"):
+        db.commit()
+    
+    for symbol in symbols:
+        indicator_cache.invalidate(symbol)
+    return saved_count
+
+def save_indicators_rowwise(db: Session, df: pd.DataFrame) -> int:
+    """
+    Save technical indicators one row at a time (SELECT + INSERT/UPDATE per row).
+    
+    Legacy path kept as a reference for scripts/benchmark_save_indicators.py,
+    use save_indicators instead.
+    
     Args:
         db: Database session
         df: DataFrame with calculated indicators
@@ -19,6 +195,9 @@ def save_indicators(db: Session, df: pd.DataFrame) -> int:
     """
     saved_count = 0
     
+    ensure_partitions_for(db.connection(), 'technical_indicators', df['date'] if not df.empty else [])
+    symbol_ids = register_symbols(db, df['symbol'].unique() if not df.empty else [])
+    
     for _, row in df.iterrows():
         # Skip rows where all indicators are NaN
         if pd.isna(row['sma_20']) and pd.isna(row['rsi_14']):
@@ -33,16 +212,14 @@ def save_indicators(db: Session, df: pd.DataFrame) -> int:
         # Check if record already exists
         existing = db.query(TechnicalIndicator).filter(
             and_(
-                TechnicalIndicator.symbol == row['symbol'],
+                TechnicalIndicator.symbol_id == symbol_ids[row['symbol']],
                 TechnicalIndicator.date == row_date
             )
         ).first()
         
         if existing:
             # Update existing record
-            for key in ['sma_20', 'sma_50', 'sma_200', 'ema_12', 'ema_26',
-                        'rsi_14', 'macd', 'macd_signal', 'macd_histogram',
-                        'bb_upper', 'bb_middle', 'bb_lower', 'bb_width']:
+            for key in INDICATOR_COLUMNS:
                 value = row[key]
                 # Convert NaN to None (NULL in database)
                 setattr(existing, key, None if pd.isna(value) else float(value))
@@ -50,7 +227,7 @@ def save_indicators(db: Session, df: pd.DataFrame) -> int:
         else:
             # Create new record
             indicator = TechnicalIndicator(
-                symbol=row['symbol'],
+                symbol_id=symbol_ids[row['symbol']],
                 date=row_date,
                 sma_20=None if pd.isna(row['sma_20']) else float(row['sma_20']),
                 sma_50=None if pd.isna(row['sma_50']) else float(row['sma_50']),
@@ -69,47 +246,136 @@ def save_indicators(db: Session, df: pd.DataFrame) -> int:
             db.add(indicator)
             saved_count += 1
     
+    if not df.empty:
+        db.flush()
+        refresh_latest_indicators(db, list(df['symbol'].unique()))
     db.commit()
+    
+    for symbol in df['symbol'].unique():
+        indicator_cache.invalidate(symbol)
     return saved_count
 
-def get_latest_indicators(db: Session, symbol: str) -> Optional[TechnicalIndicator]:
+def _serialize(indicator: TechnicalIndicator) -> dict:
+    return TechnicalIndicatorResponse.model_validate(indicator).model_dump(mode='json')
+
+def _latest_query(symbol: str):
+    return select(TechnicalIndicator).where(TechnicalIndicator.symbol_id == symbol_id_of(symbol)).order_by(TechnicalIndicator.date.desc()).limit(1)
+
+def _date_range_query(
+    symbol: str,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    limit: int,
+    before_date: Optional[date]
+):
+    query = select(TechnicalIndicator).where(TechnicalIndicator.symbol_id == symbol_id_of(symbol))
+    
+    if start_date:
+        query = query.where(TechnicalIndicator.date >= start_date)
+    if end_date:
+        query = query.where(TechnicalIndicator.date <= end_date)
+    if before_date:
+        query = query.where(TechnicalIndicator.date < before_date)
+    
+    return query.order_by(TechnicalIndicator.date.desc()).limit(limit)
+
+def get_latest_indicators(db: Session, symbol: str) -> Optional[TechnicalIndicatorResponse]:
     """
     Get the most recent technical indicators for a symbol.
     
+    Served from the query cache, which save_indicators invalidates.
+    
     Args:
         db: Database session
         symbol: Stock symbol
     
     Returns:
-        TechnicalIndicator object or None
+        TechnicalIndicatorResponse or None
     """
-    return db.query(TechnicalIndicator).filter(TechnicalIndicator.symbol == symbol).order_by(TechnicalIndicator.date.desc()).first()
+    def load():
+        indicator = db.execute(_latest_query(symbol)).scalars().first()
+        return _serialize(indicator) if indicator else None
+    
+    row = indicator_cache.get_or_load(symbol, "latest", {}, load)
+    return TechnicalIndicatorResponse.model_validate(row) if row else None
+
+async def get_latest_indicators_async(db: AsyncSession, symbol: str) -> Optional[TechnicalIndicatorResponse]:
+    """
+    Async version of get_latest_indicators (shares its cache entries).
+    """
+    async def load():
+        result = await db.execute(_latest_query(symbol))
+        indicator = result.scalars().first()
+        return _serialize(indicator) if indicator else None
+    
+    row = await indicator_cache.aget_or_load(symbol, "latest", {}, load)
+    return TechnicalIndicatorResponse.model_validate(row) if row else None
 
 def get_indicators_by_date_range(
     db: Session, 
     symbol: str,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    limit: int = 100
-) -> List[TechnicalIndicator]:
+    limit: int = 100,
+    before_date: Optional[date] = None
+) -> List[TechnicalIndicatorResponse]:
     """
     Get technical indicators for a symbol within a date range.
     
+    Served from the query cache, which save_indicators invalidates.
+    
     Args:
         db: Database session
         symbol: Stock symbol
         start_date: Start date (optional)
         end_date: End date (optional)
         limit: Maximum number of records
+        before_date: keyset for the next page, date of the last (oldest) row already seen (optional)
     
     Returns:
-        List of TechnicalIndicator objects
+        List of TechnicalIndicatorResponse, newest first
     """
-    query = db.query(TechnicalIndicator).filter(TechnicalIndicator.symbol == symbol)
+    def load():
+        indicators = db.execute(_date_range_query(symbol, start_date, end_date, limit, before_date)).scalars().all()
+        return [_serialize(indicator) for indicator in indicators]
     
-    if start_date:
-        query = query.filter(TechnicalIndicator.date >= start_date)
-    if end_date:
-        query = query.filter(TechnicalIndicator.date <= end_date)
+    params = {"start_date": start_date, "end_date": end_date, "limit": limit, "before_date": before_date}
+    rows = indicator_cache.get_or_load(symbol, "range", params, load)
+    return [TechnicalIndicatorResponse.model_validate(row) for row in rows]
+
+async def get_indicators_by_date_range_async(
+    db: AsyncSession,
+    symbol: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 100,
+    before_date: Optional[date] = None
+) -> List[TechnicalIndicatorResponse]:
+    """
+    Async version of get_indicators_by_date_range (shares its cache entries).
+    """
+    async def load():
+        result = await db.execute(_date_range_query(symbol, start_date, end_date, limit, before_date))
+        return [_serialize(indicator) for indicator in result.scalars().all()]
     
-    return query.order_by(TechnicalIndicator.date.desc()).limit(limit).all()
\ No newline at end of file
+    params = {"start_date": start_date, "end_date": end_date, "limit": limit, "before_date": before_date}
+    rows = await indicator_cache.aget_or_load(symbol, "range", params, load)
+    return [TechnicalIndicatorResponse.model_validate(row) for row in rows]
+
+async def get_indicator_rows_async(
+    db: AsyncSession,
+    fields: List[str],
+    symbol: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 100,
+    before_date: Optional[date] = None
+) -> tuple[list[dict], Optional[tuple[str, date]]]:
+    """
+    Same rows as get_indicators_by_date_range_async, as plain dicts of
+    `fields` (see app.crud.projection). Read from the database, not the
+    query cache: the fast path targets large pages, which would only be
+    decoded and re-encoded through the cache.
+    """
+    query = _date_range_query(symbol, start_date, end_date, limit, before_date)
+    return await fetch_projected_async(db, query, TechnicalIndicator, fields)
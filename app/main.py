@@ -1,10 +1,65 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
-from app.api.routes import stocks
+from app.core.cache import indicator_cache
+from app.core.metrics import HTTP_QUERIES, HTTP_SECONDS, end_request, metrics, start_request
+from app.core.price_store import price_store
+from app.core.database import dispose_async_engine
+from app.api.routes import stocks, indicators, jobs, screener
+from app.services.market_data import provider
+from app.services.jobs import job_runner
+from app.services.technical_indicator import shutdown_pool
 
-app = FastAPI(title=settings.APP_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Jobs of a previous run that never finished
+    job_runner.recover()
+    yield
+    # Release the market data provider's pooled connections
+    await provider.aclose()
+    await dispose_async_engine()
+    await indicator_cache.aclose()
+    job_runner.shutdown()
+    shutdown_pool()
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Time every request and count its database queries (see app.core.metrics).
+    With METRICS_LOG_QUERIES set, requests running at least that many
+    queries are logged with their per-stage timings, to spot N+1 patterns.
+    """
+    stats, token = start_request()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        end_request(token)
+        
+        # Route template (e.g. /api/v1/stocks/{symbol}/indicators) keeps label cardinality bounded
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        HTTP_SECONDS.observe(elapsed, method=request.method, route=path, status=status)
+        HTTP_QUERIES.observe(stats.queries, method=request.method, route=path)
+        
+        threshold = settings.METRICS_LOG_QUERIES
+        if threshold is not None and stats.queries >= threshold:
+            stages = ", ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in stats.stages.items())
+            print(f"{request.method} {request.url.path} -> {status}: {stats.queries} queries "
+                  f"({stats.query_seconds * 1000:.1f}ms) in {elapsed * 1000:.1f}ms" + (f" [{stages}]" if stages else ""))
 
 app.include_router(stocks.router, prefix="/api/v1")
+app.include_router(indicators.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
+app.include_router(screener.router, prefix="/api/v1")
 
 @app.get("/")
 def read_root():
@@ -22,4 +77,19 @@ def show_config():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Stage, request and query metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache/stats")
+def cache_stats():
+    return indicator_cache.stats()
+
+@app.get("/cache/price-store")
+def price_store_stats():
+    return price_store.stats()
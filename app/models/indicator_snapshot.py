@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import BigInteger, String, Float, Date, DateTime, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from app.core.database import Base
+
+class IndicatorSnapshot(Base):
+    """
+    Latest technical indicators of every symbol, with the close and volume of
+    that day. One row per symbol, kept up to date by save_indicators (and
+    by the price writes for corrected bars), so cross-symbol screens read
+    ~one row per symbol instead of the history.
+    """
+    
+    __tablename__ = "latest_indicators"
+    
+    symbol: Mapped[str] = mapped_column(String(10), primary_key=True)
+    date: Mapped[datetime] = mapped_column(Date, index=True)   # date of the latest indicator row
+    close: Mapped[float] = mapped_column(Float, nullable=True)
+    volume: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    
+    # Same indicators as technical_indicators
+    sma_20: Mapped[float] = mapped_column(Float, nullable=True)
+    sma_50: Mapped[float] = mapped_column(Float, nullable=True)
+    sma_200: Mapped[float] = mapped_column(Float, nullable=True)
+    ema_12: Mapped[float] = mapped_column(Float, nullable=True)
+    ema_26: Mapped[float] = mapped_column(Float, nullable=True)
+    rsi_14: Mapped[float] = mapped_column(Float, nullable=True)
+    macd: Mapped[float] = mapped_column(Float, nullable=True)
+    macd_signal: Mapped[float] = mapped_column(Float, nullable=True)
+    macd_histogram: Mapped[float] = mapped_column(Float, nullable=True)
+    bb_upper: Mapped[float] = mapped_column(Float, nullable=True)
+    bb_middle: Mapped[float] = mapped_column(Float, nullable=True)
+    bb_lower: Mapped[float] = mapped_column(Float, nullable=True)
+    bb_width: Mapped[float] = mapped_column(Float, nullable=True)
+    extra: Mapped[dict] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
+    
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
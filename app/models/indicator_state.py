@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import String, Date, JSON
+from app.core.database import Base
+
+class IndicatorState(Base):
+    """
+    Rolling indicator state per symbol, used by incremental computation.
+    `date` is the last bar folded into the state.
+    """
+    
+    __tablename__ = "indicator_states"
+    
+    symbol: Mapped[str] = mapped_column(String(10), primary_key=True)
+    date: Mapped[datetime] = mapped_column(Date)
+    state: Mapped[dict] = mapped_column(JSON)
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import String, DateTime, JSON, Text
+from app.core.database import Base
+
+class Job(Base):
+    """
+    Background job (e.g. full ingestion of a symbol) with per-stage progress.
+    """
+    
+    __tablename__ = "jobs"
+    
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50))
+    symbol: Mapped[str] = mapped_column(String(10), index=True)  # '*' for jobs over every symbol
+    status: Mapped[str] = mapped_column(String(20))              # queued | running | succeeded | failed
+    stages: Mapped[dict] = mapped_column(JSON)                   # stage name -> status, attempts, seconds, error
+    result: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    owner: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)        # process running the job
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # last sign of life of the owner
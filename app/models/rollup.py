@@ -0,0 +1,50 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column, column_property
+from sqlalchemy import BigInteger, ForeignKey, Integer, String, Float, Date, UniqueConstraint, select
+from app.core.database import Base
+from app.models.symbol import Symbol
+
+class PriceRollup(Base):
+    """
+    Weekly, monthly or quarterly bar of a symbol aggregated from daily prices,
+    with the technical indicators computed on the aggregated closes.
+    `date` is the first day of the period, `period_end` its last trading day.
+    """
+    
+    __tablename__ = "price_rollups"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    symbol_id: Mapped[int] = mapped_column(Integer, ForeignKey('symbols.id'))
+    # Ticker of symbol_id, read only: filter and join on symbol_id (see app.crud.symbol)
+    symbol: Mapped[str] = column_property(
+        select(Symbol.symbol).where(Symbol.id == symbol_id).correlate_except(Symbol).scalar_subquery()
+    )
+    interval: Mapped[str] = mapped_column(String(4))              # 1w | 1mo | 1q
+    date: Mapped[datetime] = mapped_column(Date)
+    period_end: Mapped[datetime] = mapped_column(Date)
+    open: Mapped[float] = mapped_column(Float)
+    high: Mapped[float] = mapped_column(Float)
+    low: Mapped[float] = mapped_column(Float)
+    close: Mapped[float] = mapped_column(Float)
+    volume: Mapped[int] = mapped_column(BigInteger)
+    bars: Mapped[int] = mapped_column(Integer)                     # daily bars in the period
+    
+    # Same indicators as technical_indicators, on the period closes
+    sma_20: Mapped[float] = mapped_column(Float, nullable=True)
+    sma_50: Mapped[float] = mapped_column(Float, nullable=True)
+    sma_200: Mapped[float] = mapped_column(Float, nullable=True)
+    ema_12: Mapped[float] = mapped_column(Float, nullable=True)
+    ema_26: Mapped[float] = mapped_column(Float, nullable=True)
+    rsi_14: Mapped[float] = mapped_column(Float, nullable=True)
+    macd: Mapped[float] = mapped_column(Float, nullable=True)
+    macd_signal: Mapped[float] = mapped_column(Float, nullable=True)
+    macd_histogram: Mapped[float] = mapped_column(Float, nullable=True)
+    bb_upper: Mapped[float] = mapped_column(Float, nullable=True)
+    bb_middle: Mapped[float] = mapped_column(Float, nullable=True)
+    bb_lower: Mapped[float] = mapped_column(Float, nullable=True)
+    bb_width: Mapped[float] = mapped_column(Float, nullable=True)
+    
+    __table_args__ = (
+        UniqueConstraint('symbol_id', 'interval', 'date', name='uix_price_rollups_symbol_interval_date'),
+    )
@@ -1,18 +1,31 @@
 from datetime import datetime
 from sqlalchemy.orm import Mapped
-from sqlalchemy.orm import mapped_column
-from sqlalchemy import Integer, String, Float, Date
+from sqlalchemy.orm import mapped_column, column_property
+from sqlalchemy import BigInteger, Integer, ForeignKey, Float, Date, UniqueConstraint, select
 from app.core.database import Base
+from app.models.symbol import Symbol
 
 
 class StockPrice(Base):
     __tablename__ = "stock_prices"
     
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    symbol: Mapped[str] = mapped_column(String(10))
-    date: Mapped[datetime] = mapped_column(Date)
+    # The partition key has to be part of the primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    symbol_id: Mapped[int] = mapped_column(Integer, ForeignKey('symbols.id'))
+    # Ticker of symbol_id, read only: filter and join on symbol_id (see app.crud.symbol)
+    symbol: Mapped[str] = column_property(
+        select(Symbol.symbol).where(Symbol.id == symbol_id).correlate_except(Symbol).scalar_subquery()
+    )
+    date: Mapped[datetime] = mapped_column(Date, primary_key=True)
     open: Mapped[float] = mapped_column(Float)
     high: Mapped[float] = mapped_column(Float)
     low: Mapped[float] = mapped_column(Float)
     close: Mapped[float] = mapped_column(Float)
-    volume: Mapped[int] = mapped_column(Integer)
\ No newline at end of file
+    volume: Mapped[int] = mapped_column(BigInteger)
+    
+    # One bar per symbol per date, makes re-ingestion idempotent.
+    # Range partitioned by date, partitions are managed by app.core.partitions
+    __table_args__ = (
+        UniqueConstraint('symbol_id', 'date', name='uix_stock_prices_symbol_date'),
+        {'postgresql_partition_by': 'RANGE (date)'},
+    )
\ No newline at end of file
@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import Integer, String, DateTime, func
+from app.core.database import Base
+
+class Symbol(Base):
+    """
+    Symbol dimension: one row per ticker ever ingested, with a compact integer id.
+    """
+    
+    __tablename__ = "symbols"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    symbol: Mapped[str] = mapped_column(String(10), unique=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
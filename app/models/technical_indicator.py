@@ -1,8 +1,10 @@
 from datetime import datetime
 from sqlalchemy.orm import Mapped
-from sqlalchemy.orm import mapped_column
-from sqlalchemy import Integer, String, Float, Date, UniqueConstraint
+from sqlalchemy.orm import mapped_column, column_property
+from sqlalchemy import Integer, ForeignKey, Float, Date, UniqueConstraint, text, select
+from sqlalchemy.dialects.postgresql import JSONB
 from app.core.database import Base
+from app.models.symbol import Symbol
 
 class TechnicalIndicator(Base):
     """
@@ -12,9 +14,14 @@ class TechnicalIndicator(Base):
     
     __tablename__ = "technical_indicators"
     
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    symbol: Mapped[str] = mapped_column(String(10))
-    date: Mapped[datetime] = mapped_column(Date, index = True)
+    # The partition key has to be part of the primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    symbol_id: Mapped[int] = mapped_column(Integer, ForeignKey('symbols.id'))
+    # Ticker of symbol_id, read only: filter and join on symbol_id (see app.crud.symbol)
+    symbol: Mapped[str] = column_property(
+        select(Symbol.symbol).where(Symbol.id == symbol_id).correlate_except(Symbol).scalar_subquery()
+    )
+    date: Mapped[datetime] = mapped_column(Date, primary_key=True, index = True)
     
     # Moving averages
     sma_20: Mapped[float] = mapped_column(Float, nullable=True)   # Simple moving average 20 days
@@ -37,7 +44,12 @@ class TechnicalIndicator(Base):
     bb_lower: Mapped[float] = mapped_column(Float, nullable=True)   # Bollinger band lower
     bb_width: Mapped[float] = mapped_column(Float, nullable=True)   # Bollinger band width
     
-    # Ensure one row per symbol per date
+    # Other registry indicators (see app.services.indicator_registry), name -> value
+    extra: Mapped[dict] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
+    
+    # Ensure one row per symbol per date.
+    # Range partitioned by date, partitions are managed by app.core.partitions
     __table_args__ = (
-        UniqueConstraint('symbol', 'date', name='uix_symbol_date'),
+        UniqueConstraint('symbol_id', 'date', name='uix_symbol_date'),
+        {'postgresql_partition_by': 'RANGE (date)'},
     )
\ No newline at end of file
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class JobStageResponse(BaseModel):
+    """Progress of one pipeline stage"""
+    status: str
+    attempts: int
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+
+class JobResponse(BaseModel):
+    """Background job state"""
+    id: str
+    kind: str
+    symbol: str
+    status: str
+    stages: dict[str, JobStageResponse]
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
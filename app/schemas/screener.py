@@ -0,0 +1,10 @@
+from typing import Optional
+from app.schemas.technical_indicator import TechnicalIndicatorBase
+
+class ScreenerResult(TechnicalIndicatorBase):
+    """Latest indicators of a symbol matched by the screener, with that day's close and volume"""
+    close: Optional[float] = None
+    volume: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
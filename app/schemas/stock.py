@@ -1,6 +1,18 @@
-from pydantic import BaseModel, Field, PositiveFloat, PositiveInt
+import re
+from pydantic import BaseModel, Field, PositiveFloat, PositiveInt, StringConstraints
+from typing import Annotated, List, Literal
 from datetime import date
 
+# Ticker symbols: letters, digits, "." and "-" (e.g. BRK.B), starting with a
+# letter or digit. Symbols are used in file paths (raw response cache, local
+# market data files), so anything else is rejected.
+SYMBOL_PATTERN = r"^[A-Za-z0-9][A-Za-z0-9.\-]{0,9}$"
+
+Symbol = Annotated[str, StringConstraints(pattern=SYMBOL_PATTERN)]
+
+def is_valid_symbol(symbol: str) -> bool:
+    return re.fullmatch(SYMBOL_PATTERN, symbol) is not None
+
 class StockPriceBase(BaseModel):
     symbol: str = Field(..., max_length = 10)
     date:date
@@ -17,4 +29,9 @@ class StockPriceResponse(StockPriceBase):
     id: int
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class StockIngestRequest(BaseModel):
+    """Batch ingestion request"""
+    symbols: List[Symbol] = Field(..., min_length=1, max_length=500)
+    mode: Literal["auto", "full", "delta"] = "auto"
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from datetime import date
-from typing import Optional
+from typing import Dict, List, Optional
+from app.schemas.stock import Symbol
 
 class TechnicalIndicatorBase(BaseModel):
     """Base schema for technical indicators"""
@@ -27,10 +28,26 @@ class TechnicalIndicatorBase(BaseModel):
     bb_middle: Optional[float] = None
     bb_lower: Optional[float] = None
     bb_width: Optional[float] = None
+    
+    # Other registry indicators (e.g. atr_14, stoch_k, obv)
+    extra: Dict[str, float] = Field(default_factory=dict)
 
 class TechnicalIndicatorResponse(TechnicalIndicatorBase):
     """Response schema with id"""
     id: int
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class IndicatorBatchRequest(BaseModel):
+    """Multi-symbol read request, answered with columnar arrays"""
+    symbols: List[Symbol] = Field(..., min_length=1, max_length=500)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    
+    # Indicator and/or price columns (default: every indicator column)
+    columns: Optional[List[str]] = None
+    
+    # Most recent rows per symbol within the bounds (1 = latest only)
+    last_n: Optional[int] = Field(None, ge=1, le=5000)
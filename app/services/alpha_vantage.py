@@ -1,48 +1,152 @@
+import asyncio
 import httpx
+import threading
 import time
+from datetime import datetime, timezone
+from typing import Optional
 from app.core.config import settings
+from app.core.metrics import span
+from app.services.price_parser import PriceColumns, decode_json, parse_time_series
+from app.services.response_cache import response_cache
 
-class AlphaVantageClient:
-    BASE_URL = "https://www.alphavantage.co/query"
 
-    def __init__(self):
-        self.api_key = settings.ALPHA_VANTAGE_API_KEY
-        self.last_call_time = 0 
-        self.min_interval = 60 / settings.ALPHA_VANTAGE_RATE_LIMIT # minimum time between calls (seconds)
+class TokenBucket:
+    """
+    Token bucket shared by every caller of the API, coroutines and threads.
+
+    Tokens refill continuously at `rate_per_minute`, up to a burst of
+    `rate_per_minute` calls. An optional `daily_limit` caps the number of
+    calls per UTC day; once reached, acquiring raises instead of waiting.
+
+    Each call reserves its token under a lock and then sleeps outside of
+    it, so the sync client (worker threads) and the async client (event
+    loop) draw from the same quota and waiters are served in arrival order.
+    """
+
+    def __init__(self, rate_per_minute: int, daily_limit: Optional[int] = None):
+        self.capacity = float(rate_per_minute)
+        self.fill_rate = rate_per_minute / 60  # tokens per second
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.daily_limit = daily_limit
+        self.day = datetime.now(timezone.utc).date()
+        self.day_count = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "TokenBucket":
+        return cls(settings.ALPHA_VANTAGE_RATE_LIMIT, settings.ALPHA_VANTAGE_DAILY_LIMIT)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+        self.updated_at = now
+
+    def _check_daily_limit(self):
+        today = datetime.now(timezone.utc).date()
+        if today != self.day:
+            self.day = today
+            self.day_count = 0
+        if self.daily_limit is not None and self.day_count >= self.daily_limit:
+            raise ValueError(f"API limit reached: daily quota of {self.daily_limit} calls exhausted")
 
-    def _wait_for_rate_limit(self):
+    def _reserve(self) -> float:
         """
-        Ensure a minimum interval between calls to avoid exceeding the rate limit.
+        Take a token (the balance goes negative while calls are queued) and
+        return how long to wait, in seconds, before making the call.
         """
-        elapsed = time.time() - self.last_call_time
-        if elapsed < self.min_interval:
-            wait_time = self.min_interval - elapsed
+        with self._lock:
+            self._check_daily_limit()
+            self._refill()
+            self.tokens -= 1
+            self.day_count += 1
+            wait_time = max(0.0, -self.tokens / self.fill_rate)
+        if wait_time > 0:
             print(f"⏳ Rate limit: waiting {wait_time:.1f} seconds...")
+        return wait_time
+
+    async def acquire(self):
+        """
+        Wait (without blocking the event loop) until a call is allowed.
+        """
+        wait_time = self._reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    def acquire_blocking(self):
+        """
+        Block the calling thread until a call is allowed.
+        """
+        wait_time = self._reserve()
+        if wait_time > 0:
             time.sleep(wait_time)
-        self.last_call_time = time.time()
 
-    def get_daily_prices(self, symbol: str) -> dict:
+
+class AlphaVantageClient:
+    BASE_URL = "https://www.alphavantage.co/query"
+    TIMEOUT = 30.0  # seconds
+
+    def __init__(self, rate_limiter: Optional[TokenBucket] = None):
+        self.api_key = settings.ALPHA_VANTAGE_API_KEY
+        self.rate_limiter = rate_limiter or TokenBucket.from_settings()
+
+    def get_daily_prices(self, symbol: str, outputsize: str = "compact") -> dict:
         """
         Fetch the daily price time series for a stock symbol.
 
         Args:
             symbol: stock symbol (e.g., "AAPL")
+            outputsize: "compact" (last 100 days) or "full" (whole history)
 
         Returns:
             Raw Alpha Vantage response as a dict
         """
-        self._wait_for_rate_limit()
-
         params = {
             "function": "TIME_SERIES_DAILY",
             "symbol": symbol,
             "apikey": self.api_key,
-            "outputsize": "compact"
+            "outputsize": outputsize
         }
 
-        response = httpx.get(self.BASE_URL, params=params)
-        data = response.json()
+        cached = self._from_cache(params)
+        if cached is not None:
+            return cached
+
+        with span("alpha_vantage.rate_limit_wait"):
+            self.rate_limiter.acquire_blocking()
+
+        with span("alpha_vantage.http"):
+            response = httpx.get(self.BASE_URL, params=params, timeout=self.TIMEOUT)
+        response.raise_for_status()
+        data = self._check_response(decode_json(response.content))
+        self._to_cache(params, response.content)
+        return data
+
+    @staticmethod
+    def _from_cache(params: dict):
+        """
+        Serve a request from the raw response cache when possible.
+        In offline mode a cache miss is an error instead of an API call.
+        """
+        if response_cache is not None:
+            content = response_cache.lookup(params["function"], params["symbol"], params["outputsize"])
+            if content is not None:
+                return decode_json(content)
+
+        if settings.ALPHA_VANTAGE_OFFLINE:
+            raise ValueError(f"Offline mode: no cached {params['function']} response for {params['symbol']}")
+        return None
 
+    @staticmethod
+    def _to_cache(params: dict, content: bytes):
+        if response_cache is not None:
+            response_cache.store(params["function"], params["symbol"], params["outputsize"], content)
+
+    @staticmethod
+    def _check_response(data: dict) -> dict:
+        """
+        Raise ValueError when Alpha Vantage answered with an error payload.
+        """
         if "Error Message" in data:
             raise ValueError(f"Alpha Vantage error: {data['Error Message']}")
 
@@ -79,3 +183,84 @@ class AlphaVantageClient:
             })
 
         return parsed
+
+    def parse_daily_prices_columnar(self, raw_data: dict) -> PriceColumns:
+        """
+        Parse an Alpha Vantage response into validated columns (see price_parser).
+
+        Much faster than parse_daily_prices followed by Pydantic validation
+        on full-history payloads; invalid rows are returned in `errors`.
+        """
+        with span("alpha_vantage.parse"):
+            return parse_time_series(raw_data)
+
+
+class AsyncAlphaVantageClient:
+    """
+    Asyncio Alpha Vantage client.
+
+    Uses a pooled httpx.AsyncClient and a TokenBucket shared across
+    coroutines, so many symbols can be fetched concurrently while keeping
+    the API quota fully used without blocking the event loop.
+    """
+    BASE_URL = AlphaVantageClient.BASE_URL
+
+    parse_daily_prices = AlphaVantageClient.parse_daily_prices
+    parse_daily_prices_columnar = AlphaVantageClient.parse_daily_prices_columnar
+
+    def __init__(self, rate_limiter: Optional[TokenBucket] = None):
+        self.api_key = settings.ALPHA_VANTAGE_API_KEY
+        self.rate_limiter = rate_limiter or TokenBucket.from_settings()
+        self._http: Optional[httpx.AsyncClient] = None
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        # Created lazily so the connection pool binds to the running event loop
+        if self._http is None or self._http.is_closed:
+            limits = httpx.Limits(
+                max_connections=settings.ALPHA_VANTAGE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ALPHA_VANTAGE_MAX_CONNECTIONS
+            )
+            self._http = httpx.AsyncClient(limits=limits, timeout=AlphaVantageClient.TIMEOUT)
+        return self._http
+
+    async def get_daily_prices(self, symbol: str, outputsize: str = "compact") -> dict:
+        """
+        Fetch the daily price time series for a stock symbol.
+
+        Args:
+            symbol: stock symbol (e.g., "AAPL")
+            outputsize: "compact" (last 100 days) or "full" (whole history)
+
+        Returns:
+            Raw Alpha Vantage response as a dict
+        """
+        params = {
+            "function": "TIME_SERIES_DAILY",
+            "symbol": symbol,
+            "apikey": self.api_key,
+            "outputsize": outputsize
+        }
+
+        # The response cache reads and writes gzip files, keep that off the event loop
+        cached = await asyncio.to_thread(AlphaVantageClient._from_cache, params)
+        if cached is not None:
+            return cached
+
+        with span("alpha_vantage.rate_limit_wait"):
+            await self.rate_limiter.acquire()
+
+        with span("alpha_vantage.http"):
+            response = await self.http.get(self.BASE_URL, params=params)
+        response.raise_for_status()
+        data = AlphaVantageClient._check_response(decode_json(response.content))
+        await asyncio.to_thread(AlphaVantageClient._to_cache, params, response.content)
+        return data
+
+    async def aclose(self):
+        """
+        Close the pooled HTTP connections.
+        """
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from app.core.database import Session
+from app.crud.technical_indicator import EXTRA_INDICATORS, INDICATOR_COLUMNS
+from app.models.symbol import Symbol
+from app.models.technical_indicator import TechnicalIndicator
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(record: dict) -> bytes:
+        return json.dumps(record, default=date.isoformat).encode()
+
+# Registry indicators without a column (stored in `extra`) come last
+EXPORT_INDICATORS = INDICATOR_COLUMNS + EXTRA_INDICATORS
+EXPORT_COLUMNS = ['symbol', 'date'] + EXPORT_INDICATORS
+
+# Rows fetched per round trip and written per output chunk
+EXPORT_CHUNK_SIZE = 10000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+def _export_row(row) -> tuple:
+    """
+    (symbol, date, column indicators..., extra JSON) -> one value per EXPORT_COLUMNS.
+    """
+    extra = row[-1] or {}
+    return (*row[:-1], *[extra.get(name) for name in EXTRA_INDICATORS])
+
+def _iter_row_chunks(symbols: Optional[list[str]], start_date: Optional[date], end_date: Optional[date]) -> Iterator[list]:
+    """
+    Yield lists of indicator rows (values in EXPORT_COLUMNS order) read
+    through a server-side cursor.
+    Uses its own session, the generator outlives the request handler.
+    """
+    columns = {**TechnicalIndicator.__table__.c, 'symbol': Symbol.symbol}
+    selected = [columns[name] for name in ['symbol', 'date'] + INDICATOR_COLUMNS] + [TechnicalIndicator.extra]
+    query = select(*selected).join_from(
+        TechnicalIndicator, Symbol, Symbol.id == TechnicalIndicator.symbol_id
+    )
+    if symbols:
+        query = query.where(Symbol.symbol.in_(symbols))
+    if start_date:
+        query = query.where(TechnicalIndicator.date >= start_date)
+    if end_date:
+        query = query.where(TechnicalIndicator.date <= end_date)
+    query = query.order_by(TechnicalIndicator.symbol_id, TechnicalIndicator.date)
+
+    with Session() as db:
+        result = db.execute(query.execution_options(stream_results=True, yield_per=EXPORT_CHUNK_SIZE))
+        for chunk in result.partitions():
+            yield [_export_row(row) for row in chunk]
+
+def _ndjson_chunks(rows: Iterator[list]) -> Iterator[bytes]:
+    for chunk in rows:
+        yield b"".join(_dumps(dict(zip(EXPORT_COLUMNS, row))) + b"\n" for row in chunk)
+
+def _csv_chunks(rows: Iterator[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in rows:
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+class _ChunkSink:
+    """
+    Write-only file object collecting what the Arrow writer produces between drains.
+    """
+    closed = False
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+def _arrow_chunks(rows: Iterator[list]) -> Iterator[bytes]:
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [('symbol', pa.string()), ('date', pa.date32())]
+        + [(name, pa.float64()) for name in EXPORT_INDICATORS]
+    )
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(pa.PythonFile(sink, mode='w'), schema) as writer:
+        for chunk in rows:
+            columns = list(zip(*chunk))
+            writer.write_batch(pa.record_batch(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    yield sink.drain()
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow
+        return True
+    except ImportError:
+        return False
+
+def export_indicators(
+    format: str,
+    symbols: Optional[list[str]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Iterator[bytes]:
+    """
+    Stream technical indicators as NDJSON, CSV or Arrow IPC (stream format).
+
+    Rows are read with a server-side cursor and encoded chunk by chunk, so
+    memory use does not depend on the number of exported rows. Missing
+    values are null (empty in CSV). Registry indicators stored in `extra`
+    (e.g. obv) are exported as columns after the dedicated ones.
+
+    Args:
+        format: "ndjson", "csv" or "arrow" (requires pyarrow)
+        symbols: symbols to export (None = every symbol)
+        start_date: first date to include (optional)
+        end_date: last date to include (optional)
+
+    Returns:
+        an iterator of encoded byte chunks
+    """
+    rows = _iter_row_chunks(symbols, start_date, end_date)
+    if format == "csv":
+        return _csv_chunks(rows)
+    if format == "arrow":
+        return _arrow_chunks(rows)
+    return _ndjson_chunks(rows)
@@ -0,0 +1,176 @@
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import talib
+
+# Declarative indicator registry.
+#
+# Each entry names its inputs (price columns or other entries), its
+# parameters and how many bars it needs. Entries starting with "_" are
+# intermediates (e.g. the MACD tuple) that are not stored. Computing a
+# subset resolves its dependencies and evaluates every node once, so the
+# 20-day SMA is shared by sma_20, bb_middle, bb_upper and bb_lower.
+#
+# lookback: bars before the first non-NaN output (TA-Lib lookback).
+# warmup: bars of history needed before outputs no longer depend on where
+#   the series starts; recursive indicators get a margin of 5 periods (EMA)
+#   or 10 periods (Wilder smoothing) over their lookback, so the seed
+#   weighs less than e^-10. None = depends on the whole history (OBV).
+
+PRICE_INPUTS = ("open", "high", "low", "close", "volume")
+
+
+class Indicator:
+    __slots__ = ("name", "func", "inputs", "params", "lookback", "warmup")
+
+    def __init__(self, name: str, func: Callable, inputs: tuple, params: dict, lookback: int, warmup: Optional[int]):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.params = params
+        self.lookback = lookback
+        self.warmup = warmup
+
+    @property
+    def internal(self) -> bool:
+        return self.name.startswith("_")
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "inputs": list(self.inputs),
+            "params": self.params,
+            "lookback": self.lookback,
+            "warmup": self.warmup,
+        }
+
+
+REGISTRY: dict[str, Indicator] = {}
+
+
+def register(name: str, func: Callable, inputs: tuple, params: Optional[dict] = None,
+             lookback: Optional[int] = None, warmup: Optional[int] = None, full_history: bool = False):
+    """
+    Add an indicator. lookback and warmup default to the largest values
+    among its dependencies; full_history marks outputs that depend on the
+    whole series.
+    """
+    dependencies = [REGISTRY[i] for i in inputs if i not in PRICE_INPUTS]
+    if lookback is None:
+        lookback = max((d.lookback for d in dependencies), default=0)
+    if full_history:
+        warmup = None
+    elif warmup is None:
+        warmups = [d.warmup for d in dependencies]
+        warmup = None if None in warmups else max(warmups, default=lookback)
+    REGISTRY[name] = Indicator(name, func, tuple(inputs), params or {}, lookback, warmup)
+
+
+def _item(index: int) -> Callable:
+    return lambda values: values[index]
+
+
+def _same(values):
+    return values
+
+
+# Moving averages
+for period in (20, 50, 200):
+    register(f"sma_{period}", talib.SMA, ("close",), {"timeperiod": period}, lookback=period - 1, warmup=period - 1)
+for period in (12, 26):
+    register(f"ema_{period}", talib.EMA, ("close",), {"timeperiod": period}, lookback=period - 1, warmup=period - 1 + 5 * period)
+
+# Momentum indicators
+register("rsi_14", talib.RSI, ("close",), {"timeperiod": 14}, lookback=14, warmup=14 + 10 * 14)
+
+# MACD (Moving Average Convergence Divergence)
+register("_macd", talib.MACD, ("close",), {"fastperiod": 12, "slowperiod": 26, "signalperiod": 9},
+         lookback=33, warmup=33 + 5 * 26)
+register("macd", _item(0), ("_macd",))
+register("macd_signal", _item(1), ("_macd",))
+register("macd_histogram", _item(2), ("_macd",))
+
+# Bollinger bands: SMA middle, population standard deviation (TA-Lib BBANDS with matype=0)
+register("_stddev_20", talib.STDDEV, ("close",), {"timeperiod": 20, "nbdev": 1}, lookback=19, warmup=19)
+register("bb_middle", _same, ("sma_20",))
+register("bb_upper", lambda middle, std, nbdev: middle + nbdev * std, ("sma_20", "_stddev_20"), {"nbdev": 2})
+register("bb_lower", lambda middle, std, nbdev: middle - nbdev * std, ("sma_20", "_stddev_20"), {"nbdev": 2})
+register("bb_width", lambda upper, lower, middle: (upper - lower) / middle * 100, ("bb_upper", "bb_lower", "bb_middle"))
+
+# Volatility and oscillators on high/low/close
+register("atr_14", talib.ATR, ("high", "low", "close"), {"timeperiod": 14}, lookback=14, warmup=14 + 10 * 14)
+register("_stoch", talib.STOCH, ("high", "low", "close"),
+         {"fastk_period": 14, "slowk_period": 3, "slowk_matype": 0, "slowd_period": 3, "slowd_matype": 0},
+         lookback=17, warmup=17)
+register("stoch_k", _item(0), ("_stoch",))
+register("stoch_d", _item(1), ("_stoch",))
+
+# Volume
+register("obv", talib.OBV, ("close", "volume"), lookback=0, full_history=True)
+
+PUBLIC_INDICATORS = [name for name, spec in REGISTRY.items() if not spec.internal]
+
+# Computed when no subset is requested. Full-history indicators (OBV) are
+# left out so the default computation reads a bounded window of bars, they
+# are only computed when asked for by name.
+DEFAULT_INDICATORS = [name for name in PUBLIC_INDICATORS if REGISTRY[name].warmup is not None]
+
+
+def unknown_indicators(names: Iterable[str]) -> list[str]:
+    return [name for name in names if name not in REGISTRY or REGISTRY[name].internal]
+
+
+def resolve(names: Iterable[str]) -> list[str]:
+    """
+    Every registry entry needed for `names`, dependencies first.
+    """
+    order, seen = [], set()
+
+    def visit(name: str):
+        if name in seen or name in PRICE_INPUTS:
+            return
+        if name not in REGISTRY:
+            raise ValueError(f"Unknown indicator: {name}")
+        seen.add(name)
+        for dependency in REGISTRY[name].inputs:
+            visit(dependency)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def required_inputs(names: Iterable[str]) -> list[str]:
+    """
+    Price columns needed to compute `names`.
+    """
+    needed = {i for name in resolve(names) for i in REGISTRY[name].inputs if i in PRICE_INPUTS}
+    return [column for column in PRICE_INPUTS if column in needed]
+
+
+def history_needed(names: Iterable[str]) -> Optional[int]:
+    """
+    Bars of history to load before the first output bar (None = all history).
+    """
+    warmups = [REGISTRY[name].warmup for name in resolve(names)]
+    return None if None in warmups else max(warmups, default=0)
+
+
+def compute_indicators(inputs: dict, names: Optional[Iterable[str]] = None) -> dict:
+    """
+    Compute a subset of indicators, each shared intermediate only once.
+
+    Args:
+        inputs: price column name -> array in chronological order
+        names: indicators to return (default: every public indicator)
+
+    Returns:
+        a dict of indicator name -> array aligned with the inputs
+    """
+    names = list(names or PUBLIC_INDICATORS)
+    values = {name: np.asarray(array, dtype=np.float64) for name, array in inputs.items()}
+    for name in resolve(names):
+        spec = REGISTRY[name]
+        values[name] = spec.func(*[values[i] for i in spec.inputs], **spec.params)
+    return {name: values[name] for name in names}
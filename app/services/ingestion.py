@@ -1,48 +1,207 @@
+import asyncio
+from datetime import date
+from typing import List, Literal, Optional
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
-from app.crud.stock import create_stock_price
-from app.services.alpha_vantage import AlphaVantageClient
+from app.core.cache import indicator_cache
+from app.core.database import Session as SessionLocal
+from app.core.metrics import span
+from app.core.price_store import price_store
+from app.crud.stock import upsert_stock_prices, get_latest_price_date
+from app.services import market_data
+from app.services.market_data import MarketDataProvider
+from app.services.price_parser import PriceColumns
+from app.services.response_cache import last_trading_date
+from app.services.rollups import refresh_rollups
 from app.schemas.stock import StockPriceCreate
 
-client = AlphaVantageClient()
+_stock_prices_adapter = TypeAdapter(List[StockPriceCreate])
 
-def ingest_stock_data(db: Session, symbol: str) -> dict:
-    """Fetch daily stock prices from Alpha Vantage and persist them to the database.
+IngestionMode = Literal["auto", "full", "delta"]
 
-    Retrieves raw daily price data for the given ticker symbol, parses it,
-    and saves each record via the CRUD layer. Duplicates or invalid entries
-    are silently skipped.
+# A compact response holds the last 100 trading days; beyond this many
+# calendar days without data, delta mode could leave a gap
+COMPACT_WINDOW_DAYS = 100
+
+def plan_ingestion(db: Session, symbol: str, mode: IngestionMode = "auto") -> tuple[str, str, Optional[date]]:
+    """Decide how to fetch a symbol.
+
+    'full' downloads the whole history (outputsize=full) and upserts every bar.
+    'delta' downloads the compact window and keeps only bars newer than the
+    latest stored date. 'auto' backfills symbols with no (or too old) data and
+    uses delta mode afterwards.
 
     Args:
         db: active SQLAlchemy database session.
-        symbol: ticker symbol to ingest (e.g. "AAPL").
+        symbol: ticker symbol to ingest.
+        mode: requested mode.
 
     Returns:
-        a dict with keys 'symbol', 'saved', 'skipped', and 'total'.
+        a tuple (resolved mode, outputsize, latest stored date or None)
     """
-    print(f"\nWorking...")
+    latest = get_latest_price_date(db, symbol)
+
+    if mode == "auto":
+        stale = latest is None or (last_trading_date() - latest).days > COMPACT_WINDOW_DAYS
+        mode = "full" if stale else "delta"
+
+    return mode, ("full" if mode == "full" else "compact"), latest
+
+def select_new_bars(prices: PriceColumns, mode: str, latest: Optional[date]) -> PriceColumns:
+    """Keep only bars newer than `latest` in delta mode (all bars otherwise)."""
+    if mode != "delta" or latest is None:
+        return prices
+    return prices.after(latest)
 
-    raw_data = client.get_daily_prices(symbol)
-    parsed_data = client.parse_daily_prices(raw_data)
+def validate_stock_prices(parsed_data: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Validate a whole parsed payload in one pass (dict path).
 
-    saved = 0
-    skipped = 0
+    Ingestion uses the columnar parser instead, this is kept for records
+    coming from parse_daily_prices.
+
+    Invalid rows are reported and dropped, the remaining rows are returned
+    as plain dicts ready for the bulk upsert.
+
+    Args:
+        parsed_data: records produced by AlphaVantageClient.parse_daily_prices.
+
+    Returns:
+        a tuple (valid records, errors) where each error has 'row' and 'error' keys.
+    """
+    errors = []
 
-    for day in parsed_data:
+    with span("ingest.validate"):
         try:
-            stock_data = StockPriceCreate(**day)
-            create_stock_price(db, stock_data)
-            saved += 1
-        except Exception as e:
-            skipped += 1
-            print(e)
-            continue
+            valid = _stock_prices_adapter.validate_python(parsed_data)
+        except ValidationError as e:
+            bad_rows = {}
+            for err in e.errors():
+                bad_rows.setdefault(err["loc"][0], f"{'.'.join(str(l) for l in err['loc'][1:])}: {err['msg']}")
+            errors = [{"row": parsed_data[i], "error": msg} for i, msg in sorted(bad_rows.items())]
+            valid = _stock_prices_adapter.validate_python(
+                [day for i, day in enumerate(parsed_data) if i not in bad_rows]
+            )
+
+        return [price.model_dump() for price in valid], errors
+
+def persist_stock_data(db: Session, symbol: str, prices: PriceColumns) -> dict:
+    """Write parsed daily prices and refresh the weekly/monthly/quarterly
+    rollups of the periods that changed, in a single transaction.
+
+    A failed rollup refresh rolls the prices back too, so a retry finds the
+    same rows changed and refreshes the same periods.
+
+    Args:
+        db: active SQLAlchemy database session.
+        symbol: ticker symbol being ingested (e.g. "AAPL").
+        prices: validated columns returned by a market data provider.
+
+    Returns:
+        a dict with keys 'symbol', 'inserted', 'updated', 'unchanged',
+        'saved' (inserted + updated), 'skipped', and 'total'.
+    """
+    for error in prices.errors:
+        print(error)
+
+    with span("ingest.upsert_prices"):
+        counts = upsert_stock_prices(db, prices.to_records())
+    changed_from = counts.pop("changed_from")
+    if changed_from is not None:
+        with span("ingest.rollups"):
+            refresh_rollups(db, symbol, since=changed_from)
+    with span("db.commit"):
+        db.commit()
+    indicator_cache.invalidate(symbol)
+    # Committed, keep the in-process price history of the symbol current
+    price_store.write_through(symbol, prices.columns())
 
     result = {
         "symbol": symbol,
-        "saved": saved,
-        "skipped": skipped,
-        "total": len(parsed_data)
+        **counts,
+        "saved": counts["inserted"] + counts["updated"],
+        "skipped": len(prices.errors),
+        "total": prices.total
     }
 
-    print(f"{symbol}: {saved} saved, {skipped} skipped")
-    return result
\ No newline at end of file
+    print(f"{symbol}: {counts['inserted']} inserted, {counts['updated']} updated, "
+          f"{counts['unchanged']} unchanged, {len(prices.errors)} skipped")
+    return result
+
+def ingest_stock_data(
+    db: Session,
+    symbol: str,
+    mode: IngestionMode = "auto",
+    provider: Optional[MarketDataProvider] = None
+) -> dict:
+    """Fetch daily stock prices from a market data provider and persist them to the database.
+
+    Retrieves raw daily price data for the given ticker symbol, parses and
+    validates it into columns at once and upserts it in one transaction.
+    The first run for a symbol backfills its full history, later runs only
+    write bars newer than the latest stored date (see plan_ingestion).
+    Running it again for the same data leaves the rows unchanged; invalid
+    entries are skipped.
+
+    Args:
+        db: active SQLAlchemy database session.
+        symbol: ticker symbol to ingest (e.g. "AAPL").
+        mode: 'auto', 'full' or 'delta'.
+        provider: data source (default: the one configured by MARKET_DATA_PROVIDER).
+
+    Returns:
+        a dict with keys 'symbol', 'mode', 'inserted', 'updated', 'unchanged',
+        'saved', 'skipped', and 'total'.
+    """
+    print(f"\nWorking...")
+
+    mode, outputsize, latest = plan_ingestion(db, symbol, mode)
+
+    provider = provider or market_data.provider
+    prices = select_new_bars(provider.fetch_daily(symbol, outputsize=outputsize), mode, latest)
+
+    return {**persist_stock_data(db, symbol, prices), "mode": mode}
+
+def _plan_in_new_session(symbol: str, mode: IngestionMode) -> tuple[str, str, Optional[date]]:
+    """Run plan_ingestion with a dedicated session (used from worker threads)."""
+    with SessionLocal() as db:
+        return plan_ingestion(db, symbol, mode)
+
+def _persist_in_new_session(symbol: str, prices: PriceColumns) -> dict:
+    """Run persist_stock_data with a dedicated session (used from worker threads)."""
+    with SessionLocal() as db:
+        return persist_stock_data(db, symbol, prices)
+
+async def ingest_many_stock_data(
+    symbols: list[str],
+    mode: IngestionMode = "auto",
+    provider: Optional[MarketDataProvider] = None
+) -> list[dict]:
+    """Fetch and persist several symbols concurrently.
+
+    Downloads run on the event loop through the provider (for Alpha Vantage,
+    the async client throttled by its shared token bucket); each database
+    write runs in a worker thread with its own session so the event loop is
+    never blocked. A failing symbol does not abort the others.
+
+    Args:
+        symbols: ticker symbols to ingest.
+        mode: 'auto', 'full' or 'delta' (see plan_ingestion).
+        provider: data source (default: the one configured by MARKET_DATA_PROVIDER).
+
+    Returns:
+        one result dict per symbol, in input order, with a 'status' key
+        ('success' or 'error').
+    """
+    provider = provider or market_data.provider
+
+    async def ingest_one(symbol: str) -> dict:
+        try:
+            resolved_mode, outputsize, latest = await asyncio.to_thread(_plan_in_new_session, symbol, mode)
+            prices = select_new_bars(await provider.afetch_daily(symbol, outputsize=outputsize), resolved_mode, latest)
+            result = await asyncio.to_thread(_persist_in_new_session, symbol, prices)
+            return {**result, "mode": resolved_mode, "status": "success"}
+        except Exception as e:
+            print(f"{symbol}: {e}")
+            return {"symbol": symbol, "status": "error", "error": str(e)}
+
+    return await asyncio.gather(*(ingest_one(symbol) for symbol in symbols))
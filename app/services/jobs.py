@@ -0,0 +1,403 @@
+import copy
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import or_, select, update
+
+from app.core.config import settings
+from app.core.database import Session
+from app.core.metrics import span
+from app.crud.symbol import list_symbols
+from app.crud.technical_indicator import save_indicators, get_latest_indicators
+from app.models.job import Job
+from app.services.ingestion import persist_stock_data, plan_ingestion, select_new_bars
+from app.services.market_data import provider
+from app.services.technical_indicator import TechnicalIndicatorsService
+
+# Jobs are plain dicts (symbol is UNIVERSE for jobs over every symbol):
+# {id, kind, symbol, status, stages: {name: {status, attempts, seconds, error}},
+#  result, error, created_at, started_at, finished_at, owner, heartbeat_at}
+
+JOB_FIELDS = [
+    'id', 'kind', 'symbol', 'status', 'stages', 'result', 'error', 'created_at', 'started_at', 'finished_at',
+    'owner', 'heartbeat_at'
+]
+
+UNFINISHED = ('queued', 'running')
+UNIVERSE = '*'
+INTERRUPTED_ERROR = "Interrupted: the process running the job stopped"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _is_stale(job: dict, stale_before: datetime) -> bool:
+    return job['status'] in UNFINISHED and (job['heartbeat_at'] is None or job['heartbeat_at'] < stale_before)
+
+
+def _mark_interrupted(job: dict, now: datetime):
+    job['status'] = 'failed'
+    job['error'] = INTERRUPTED_ERROR
+    job['finished_at'] = now
+    for info in job['stages'].values():
+        if info['status'] == 'running':
+            info['status'] = 'failed'
+            info['error'] = INTERRUPTED_ERROR
+
+
+class InMemoryJobStore:
+    """
+    Job store kept in process memory (tests, single-process deployments).
+    """
+
+    def __init__(self):
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: dict):
+        with self._lock:
+            self._jobs[job['id']] = copy.deepcopy(job)
+
+    def save(self, job: dict):
+        with self._lock:
+            self._jobs[job['id']] = copy.deepcopy(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job else None
+
+    def heartbeat(self, owner: str, now: datetime):
+        with self._lock:
+            for job in self._jobs.values():
+                if job['owner'] == owner and job['status'] in UNFINISHED:
+                    job['heartbeat_at'] = now
+
+    def fail_stale(self, stale_before: datetime) -> int:
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if _is_stale(job, stale_before)]
+            now = _now()
+            for job in jobs:
+                _mark_interrupted(job, now)
+            return len(jobs)
+
+
+class DatabaseJobStore:
+    """
+    Job store backed by the jobs table, visible to every API process.
+    """
+
+    def create(self, job: dict):
+        with Session() as db:
+            db.add(Job(**job))
+            db.commit()
+
+    def save(self, job: dict):
+        with Session() as db:
+            db.merge(Job(**copy.deepcopy(job)))
+            db.commit()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with Session() as db:
+            job = db.get(Job, job_id)
+            return {field: getattr(job, field) for field in JOB_FIELDS} if job else None
+
+    def heartbeat(self, owner: str, now: datetime):
+        """
+        Record that `owner` is still running its unfinished jobs.
+        """
+        with Session() as db:
+            db.execute(
+                update(Job).where(Job.owner == owner, Job.status.in_(UNFINISHED)).values(heartbeat_at=now)
+            )
+            db.commit()
+
+    def fail_stale(self, stale_before: datetime) -> int:
+        """
+        Mark queued and running jobs without a heartbeat since `stale_before`
+        as failed, returns how many.
+        """
+        with Session() as db:
+            stale = or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < stale_before)
+            rows = db.execute(select(Job).where(Job.status.in_(UNFINISHED), stale).with_for_update()).scalars().all()
+            now = _now()
+            for row in rows:
+                job = {field: copy.deepcopy(getattr(row, field)) for field in JOB_FIELDS}
+                _mark_interrupted(job, now)
+                db.merge(Job(**job))
+            db.commit()
+            return len(rows)
+
+
+class JobRunner:
+    """
+    Runs job pipelines on a bounded thread pool.
+
+    A pipeline is an ordered list of (stage name, function) pairs. Each stage
+    receives a shared context dict, is retried up to JOB_MAX_RETRIES times and
+    has its status, attempts and duration recorded in the job store.
+
+    Jobs record the runner that owns them; while it has jobs, a thread
+    refreshes their heartbeat every `heartbeat_interval` seconds so other
+    processes can tell them from jobs whose process stopped (see recover).
+    """
+
+    def __init__(
+        self,
+        store,
+        workers: int,
+        max_retries: int,
+        retry_delay: float,
+        heartbeat_interval: float = 30.0,
+        stale_after: float = 120.0
+    ):
+        self.store = store
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        # Random part: a restarted container gets the same host name and pid
+        self.owner = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._stopped = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._heartbeat_lock = threading.Lock()
+
+    def submit(self, kind: str, symbol: str, pipeline: list[tuple[str, Callable[[dict], None]]]) -> dict:
+        """
+        Queue a pipeline and return the new job right away.
+        """
+        job = {
+            'id': str(uuid.uuid4()),
+            'kind': kind,
+            'symbol': symbol,
+            'status': 'queued',
+            'stages': {name: {'status': 'pending', 'attempts': 0, 'seconds': None, 'error': None} for name, _ in pipeline},
+            'result': None,
+            'error': None,
+            'created_at': _now(),
+            'started_at': None,
+            'finished_at': None,
+            'owner': self.owner,
+            'heartbeat_at': _now(),
+        }
+        self.store.create(job)
+        self._start_heartbeat()
+        # The worker thread mutates `job`, callers get a snapshot
+        snapshot = copy.deepcopy(job)
+        self._executor.submit(self._run, job, pipeline)
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def recover(self) -> int:
+        """
+        Fail the jobs left queued or running by a process that stopped
+        (call once at startup, before any job is submitted).
+
+        Jobs run in process threads and are lost with the process, so they
+        are reported as failed rather than left running forever. Only jobs
+        without a heartbeat for `stale_after` seconds are failed: jobs of
+        other live processes sharing the jobs table are left alone.
+        """
+        try:
+            count = self.store.fail_stale(_now() - timedelta(seconds=self.stale_after))
+        except Exception as e:
+            print(f"Could not recover interrupted jobs: {e}")
+            return 0
+        if count:
+            print(f"Marked {count} interrupted job(s) as failed")
+        return count
+
+    def _start_heartbeat(self):
+        with self._heartbeat_lock:
+            if self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+                self._heartbeat_thread.start()
+
+    def _beat(self):
+        while not self._stopped.wait(self.heartbeat_interval):
+            try:
+                self.store.heartbeat(self.owner, _now())
+            except Exception as e:
+                print(f"Could not record the job heartbeat: {e}")
+
+    def _save(self, job: dict):
+        job['heartbeat_at'] = _now()
+        self.store.save(job)
+
+    def _run(self, job: dict, pipeline: list):
+        try:
+            self._run_pipeline(job, pipeline)
+        except Exception as e:
+            # Bookkeeping failed (e.g. the job store could not be written)
+            print(f"Job {job['id']} failed: {e}")
+            job['status'] = 'failed'
+            job['error'] = f"Job bookkeeping failed: {e}"
+            job['finished_at'] = _now()
+            try:
+                self._save(job)
+            except Exception as e:
+                # Left unfinished, recover() fails it once this process stops
+                print(f"Job {job['id']} could not be saved: {e}")
+
+    def _run_pipeline(self, job: dict, pipeline: list):
+        job['status'] = 'running'
+        job['started_at'] = _now()
+        self._save(job)
+
+        context = {'symbol': job['symbol'], 'result': {}}
+        for name, stage in pipeline:
+            if not self._run_stage(job, name, stage, context):
+                job['status'] = 'failed'
+                job['error'] = f"Stage '{name}' failed: {job['stages'][name]['error']}"
+                break
+        else:
+            job['status'] = 'succeeded'
+            job['result'] = context['result']
+
+        job['finished_at'] = _now()
+        self._save(job)
+
+    def _run_stage(self, job: dict, name: str, stage: Callable[[dict], None], context: dict) -> bool:
+        info = job['stages'][name]
+        info['status'] = 'running'
+        self._save(job)
+
+        start = time.perf_counter()
+        for attempt in range(1, self.max_retries + 2):
+            info['attempts'] = attempt
+            try:
+                with span(f"job.{job['kind']}.{name}"):
+                    stage(context)
+                info['status'] = 'succeeded'
+                info['error'] = None
+                break
+            except Exception as e:
+                info['error'] = str(e)
+                print(f"Job {job['id']} stage {name} attempt {attempt} failed: {e}")
+                if attempt <= self.max_retries:
+                    time.sleep(self.retry_delay)
+        else:
+            info['status'] = 'failed'
+
+        info['seconds'] = round(time.perf_counter() - start, 3)
+        self._save(job)
+        return info['status'] == 'succeeded'
+
+    def shutdown(self):
+        self._stopped.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def full_ingest_pipeline(mode: str = "auto") -> list[tuple[str, Callable[[dict], None]]]:
+    """
+    fetch -> persist -> compute -> save, each stage with its own session.
+    
+    The first ingestion of a symbol backfills its full history and rebuilds
+    its indicator state; afterwards only new bars are fetched, written and
+    run through the incremental indicators (see plan_ingestion).
+    """
+    def fetch(context: dict):
+        with Session() as db:
+            context['mode'], outputsize, latest = plan_ingestion(db, context['symbol'], mode)
+        prices = provider.fetch_daily(context['symbol'], outputsize=outputsize)
+        context['prices'] = select_new_bars(prices, context['mode'], latest)
+
+    def persist(context: dict):
+        with Session() as db:
+            prices = persist_stock_data(db, context['symbol'], context['prices'])
+        context['result']['prices'] = {key: prices[key] for key in ('saved', 'inserted', 'updated', 'unchanged', 'skipped')}
+        context['result']['prices']['mode'] = context['mode']
+
+    def compute(context: dict):
+        with Session() as db:
+            service = TechnicalIndicatorsService(db)
+            context['indicators'], context['state'] = service.compute_incremental(
+                context['symbol'], rebuild=context['mode'] == "full"
+            )
+
+    def save(context: dict):
+        with Session() as db:
+            if context['state'] is not None:
+                db.merge(context['state'])
+            # Commits the indicator rows and the state together
+            saved_count = save_indicators(db, context['indicators'])
+            latest = get_latest_indicators(db, context['symbol'])
+        context['result']['indicators'] = {
+            'calculated': len(context['indicators']),
+            'saved': saved_count,
+            'latest_date': str(latest.date) if latest else None
+        }
+
+    return [('fetch', fetch), ('persist', persist), ('compute', compute), ('save', save)]
+
+
+def recompute_all_pipeline(
+    days: Optional[int] = None,
+    engine: str = "panel",
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> list[tuple[str, Callable[[dict], None]]]:
+    """
+    recompute, over every symbol in chunks of `chunk_size` symbols
+    (default INDICATOR_RECOMPUTE_CHUNK).
+    
+    Each chunk is loaded, computed and committed on its own session, so
+    memory and transaction size are bounded by the chunk rather than the
+    universe; a retried stage resumes at the chunk that failed.
+    engine=panel uses recompute_universe, engine=talib recompute_parallel.
+    """
+    chunk_size = chunk_size or settings.INDICATOR_RECOMPUTE_CHUNK
+    
+    def recompute(context: dict):
+        if 'symbols' not in context:
+            with Session() as db:
+                context['symbols'] = list_symbols(db)
+            context['next'] = 0
+            context['result'].update({'engine': engine, 'symbols': 0, 'bars': 0, 'saved': 0, 'chunks': 0, 'timings': {}})
+        
+        result = context['result']
+        symbols = context['symbols']
+        for start in range(context['next'], len(symbols), chunk_size):
+            chunk = symbols[start:start + chunk_size]
+            with Session() as db:
+                service = TechnicalIndicatorsService(db)
+                if engine == "talib":
+                    summary = service.recompute_parallel(symbols=chunk, days=days, workers=workers)
+                    result['workers'] = summary['workers']
+                else:
+                    summary = service.recompute_universe(symbols=chunk, days=days)
+            for key in ('symbols', 'bars', 'saved'):
+                result[key] += summary[key]
+            for stage, seconds in summary['timings'].items():
+                result['timings'][stage] = round(result['timings'].get(stage, 0) + seconds, 3)
+            result['chunks'] += 1
+            context['next'] = start + chunk_size
+        
+        if not result['symbols']:
+            raise ValueError("No price data found")
+    
+    return [('recompute', recompute)]
+
+
+def build_job_runner() -> JobRunner:
+    """
+    Create the job runner configured in settings (JOB_BACKEND = database | memory).
+    """
+    store = InMemoryJobStore() if settings.JOB_BACKEND == "memory" else DatabaseJobStore()
+    return JobRunner(
+        store, settings.JOB_WORKERS, settings.JOB_MAX_RETRIES, settings.JOB_RETRY_DELAY_SECONDS,
+        heartbeat_interval=settings.JOB_HEARTBEAT_SECONDS, stale_after=settings.JOB_STALE_SECONDS
+    )
+
+
+job_runner = build_job_runner()
@@ -0,0 +1,195 @@
+import asyncio
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.schemas.stock import is_valid_symbol
+from app.services.alpha_vantage import AlphaVantageClient, AsyncAlphaVantageClient, TokenBucket
+from app.services.price_parser import PRICE_FIELDS, PriceColumns, finish_columns, validate_price_columns
+
+OHLCV_COLUMNS = ["date"] + list(PRICE_FIELDS) + ["volume"]
+LOCAL_SUFFIXES = (".parquet", ".csv", ".csv.gz")
+
+
+class MarketDataProvider(ABC):
+    """
+    Source of daily OHLCV bars.
+
+    fetch_daily returns validated columns (see price_parser.PriceColumns);
+    `outputsize` is "compact" (recent bars) or "full" (whole history), a
+    provider may return more than asked, ingestion filters by date.
+    """
+    name = "base"
+
+    @abstractmethod
+    def fetch_daily(self, symbol: str, outputsize: str = "compact") -> PriceColumns:
+        ...
+
+    async def afetch_daily(self, symbol: str, outputsize: str = "compact") -> PriceColumns:
+        """
+        Async variant, runs fetch_daily in a worker thread unless overridden.
+        """
+        return await asyncio.to_thread(self.fetch_daily, symbol, outputsize)
+
+    async def aclose(self):
+        """
+        Release connections or file handles held by the provider.
+        """
+
+
+class AlphaVantageProvider(MarketDataProvider):
+    """
+    Alpha Vantage API, rate limited and cached by the underlying clients.
+    The sync client (jobs, single-symbol ingestion) and the async client
+    (batch ingestion) share one token bucket, so together they stay within
+    the per-minute and daily quotas.
+    """
+    name = "alpha_vantage"
+
+    def __init__(self, client: Optional[AlphaVantageClient] = None, async_client: Optional[AsyncAlphaVantageClient] = None):
+        rate_limiter = TokenBucket.from_settings()
+        self.client = client or AlphaVantageClient(rate_limiter)
+        self.async_client = async_client or AsyncAlphaVantageClient(rate_limiter)
+
+    def fetch_daily(self, symbol: str, outputsize: str = "compact") -> PriceColumns:
+        raw_data = self.client.get_daily_prices(symbol, outputsize=outputsize)
+        return self.client.parse_daily_prices_columnar(raw_data)
+
+    async def afetch_daily(self, symbol: str, outputsize: str = "compact") -> PriceColumns:
+        raw_data = await self.async_client.get_daily_prices(symbol, outputsize=outputsize)
+        return self.async_client.parse_daily_prices_columnar(raw_data)
+
+    async def aclose(self):
+        await self.async_client.aclose()
+
+
+class LocalFileProvider(MarketDataProvider):
+    """
+    Daily bars read from a directory of vendor dumps, without any network.
+
+    Layout: <root>/<SYMBOL>.parquet|.csv|.csv.gz, or a <root>/<SYMBOL>/
+    directory of such files (e.g. one per year). Files need date, open,
+    high, low, close and volume columns (header case is ignored). They are
+    read in chunks of `chunk_rows` rows through memory maps, so a dump of
+    any size is loaded with bounded memory on top of the result.
+    The whole file is always returned whatever the outputsize.
+    """
+    name = "local"
+
+    def __init__(self, root: str, chunk_rows: int = 100_000):
+        self.root = Path(root)
+        self.chunk_rows = chunk_rows
+
+    @staticmethod
+    def _symbol_of(path: Path) -> Optional[str]:
+        """
+        Symbol stored in a root entry (BRK.B.csv -> BRK.B), None for other files.
+        """
+        name = path.name
+        if not path.is_dir():
+            suffix = next((suffix for suffix in LOCAL_SUFFIXES if name.lower().endswith(suffix)), None)
+            if suffix is None:
+                return None
+            name = name[:-len(suffix)]
+        return name.upper() if is_valid_symbol(name) else None
+
+    def symbols(self) -> list[str]:
+        """
+        Symbols available under the root directory.
+        """
+        return sorted({symbol for path in self.root.iterdir() if (symbol := self._symbol_of(path)) is not None})
+
+    def _files(self, symbol: str) -> list[Path]:
+        """
+        Files of a symbol, matching names case-insensitively (aapl.csv serves AAPL).
+        """
+        if not is_valid_symbol(symbol):
+            raise ValueError(f"Invalid symbol: {symbol!r}")
+        entries = sorted(path for path in self.root.iterdir() if self._symbol_of(path) == symbol.upper())
+        directories = [path for path in entries if path.is_dir()]
+        if directories:
+            return sorted(p for p in directories[0].iterdir() if p.name.lower().endswith(LOCAL_SUFFIXES))
+        return entries
+
+    def _read_chunks(self, path: Path) -> Iterator[pd.DataFrame]:
+        if path.name.lower().endswith(".parquet"):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Reading Parquet files requires the 'pyarrow' package")
+            parquet = pq.ParquetFile(path, memory_map=True)
+            names = {name.lower(): name for name in parquet.schema_arrow.names}
+            columns = [names[name] for name in OHLCV_COLUMNS if name in names]
+            for batch in parquet.iter_batches(batch_size=self.chunk_rows, columns=columns):
+                yield batch.to_pandas()
+        else:
+            # Memory mapping only applies to uncompressed files
+            yield from pd.read_csv(
+                path,
+                usecols=lambda name: name.strip().lower() in OHLCV_COLUMNS,
+                dtype=str,
+                chunksize=self.chunk_rows,
+                memory_map=not path.name.lower().endswith(".gz")
+            )
+
+    def _convert(self, symbol: str, chunk: pd.DataFrame) -> tuple[dict, np.ndarray, list[dict]]:
+        """
+        Chunk as typed columns, the validity mask and the rejected rows.
+        """
+        chunk = chunk.rename(columns=lambda name: name.strip().lower())
+        missing = [name for name in OHLCV_COLUMNS if name not in chunk.columns]
+        if missing:
+            raise ValueError(f"{symbol}: missing columns {', '.join(missing)}")
+
+        columns = {
+            "date": pd.to_datetime(chunk["date"], errors="coerce", format="ISO8601").to_numpy().astype("datetime64[D]")
+        }
+        for name in OHLCV_COLUMNS[1:]:
+            columns[name] = pd.to_numeric(chunk[name], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+        messages = validate_price_columns(symbol, columns)
+        valid = np.equal(messages, None)
+        errors = [
+            {"row": {"symbol": symbol, **{k: str(v) for k, v in zip(OHLCV_COLUMNS, chunk[OHLCV_COLUMNS].iloc[i])}},
+             "error": messages[i]}
+            for i in np.flatnonzero(~valid)
+        ]
+        return columns, valid, errors
+
+    def fetch_daily(self, symbol: str, outputsize: str = "compact") -> PriceColumns:
+        symbol = symbol.upper()
+        files = self._files(symbol)
+        if not files:
+            raise ValueError(f"No local data for {symbol} in {self.root}")
+
+        parts, masks, errors = [], [], []
+        for path in files:
+            for chunk in self._read_chunks(path):
+                columns, valid, chunk_errors = self._convert(symbol, chunk)
+                parts.append(columns)
+                masks.append(valid)
+                errors.extend(chunk_errors)
+
+        if not parts:
+            raise ValueError(f"{symbol}: local files hold no rows")
+
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in OHLCV_COLUMNS}
+        return PriceColumns(symbol, finish_columns(columns, np.concatenate(masks)), errors)
+
+
+def build_provider() -> MarketDataProvider:
+    """
+    Create the provider configured in settings (MARKET_DATA_PROVIDER = alpha_vantage | local).
+    """
+    if settings.MARKET_DATA_PROVIDER == "local":
+        if not settings.MARKET_DATA_DIR:
+            raise ValueError("MARKET_DATA_PROVIDER=local requires MARKET_DATA_DIR")
+        return LocalFileProvider(settings.MARKET_DATA_DIR, settings.MARKET_DATA_CHUNK_ROWS)
+    return AlphaVantageProvider()
+
+
+provider = build_provider()
@@ -0,0 +1,128 @@
+import numpy as np
+
+# Vectorized indicators over a 2-D price panel (bars x symbols).
+#
+# Each column holds one symbol's closes in chronological order, starting at
+# row 0 and padded with NaN after its last bar, so lookbacks are counted in
+# bars exactly like per-symbol TA-Lib calls. Moving sums use cumulative sums,
+# recursive indicators (EMA, Wilder RSI) loop over rows and update every
+# symbol at once. Outputs follow TA-Lib warm-up and seeding conventions.
+
+def _window_sum(panel: np.ndarray, period: int) -> np.ndarray:
+    """
+    Rolling sum over `period` rows, NaN for the first period - 1 rows.
+    """
+    rows, cols = panel.shape
+    csum = np.zeros((rows + 1, cols))
+    np.cumsum(panel, axis=0, out=csum[1:])
+    out = np.full(panel.shape, np.nan)
+    if rows >= period:
+        out[period - 1:] = csum[period:] - csum[:-period]
+    return out
+
+def _ema_recursive(panel: np.ndarray, period: int, seed_row: int, seed: np.ndarray) -> np.ndarray:
+    """
+    EMA starting at `seed_row` with value `seed`, then out[t] = out[t-1] + k * (x[t] - out[t-1]).
+    """
+    out = np.full(panel.shape, np.nan)
+    if seed_row >= panel.shape[0]:
+        return out
+    k = 2 / (period + 1)
+    out[seed_row] = seed
+    for t in range(seed_row + 1, panel.shape[0]):
+        out[t] = out[t - 1] + k * (panel[t] - out[t - 1])
+    return out
+
+def sma(panel: np.ndarray, period: int) -> np.ndarray:
+    return _window_sum(panel, period) / period
+
+def ema(panel: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA seeded with the SMA of the first `period` bars (TA-Lib default).
+    """
+    return _ema_recursive(panel, period, period - 1, panel[:period].mean(axis=0))
+
+def rsi(panel: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Wilder RSI seeded with the plain average of the first `period` changes.
+    """
+    out = np.full(panel.shape, np.nan)
+    if panel.shape[0] <= period:
+        return out
+
+    change = np.diff(panel, axis=0)
+    gain = np.clip(change, 0, None)
+    loss = np.clip(-change, 0, None)
+
+    avg_gain = gain[:period].mean(axis=0)
+    avg_loss = loss[:period].mean(axis=0)
+    for t in range(period, panel.shape[0]):
+        if t > period:
+            avg_gain = (avg_gain * (period - 1) + gain[t - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + loss[t - 1]) / period
+        total = avg_gain + avg_loss
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[t] = np.where(total == 0, 0.0, 100 * avg_gain / total)
+    # Keep the padding of shorter symbols as NaN
+    out[np.isnan(panel)] = np.nan
+    return out
+
+def macd(panel: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+    """
+    MACD line, signal and histogram as TA-Lib computes them: the fast EMA is
+    seeded on the slow EMA's first window and all outputs start once the
+    signal line exists.
+    """
+    start = slow - 1
+    signal_row = start + signal - 1
+    if panel.shape[0] <= signal_row:
+        empty = np.full(panel.shape, np.nan)
+        return empty, empty.copy(), empty.copy()
+
+    fast_ema = _ema_recursive(panel, fast, start, panel[slow - fast:slow].mean(axis=0))
+    slow_ema = ema(panel, slow)
+    line = fast_ema - slow_ema
+
+    signal_line = _ema_recursive(line, signal, signal_row, line[start:signal_row + 1].mean(axis=0))
+
+    line[:signal_row] = np.nan
+    return line, signal_line, line - signal_line
+
+def bbands(panel: np.ndarray, period: int = 20, nbdev: float = 2) -> tuple:
+    """
+    Bollinger bands (SMA middle, population standard deviation).
+    """
+    # Shift each column by its first close before summing squares, variance is
+    # shift invariant and this avoids cancellation on high priced symbols
+    shift = panel[0]
+    centered = panel - shift
+    mean = _window_sum(centered, period) / period
+    variance = _window_sum(centered * centered, period) / period - mean * mean
+    std = np.sqrt(np.clip(variance, 0, None))
+
+    middle = mean + shift
+    return middle + nbdev * std, middle, middle - nbdev * std
+
+def compute_panel_indicators(panel: np.ndarray) -> dict:
+    """
+    Compute every stored indicator on a price panel.
+
+    Args:
+        panel: closes, shape (bars, symbols), NaN padded after each symbol's last bar
+
+    Returns:
+        a dict of indicator name -> array with the same shape as the panel
+    """
+    out = {
+        'sma_20': sma(panel, 20),
+        'sma_50': sma(panel, 50),
+        'sma_200': sma(panel, 200),
+        'ema_12': ema(panel, 12),
+        'ema_26': ema(panel, 26),
+        'rsi_14': rsi(panel, 14),
+    }
+    out['macd'], out['macd_signal'], out['macd_histogram'] = macd(panel, 12, 26, 9)
+    out['bb_upper'], out['bb_middle'], out['bb_lower'] = bbands(panel, 20, 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out['bb_width'] = (out['bb_upper'] - out['bb_lower']) / out['bb_middle'] * 100
+    return out
@@ -0,0 +1,209 @@
+import json
+from datetime import date
+from operator import itemgetter
+from typing import Optional, Union
+
+import numpy as np
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Columnar parsing of daily OHLCV payloads.
+#
+# A full-history response holds 5000+ bars; building one dict and one
+# Pydantic model per bar dominates ingestion CPU time. Here the payload is
+# decoded once (orjson when installed), each field is converted with a
+# single NumPy call and validation runs as vectorized masks. Only rows that
+# fail a check are looked at individually, to report them.
+
+TIME_SERIES_KEY = "Time Series (Daily)"
+PAYLOAD_FIELDS = ("1. open", "2. high", "3. low", "4. close", "5. volume")
+PRICE_FIELDS = ("open", "high", "low", "close")
+SYMBOL_MAX_LENGTH = 10
+
+
+def decode_json(content: Union[bytes, str]) -> dict:
+    """
+    Decode a JSON payload, with orjson when available.
+    """
+    return _loads(content)
+
+
+class PriceColumns:
+    """
+    Valid daily bars of one symbol as parallel arrays in date order
+    (date: datetime64[D], open/high/low/close: float64, volume: int64),
+    plus the rows rejected by validation as {'row', 'error'} dicts.
+    """
+
+    __slots__ = ("symbol", "date", "open", "high", "low", "close", "volume", "errors")
+
+    def __init__(self, symbol: str, columns: dict, errors: list[dict]):
+        self.symbol = symbol
+        self.date = columns["date"]
+        self.open = columns["open"]
+        self.high = columns["high"]
+        self.low = columns["low"]
+        self.close = columns["close"]
+        self.volume = columns["volume"]
+        self.errors = errors
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    @property
+    def total(self) -> int:
+        """Rows in the payload, valid or not."""
+        return len(self) + len(self.errors)
+
+    def columns(self) -> dict:
+        return {name: getattr(self, name) for name in ("date",) + PRICE_FIELDS + ("volume",)}
+
+    def after(self, day: date) -> "PriceColumns":
+        """
+        Bars strictly newer than `day` (array views, nothing is copied).
+        """
+        start = int(np.searchsorted(self.date, np.datetime64(day, "D"), side="right"))
+        cutoff = day.isoformat()
+        return PriceColumns(
+            self.symbol,
+            {name: values[start:] for name, values in self.columns().items()},
+            [error for error in self.errors if str(error["row"].get("date")) > cutoff]
+        )
+
+    def to_records(self) -> list[dict]:
+        """
+        Plain dicts ready for upsert_stock_prices.
+        """
+        symbol = self.symbol
+        return [
+            {"symbol": symbol, "date": d, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for d, o, h, l, c, v in zip(
+                self.date.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), self.volume.tolist()
+            )
+        ]
+
+
+def _to_float(values: tuple) -> np.ndarray:
+    """
+    Convert numeric strings in one call, NaN for entries that do not parse.
+    """
+    try:
+        return np.array(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        out = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (ValueError, TypeError):
+                out[i] = np.nan
+        return out
+
+
+def _to_dates(values: list) -> np.ndarray:
+    """
+    Convert ISO date strings in one call, NaT for entries that do not parse.
+    """
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except (ValueError, TypeError):
+        out = np.empty(len(values), dtype="datetime64[D]")
+        for i, value in enumerate(values):
+            try:
+                out[i] = np.datetime64(date.fromisoformat(value), "D")
+            except (ValueError, TypeError):
+                out[i] = np.datetime64("NaT")
+        return out
+
+
+def validate_price_columns(symbol: Optional[str], columns: dict) -> np.ndarray:
+    """
+    Check every row at once: valid date, positive prices, high >= low and a
+    positive integer volume (the rules of StockPriceCreate, plus high >= low).
+
+    Args:
+        symbol: symbol of every row
+        columns: date, open, high, low, close, volume arrays (volume as float64)
+
+    Returns:
+        an object array with None for valid rows and the first failed check otherwise
+    """
+    n = len(columns["date"])
+    messages = np.full(n, None, dtype=object)
+
+    # Checks run from last to first so the first failing one wins
+    volume = columns["volume"]
+    checks = [
+        (np.bool_(not (symbol and len(symbol) <= SYMBOL_MAX_LENGTH)), f"symbol: must be 1 to {SYMBOL_MAX_LENGTH} characters"),
+        (np.isnat(columns["date"]), "date: not a valid date"),
+        *[(~(columns[name] > 0), f"{name}: must be a positive number") for name in PRICE_FIELDS],
+        (~((volume > 0) & (volume == np.floor(volume))), "volume: must be a positive integer"),
+        (columns["high"] < columns["low"], "high: lower than low"),
+    ]
+    for mask, message in reversed(checks):
+        messages[np.broadcast_to(mask, n)] = message
+    return messages
+
+
+def finish_columns(columns: dict, valid: np.ndarray) -> dict:
+    """
+    Keep the valid rows in date order, volume as int64. When a date repeats
+    the last occurrence wins (a single upsert cannot touch a row twice).
+    """
+    order = np.argsort(columns["date"][valid], kind="stable")
+    columns = {name: values[valid][order] for name, values in columns.items()}
+    dates = columns["date"]
+    if len(dates) > 1:
+        last = np.append(dates[1:] != dates[:-1], True)
+        if not last.all():
+            columns = {name: values[last] for name, values in columns.items()}
+    columns["volume"] = columns["volume"].astype(np.int64)
+    return columns
+
+
+def parse_time_series(payload: Union[bytes, str, dict]) -> PriceColumns:
+    """
+    Parse an Alpha Vantage TIME_SERIES_DAILY payload into columns.
+
+    Args:
+        payload: raw response bytes or the already decoded dict
+
+    Returns:
+        the valid bars in date order and the rejected rows
+    """
+    data = decode_json(payload) if isinstance(payload, (bytes, str)) else payload
+    symbol = data.get("Meta Data", {}).get("2. Symbol")
+    time_series = data.get(TIME_SERIES_KEY, {})
+
+    keys = list(time_series)
+    rows = list(time_series.values())
+    try:
+        getter = itemgetter(*PAYLOAD_FIELDS)
+        fields = list(zip(*map(getter, rows))) or [()] * len(PAYLOAD_FIELDS)
+    except (KeyError, TypeError):
+        # Some row lacks a field (or is not an object), missing values become NaN
+        fields = [
+            tuple(row.get(name) if isinstance(row, dict) else None for row in rows)
+            for name in PAYLOAD_FIELDS
+        ]
+
+    columns = {"date": _to_dates(keys)}
+    for name, values in zip(PRICE_FIELDS + ("volume",), fields):
+        columns[name] = _to_float(values)
+
+    messages = validate_price_columns(symbol, columns)
+    valid = np.equal(messages, None)
+    invalid = np.flatnonzero(~valid)
+    errors = [
+        {
+            "row": {"symbol": symbol, "date": keys[i], **(rows[i] if isinstance(rows[i], dict) else {})},
+            "error": messages[i]
+        }
+        for i in invalid
+    ]
+
+    return PriceColumns(symbol, finish_columns(columns, valid), errors)
@@ -0,0 +1,105 @@
+import gzip
+import os
+import tempfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+from app.schemas.stock import is_valid_symbol
+
+MARKET_TZ = ZoneInfo("America/New_York")
+
+# Daily bars of a session are published a little after the 16:00 close
+MARKET_CLOSE = time(16, 0)
+PUBLISH_DELAY = timedelta(minutes=30)
+
+def last_trading_date(now: Optional[datetime] = None) -> date:
+    """
+    Date of the most recent session whose daily bar should be published.
+
+    Before close + delay (or on weekends) this is the previous weekday.
+    Exchange holidays are not modelled, they only cost one extra fetch.
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    day = now.date()
+    if now < datetime.combine(day, MARKET_CLOSE, MARKET_TZ) + PUBLISH_DELAY:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+class RawResponseCache:
+    """
+    On-disk store of raw Alpha Vantage responses, gzip compressed.
+
+    Layout: <root>/<function>/<outputsize>/<SYMBOL>/<trading date>.json.gz
+    A response stored under the last trading date is fresh: nothing newer
+    can be published before the next close, so it is served without
+    spending API quota.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _dir(self, function: str, symbol: str, outputsize: str) -> Path:
+        # The symbol becomes a path component, never let it leave the root
+        if not is_valid_symbol(symbol):
+            raise ValueError(f"Invalid symbol: {symbol!r}")
+        return self.root / function / outputsize / symbol.upper()
+
+    def get(self, function: str, symbol: str, outputsize: str, trading_date: date) -> Optional[bytes]:
+        """
+        Raw response stored for `trading_date`, or None.
+        """
+        path = self._dir(function, symbol, outputsize) / f"{trading_date.isoformat()}.json.gz"
+        if not path.exists():
+            return None
+        return gzip.decompress(path.read_bytes())
+
+    def get_latest(self, function: str, symbol: str, outputsize: str) -> Optional[bytes]:
+        """
+        Most recent raw response stored for the key, whatever its date (replay mode).
+        """
+        directory = self._dir(function, symbol, outputsize)
+        if not directory.is_dir():
+            return None
+        files = sorted(directory.glob("*.json.gz"))
+        return gzip.decompress(files[-1].read_bytes()) if files else None
+
+    def put(self, function: str, symbol: str, outputsize: str, trading_date: date, content: bytes):
+        """
+        Store a raw response (atomically, concurrent readers never see partial files).
+        """
+        directory = self._dir(function, symbol, outputsize)
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(content))
+        os.replace(tmp_path, directory / f"{trading_date.isoformat()}.json.gz")
+
+    def lookup(self, function: str, symbol: str, outputsize: str) -> Optional[bytes]:
+        """
+        Cached response to serve for the key: the latest one in offline mode,
+        otherwise only a fresh one.
+        """
+        if settings.ALPHA_VANTAGE_OFFLINE:
+            return self.get_latest(function, symbol, outputsize)
+        return self.get(function, symbol, outputsize, last_trading_date())
+
+    def store(self, function: str, symbol: str, outputsize: str, content: bytes):
+        self.put(function, symbol, outputsize, last_trading_date(), content)
+
+
+def build_response_cache() -> Optional[RawResponseCache]:
+    """
+    Cache configured by ALPHA_VANTAGE_CACHE_DIR (None when disabled).
+    """
+    if not settings.ALPHA_VANTAGE_CACHE_DIR:
+        return None
+    return RawResponseCache(settings.ALPHA_VANTAGE_CACHE_DIR)
+
+
+response_cache = build_response_cache()
@@ -0,0 +1,187 @@
+import math
+from collections import deque
+from typing import Optional
+
+NAN = float('nan')
+
+class RollingIndicators:
+    """
+    Per-symbol rolling state that produces the same indicators as
+    TechnicalIndicatorsService one bar at a time, in O(1) per bar.
+
+    Reproduces TA-Lib conventions:
+    - EMA seeded with the SMA of its first `period` closes
+    - MACD fast EMA seeded on the slow EMA's window, all three MACD outputs
+      start once the signal line exists (bar 33)
+    - Wilder RSI seeded with the plain average of the first 14 changes
+    - Bollinger bands with population standard deviation
+    """
+    SMA_PERIODS = (20, 50, 200)
+    EMA_PERIODS = (12, 26)
+    RSI_PERIOD = 14
+    MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+    BB_PERIOD, BB_DEV = 20, 2
+
+    # Longest lookback, number of closes kept in the window
+    WINDOW = max(SMA_PERIODS)
+
+    def __init__(self):
+        self.count = 0                                 # bars folded in so far
+        self.closes = deque(maxlen=self.WINDOW)        # last WINDOW closes
+        self.sums = {n: 0.0 for n in self.SMA_PERIODS}
+        self.sumsq_bb = 0.0
+        self.ema = {n: None for n in self.EMA_PERIODS}
+        self.macd_fast: Optional[float] = None
+        self.macd_signal: Optional[float] = None
+        self.macd_seed: list[float] = []               # MACD values used to seed the signal line
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+        self.seed_gain = 0.0
+        self.seed_loss = 0.0
+
+    @staticmethod
+    def _k(period: int) -> float:
+        return 2 / (period + 1)
+
+    def _tail_mean(self, n: int) -> float:
+        return sum(list(self.closes)[-n:]) / n
+
+    def update(self, close: float) -> dict:
+        """
+        Fold a new close into the state.
+
+        Args:
+            close: closing price of the next bar (bars must arrive in date order)
+
+        Returns:
+            a dict with the 13 indicator values for that bar (NaN during warm-up)
+        """
+        i = self.count
+        prev_close = self.closes[-1] if self.closes else None
+
+        # Rolling window sums (value leaving the window is read before append)
+        for n in self.SMA_PERIODS:
+            if i >= n:
+                self.sums[n] -= self.closes[-n]
+            self.sums[n] += close
+        if i >= self.BB_PERIOD:
+            self.sumsq_bb -= self.closes[-self.BB_PERIOD] ** 2
+        self.sumsq_bb += close * close
+
+        self.closes.append(close)
+        self.count += 1
+
+        # Re-sum from the window once in a while to stop float drift
+        if self.count % self.WINDOW == 0:
+            window = list(self.closes)
+            for n in self.SMA_PERIODS:
+                self.sums[n] = sum(window[-n:])
+            self.sumsq_bb = sum(c * c for c in window[-self.BB_PERIOD:])
+
+        out = {}
+
+        # Simple moving averages
+        for n in self.SMA_PERIODS:
+            out[f'sma_{n}'] = self.sums[n] / n if self.count >= n else NAN
+
+        # Exponential moving averages
+        for n in self.EMA_PERIODS:
+            if i == n - 1:
+                self.ema[n] = self._tail_mean(n)
+            elif i >= n:
+                self.ema[n] += (close - self.ema[n]) * self._k(n)
+            out[f'ema_{n}'] = self.ema[n] if self.ema[n] is not None else NAN
+
+        # RSI (Wilder smoothing)
+        n = self.RSI_PERIOD
+        if prev_close is not None:
+            change = close - prev_close
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            if i <= n:
+                self.seed_gain += gain
+                self.seed_loss += loss
+                if i == n:
+                    self.avg_gain = self.seed_gain / n
+                    self.avg_loss = self.seed_loss / n
+            else:
+                self.avg_gain = (self.avg_gain * (n - 1) + gain) / n
+                self.avg_loss = (self.avg_loss * (n - 1) + loss) / n
+        if self.avg_gain is not None:
+            total = self.avg_gain + self.avg_loss
+            out['rsi_14'] = 100 * self.avg_gain / total if total != 0 else 0.0
+        else:
+            out['rsi_14'] = NAN
+
+        # MACD
+        out['macd'] = out['macd_signal'] = out['macd_histogram'] = NAN
+        if i == self.MACD_SLOW - 1:
+            self.macd_fast = self._tail_mean(self.MACD_FAST)
+        elif i >= self.MACD_SLOW:
+            self.macd_fast += (close - self.macd_fast) * self._k(self.MACD_FAST)
+        if self.macd_fast is not None:
+            macd = self.macd_fast - self.ema[self.MACD_SLOW]
+            if self.macd_signal is None:
+                self.macd_seed.append(macd)
+                if len(self.macd_seed) == self.MACD_SIGNAL:
+                    self.macd_signal = sum(self.macd_seed) / self.MACD_SIGNAL
+                    self.macd_seed = []
+            else:
+                self.macd_signal += (macd - self.macd_signal) * self._k(self.MACD_SIGNAL)
+            if self.macd_signal is not None:
+                out['macd'] = macd
+                out['macd_signal'] = self.macd_signal
+                out['macd_histogram'] = macd - self.macd_signal
+
+        # Bollinger bands
+        n = self.BB_PERIOD
+        if self.count >= n:
+            middle = self.sums[n] / n
+            variance = self.sumsq_bb / n - middle * middle
+            std = math.sqrt(variance) if variance > 0 else 0.0
+            out['bb_upper'] = middle + self.BB_DEV * std
+            out['bb_middle'] = middle
+            out['bb_lower'] = middle - self.BB_DEV * std
+            out['bb_width'] = (out['bb_upper'] - out['bb_lower']) / middle * 100
+        else:
+            out['bb_upper'] = out['bb_middle'] = out['bb_lower'] = out['bb_width'] = NAN
+
+        return out
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the state (JSON compatible).
+        """
+        return {
+            'count': self.count,
+            'closes': list(self.closes),
+            'sums': {str(n): v for n, v in self.sums.items()},
+            'sumsq_bb': self.sumsq_bb,
+            'ema': {str(n): v for n, v in self.ema.items()},
+            'macd_fast': self.macd_fast,
+            'macd_signal': self.macd_signal,
+            'macd_seed': self.macd_seed,
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'seed_gain': self.seed_gain,
+            'seed_loss': self.seed_loss,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RollingIndicators":
+        """
+        Rebuild a state serialized with to_dict.
+        """
+        state = cls()
+        state.count = data['count']
+        state.closes.extend(data['closes'])
+        state.sums = {int(n): v for n, v in data['sums'].items()}
+        state.sumsq_bb = data['sumsq_bb']
+        state.ema = {int(n): v for n, v in data['ema'].items()}
+        state.macd_fast = data['macd_fast']
+        state.macd_signal = data['macd_signal']
+        state.macd_seed = list(data['macd_seed'])
+        state.avg_gain = data['avg_gain']
+        state.avg_loss = data['avg_loss']
+        state.seed_gain = data['seed_gain']
+        state.seed_loss = data['seed_loss']
+        return state
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.crud.rollup import ROLLUP_INTERVALS, load_rollup_rows, save_rollup_rows, upsert_rollup_bars
+from app.crud.technical_indicator import INDICATOR_COLUMNS
+from app.services.technical_indicator import compute_talib_indicators
+
+def period_start(day: date, interval: str) -> date:
+    """
+    First day of the rollup period containing `day` (weeks start on Monday, like date_trunc).
+    """
+    unit = ROLLUP_INTERVALS[interval]
+    if unit == "week":
+        return day - timedelta(days=day.weekday())
+    if unit == "month":
+        return day.replace(day=1)
+    return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+
+def refresh_rollups(db: Session, symbol: str, since: Optional[date] = None, intervals: Iterable[str] = ROLLUP_INTERVALS) -> dict:
+    """
+    Bring a symbol's rollups up to date after daily bars from `since` were
+    written. Part of the caller's transaction, which commits it with the
+    daily bars and then invalidates the symbol's cached queries.
+
+    Only the periods from the one containing `since` are re-aggregated from
+    daily prices (None = the whole history). Indicators are then recomputed
+    on the rollup closes, which takes the whole (short) rollup series for
+    warm-up, and written for the refreshed periods only.
+
+    Args:
+        db: Database session
+        symbol: Stock symbol
+        since: earliest daily bar written (None = rebuild everything)
+        intervals: rollup intervals to refresh
+
+    Returns:
+        a dict of interval -> number of rollup bars refreshed
+    """
+    refreshed = {}
+
+    for interval in intervals:
+        start = period_start(since, interval) if since else None
+        upsert_rollup_bars(db, symbol, interval, start)
+
+        rows = load_rollup_rows(db, symbol, interval)
+        if not rows:
+            refreshed[interval] = 0
+            continue
+
+        close = np.array([row['close'] for row in rows], dtype=np.float64)
+        indicators = compute_talib_indicators(close)
+
+        first = 0 if start is None else next((i for i, row in enumerate(rows) if row['date'] >= start), len(rows))
+        records = []
+        for i in range(first, len(rows)):
+            record = rows[i]
+            for name in INDICATOR_COLUMNS:
+                value = indicators[name][i]
+                record[name] = None if np.isnan(value) else float(value)
+            records.append(record)
+
+        refreshed[interval] = save_rollup_rows(db, records)
+
+    return refreshed
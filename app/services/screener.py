@@ -0,0 +1,67 @@
+import operator
+import re
+from typing import Iterable, NamedTuple, Optional, Union
+
+from app.crud.technical_indicator import EXTRA_INDICATORS, INDICATOR_COLUMNS
+
+# Fields of the latest_indicators snapshot that can be filtered and sorted on.
+# Extra registry indicators are read from the `extra` JSONB column.
+SCREENER_FIELDS = ['close', 'volume'] + INDICATOR_COLUMNS + EXTRA_INDICATORS
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '=': operator.eq,
+    '!=': operator.ne,
+}
+
+_FILTER = re.compile(r"^\s*([a-z_][a-z0-9_]*)\s*(<=|>=|!=|<|>|=)\s*(\S+)\s*$")
+
+
+class ScreenerFilter(NamedTuple):
+    field: str
+    op: str
+    value: Union[float, str]     # a number, or another field name
+
+
+def parse_filter(expression: str) -> ScreenerFilter:
+    """
+    Parse one filter expression, `<field> <op> <number or field>`,
+    e.g. "rsi_14 < 30" or "close > sma_200".
+    
+    Raises:
+        ValueError: malformed expression or unknown field
+    """
+    match = _FILTER.match(expression.lower())
+    if not match:
+        raise ValueError(f"Invalid filter '{expression}', expected <field> <op> <value> with op in {', '.join(OPERATORS)}")
+    field, op, value = match.groups()
+    if field not in SCREENER_FIELDS:
+        raise ValueError(f"Unknown field '{field}' in filter '{expression}'")
+    try:
+        return ScreenerFilter(field, op, float(value))
+    except ValueError:
+        pass
+    if value not in SCREENER_FIELDS:
+        raise ValueError(f"Unknown field '{value}' in filter '{expression}'")
+    return ScreenerFilter(field, op, value)
+
+
+def parse_filters(expressions: Optional[Iterable[str]]) -> list[ScreenerFilter]:
+    return [parse_filter(expression) for expression in expressions or []]
+
+
+def parse_sort(sort: Optional[str]) -> tuple[str, bool]:
+    """
+    "rsi_14" (ascending) or "-rsi_14" (descending) -> (field, descending).
+    Defaults to the symbol.
+    """
+    if not sort:
+        return 'symbol', False
+    descending = sort.startswith('-')
+    field = sort.lstrip('-+').lower()
+    if field != 'symbol' and field not in SCREENER_FIELDS:
+        raise ValueError(f"Unknown sort field '{field}'")
+    return field, descending
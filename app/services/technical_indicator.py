@@ -1,7 +1,111 @@
+import multiprocessing
+import os
+import threading
+import time
+from datetime import date, timedelta
+import numpy as np
 import pandas as pd
-import talib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
 from sqlalchemy.orm import Session
-from app.models.stock import StockPrice
+from app.core.config import settings
+from app.core.metrics import span
+from app.core.price_store import COLUMNS, price_store
+from app.models.indicator_state import IndicatorState
+from app.crud.stock import load_price_columns
+from app.crud.technical_indicator import INDICATOR_COLUMNS, save_indicators
+from app.services.rolling_indicator import RollingIndicators
+from app.services.panel_indicator import compute_panel_indicators
+from app.services.indicator_registry import DEFAULT_INDICATORS, compute_indicators, history_needed, required_inputs
+
+def compute_talib_indicators(close: np.ndarray) -> dict:
+    """
+    Calculate every indicator stored in a technical_indicators column with TA-Lib.
+    
+    Args:
+        close: float64 closing prices in chronological order
+    
+    Returns:
+        a dict of indicator name -> array aligned with `close`
+    """
+    return compute_indicators({'close': close}, INDICATOR_COLUMNS)
+
+# One pool of TA-Lib workers per API process, started on the first parallel
+# recompute and shut down by the app's lifespan hook. Workers are spawned
+# rather than forked, so they do not inherit the parent's threads or its
+# open database connections.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+def _init_worker():
+    # Workers never query the database, drop any pooled connection the import opened
+    from app.core.database import engine
+    engine.dispose(close=False)
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    The shared worker pool, with at least `workers` processes.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                # Running recomputes keep their futures, the old workers exit once idle
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+            _pool_workers = workers
+        return _pool
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    # A worker died, the next recompute starts a new pool
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_workers = None, 0
+    pool.shutdown(wait=False)
+
+def shutdown_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+def _compute_shared_slice(input_name: str, output_name: str, total: int, offsets: np.ndarray, first: int, last: int) -> int:
+    """
+    Process pool worker: compute TA-Lib indicators for symbols [first, last).
+    
+    Closes are read from the `input_name` shared memory block (float64, length
+    `total`, symbol i spans offsets[i]:offsets[i+1]) and results are written in
+    place into the `output_name` block (one row per indicator column), so no
+    price or indicator arrays are pickled between processes.
+    """
+    input_shm = SharedMemory(name=input_name)
+    output_shm = SharedMemory(name=output_name)
+    closes = results = None
+    try:
+        closes = np.ndarray((total,), dtype=np.float64, buffer=input_shm.buf)
+        results = np.ndarray((len(INDICATOR_COLUMNS), total), dtype=np.float64, buffer=output_shm.buf)
+        
+        for i in range(first, last):
+            lo, hi = offsets[i], offsets[i + 1]
+            values = compute_talib_indicators(closes[lo:hi])
+            for row, name in enumerate(INDICATOR_COLUMNS):
+                results[row, lo:hi] = values[name]
+        
+        return last - first
+    finally:
+        # Views must be released before the blocks can be closed
+        closes = results = None
+        input_shm.close()
+        output_shm.close()
 
 class TechnicalIndicatorsService:
     """
@@ -12,70 +116,253 @@ class TechnicalIndicatorsService:
     def __init__(self, db: Session):
         self.db = db
     
-    def calculate_indicators(self, symbol: str, days: int = 200) -> pd.DataFrame:
+    def calculate_indicators(self, symbol: str, days: int = 200, indicators: Optional[list[str]] = None) -> pd.DataFrame:
         """
         Calculate technical indicators for a given symbol
         
+        Only the requested indicators (and what they depend on) are computed.
+        Enough extra history is loaded for their warm-up, so every returned
+        day has settled values.
+        
         Args:
             symbol: ticker symbol (e.g. "AAPL").
-            days: number of days to fetch (default 200 for SMA 200)
+            days: number of most recent days to return
+            indicators: registry names to compute (default: DEFAULT_INDICATORS,
+                every one with a bounded warm-up)
         
         Returns:
             a pandas dataframe with prices and calculated indicators
         """
-        prices = self.db.query(StockPrice).filter(StockPrice.symbol == symbol).order_by(StockPrice.date.asc()).limit(days).all()
+        names = list(indicators or DEFAULT_INDICATORS)
+        warmup = history_needed(names)
+        
+        # Newest bars, in chronological order (whole history when an indicator needs it)
+        df = self._load_bars(symbol, last_n=None if warmup is None else days + warmup)
         
-        if not prices:
+        if df.empty:
             raise ValueError(f"No price data found for symbol {symbol}")
         
-        if len(prices) < 20:
-            raise ValueError(f"Insufficient data for {symbol}. Need at least 20 days of data, got {len(prices)}")
+        if len(df) < 20:
+            raise ValueError(f"Insufficient data for {symbol}. Need at least 20 days of data, got {len(df)}")
         
-        # Convert to pandas DataFrame
-        df = pd.DataFrame([{
-            'date': p.date,
-            'open': float(p.open),
-            'high': float(p.high),
-            'low': float(p.low),
-            'close': float(p.close),
-            'volume': int(p.volume)
-        } for p in prices])
+        # Calculate indicators using TA-Lib
+        with span("indicators.compute"):
+            values = compute_indicators({column: df[column].to_numpy() for column in required_inputs(names)}, names)
+        for name, column in values.items():
+            df[name] = column
         
-        # Convert date to datetime
-        df['date'] = pd.to_datetime(df['date'])
+        df = df.iloc[-days:].reset_index(drop=True)
         
-        # Calculate indicators using TA-Lib
+        # Add symbol
+        df['symbol'] = symbol
         
-        # Moving averages
-        df['sma_20'] = talib.SMA(df['close'], timeperiod=20)
-        df['sma_50'] = talib.SMA(df['close'], timeperiod=50)
-        df['sma_200'] = talib.SMA(df['close'], timeperiod=200)
+        return df
+    
+    def update_indicators_incremental(self, symbol: str, rebuild: bool = False) -> pd.DataFrame:
+        """
+        Calculate indicators only for bars newer than the stored rolling state.
         
-        # Exponential moving averages
-        df['ema_12'] = talib.EMA(df['close'], timeperiod=12)
-        df['ema_26'] = talib.EMA(df['close'], timeperiod=26)
+        The first call for a symbol folds its whole history into a new state
+        (and returns every bar); later calls cost O(1) per new bar. Results
+        match TA-Lib within floating point tolerance.
         
-        # Momentum indicators
-        df['rsi_14'] = talib.RSI(df['close'], timeperiod=14)
+        The updated state is added to the session but not committed, so it is
+        persisted in the same transaction as the indicators by save_indicators.
         
-        # MACD (Moving Average Convergence Divergence)
-        macd, macd_signal, macd_hist = talib.MACD(df['close'], fastperiod=12, slowperiod=26, signalperiod=9)
-        df['macd'] = macd
-        df['macd_signal'] = macd_signal
-        df['macd_histogram'] = macd_hist
+        Args:
+            symbol: ticker symbol (e.g. "AAPL").
+            rebuild: ignore the stored state and start again from the first bar
+                (needed after a full-history backfill)
         
-        # Volatility indicators
-        bb_upper, bb_middle, bb_lower = talib.BBANDS(df['close'], timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
-        #nbdevup/nbdevdn: number of standard deviations (2 = 95% interval)
-        #matype=0: average type = SMA
+        Returns:
+            a pandas dataframe with prices and indicators for the new bars only
+            (empty if the state is already up to date)
+        """
+        df, record = self.compute_incremental(symbol, rebuild=rebuild)
+        if record is not None:
+            self.db.merge(record)
+        return df
+    
+    def compute_incremental(self, symbol: str, rebuild: bool = False) -> tuple[pd.DataFrame, Optional[IndicatorState]]:
+        """
+        Same as update_indicators_incremental, but returns the new state
+        (None if there were no new bars) instead of adding it to the session.
+        """
+        record = None if rebuild else self.db.get(IndicatorState, symbol)
         
-        df['bb_upper'] = bb_upper
-        df['bb_middle'] = bb_middle
-        df['bb_lower'] = bb_lower
-        # Calculate band width (percentage) because TA-Lib can't
-        df['bb_width'] = ((bb_upper - bb_lower) / bb_middle) * 100
+        start_date = record.date + timedelta(days=1) if record is not None else None
+        df = self._load_bars(symbol, start_date=start_date)
+        
+        if record is None and df.empty:
+            raise ValueError(f"No price data found for symbol {symbol}")
+        
+        state = RollingIndicators.from_dict(record.state) if record is not None else RollingIndicators()
+        
+        new_record = None
+        if not df.empty:
+            with span("indicators.compute_incremental"):
+                rows = [state.update(close) for close in df['close'].tolist()]
+            df = pd.concat([df, pd.DataFrame(rows, index=df.index)], axis=1)
+            
+            new_record = IndicatorState(symbol=symbol, date=df['date'].iloc[-1].date(), state=state.to_dict())
         
-        # Add symbol
         df['symbol'] = symbol
+        return df, new_record
+    
+    def recompute_universe(self, symbols: Optional[list[str]] = None, days: Optional[int] = None) -> dict:
+        """
+        Recompute indicators for many symbols at once and save them in bulk.
+        
+        All closes are loaded with a single query into a 2-D panel
+        (bars x symbols) and indicators are computed on the whole panel with
+        vectorized NumPy code instead of one TA-Lib call per symbol.
+        
+        Args:
+            symbols: symbols to recompute (None = every symbol)
+            days: only use the most recent `days` bars of each symbol (None = full history)
+        
+        Returns:
+            summary with the number of symbols, bars and saved rows, and
+            per-stage timings in seconds (all zero when there are no prices)
+        """
+        timings = {}
+        start = time.perf_counter()
+        
+        prices = self._load_closes(symbols=symbols, days=days)
+        if prices.empty:
+            return {"symbols": 0, "bars": 0, "saved": 0, "timings": {}}
+        
+        # Row position of each bar inside its symbol's column
+        codes, symbols = pd.factorize(prices['symbol'])
+        position = prices.groupby('symbol', sort=False).cumcount().to_numpy()
+        panel = np.full((position.max() + 1, len(symbols)), np.nan)
+        panel[position, codes] = prices['close'].to_numpy(dtype=np.float64)
+        timings['load'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        indicators = compute_panel_indicators(panel)
+        df = pd.DataFrame({
+            'symbol': prices['symbol'],
+            'date': pd.to_datetime(prices['date']),
+            **{name: values[position, codes] for name, values in indicators.items()}
+        })
+        timings['compute'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        saved = save_indicators(self.db, df)
+        timings['write'] = time.perf_counter() - start
+        
+        return {
+            "symbols": len(symbols),
+            "bars": len(prices),
+            "saved": saved,
+            "timings": {stage: round(seconds, 3) for stage, seconds in timings.items()}
+        }
+    
+    def recompute_parallel(self, symbols: Optional[list[str]] = None, days: Optional[int] = None, workers: Optional[int] = None) -> dict:
+        """
+        Recompute indicators with TA-Lib, splitting symbols across a process pool.
+        
+        Closes are loaded once and copied into a shared memory block; workers
+        of the process-wide pool read raw float64 slices from it and write
+        indicator values into a second shared block, then this process saves
+        everything in bulk.
+        
+        Args:
+            symbols: symbols to recompute (None = every symbol)
+            days: only use the most recent `days` bars of each symbol (None = full history)
+            workers: number of worker processes (default INDICATOR_WORKERS or the CPU count)
         
-        return df
\ No newline at end of file
+        Returns:
+            summary with the number of symbols, bars and saved rows, worker
+            count and per-stage timings (load, compute, write) in seconds
+            (all zero when there are no prices)
+        """
+        workers = workers or settings.INDICATOR_WORKERS or os.cpu_count() or 1
+        timings = {}
+        start = time.perf_counter()
+        
+        prices = self._load_closes(symbols=symbols, days=days)
+        if prices.empty:
+            return {"symbols": 0, "bars": 0, "saved": 0, "workers": workers, "timings": {}}
+        
+        # Rows are grouped by symbol, so each symbol is one contiguous slice
+        closes = prices['close'].to_numpy(dtype=np.float64)
+        boundaries = np.flatnonzero(prices['symbol'].to_numpy()[1:] != prices['symbol'].to_numpy()[:-1]) + 1
+        offsets = np.concatenate(([0], boundaries, [len(closes)]))
+        n_symbols = len(offsets) - 1
+        timings['load'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        input_shm = SharedMemory(create=True, size=closes.nbytes)
+        output_shm = SharedMemory(create=True, size=closes.nbytes * len(INDICATOR_COLUMNS))
+        try:
+            np.ndarray(closes.shape, dtype=np.float64, buffer=input_shm.buf)[:] = closes
+            
+            # About 4 chunks per worker, balanced by number of bars
+            targets = np.linspace(0, len(closes), min(n_symbols, workers * 4) + 1)
+            cuts = np.unique(np.searchsorted(offsets, targets[1:-1]))
+            bounds = [0, *[int(c) for c in cuts if 0 < c < n_symbols], n_symbols]
+            
+            pool = _get_pool(workers)
+            futures = [
+                pool.submit(_compute_shared_slice, input_shm.name, output_shm.name, len(closes), offsets, first, last)
+                for first, last in zip(bounds[:-1], bounds[1:])
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except BrokenProcessPool:
+                _discard_pool(pool)
+                raise
+            
+            results = np.ndarray((len(INDICATOR_COLUMNS), len(closes)), dtype=np.float64, buffer=output_shm.buf).copy()
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+        
+        df = pd.DataFrame({
+            'symbol': prices['symbol'],
+            'date': pd.to_datetime(prices['date']),
+            **{name: results[row] for row, name in enumerate(INDICATOR_COLUMNS)}
+        })
+        timings['compute'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        saved = save_indicators(self.db, df)
+        timings['write'] = time.perf_counter() - start
+        
+        return {
+            "symbols": n_symbols,
+            "bars": len(prices),
+            "saved": saved,
+            "workers": workers,
+            "timings": {stage: round(seconds, 3) for stage, seconds in timings.items()}
+        }
+    
+    def _load_closes(self, symbols: Optional[list[str]] = None, days: Optional[int] = None) -> pd.DataFrame:
+        """
+        Load (symbol, date, close) for many symbols in one query, grouped by symbol and sorted by date.
+        """
+        columns = load_price_columns(self.db, symbols=symbols, columns=('symbol', 'date', 'close'), last_n=days)
+        return pd.DataFrame(columns)
+    
+    def _load_bars(self, symbol: str, start_date: Optional[date] = None, last_n: Optional[int] = None) -> pd.DataFrame:
+        """
+        Load one symbol's OHLCV bars into a DataFrame, in chronological order.
+        
+        Served from the in-process price store (app.core.price_store) when
+        the symbol is held, the database is only read on a miss.
+        """
+        def load(start: Optional[date], n: Optional[int]) -> dict:
+            return load_price_columns(self.db, symbols=[symbol], columns=COLUMNS, start_date=start, last_n=n)
+        
+        with span("indicators.load"):
+            columns = price_store.get_or_load(symbol, load, start_date, last_n)
+        df = pd.DataFrame(columns)
+        
+        # Convert date to datetime
+        df['date'] = pd.to_datetime(df['date'])
+        return df
@@ -0,0 +1,54 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.1]
+
+Prints the p50/p99 latency and throughput change of every benchmark present
+in both files and exits with status 1 when a p50 or p99 latency grew by more
+than --threshold (relative), so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return {result["name"]: result for result in json.load(f)["results"]}
+
+
+def change(old, new):
+    if not old or new is None:
+        return None
+    return (new - old) / old
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative latency increase")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    regressions = []
+
+    print(f"{'benchmark':<40} {'p50':>9} {'p99':>9} {'rows/s':>9}")
+    for name in baseline:
+        if name not in candidate:
+            continue
+        old, new = baseline[name], candidate[name]
+        deltas = {key: change(old.get(key), new.get(key)) for key in ("p50_s", "p99_s", "rows_per_s")}
+        print(f"{name:<40} " + " ".join(
+            f"{delta:+9.1%}" if delta is not None else f"{'-':>9}" for delta in deltas.values()
+        ))
+        if any(deltas[key] is not None and deltas[key] > args.threshold for key in ("p50_s", "p99_s")):
+            regressions.append(name)
+
+    if regressions:
+        print(f"\nRegressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import httpx
+
+from app.main import app
+
+from benchmarks.harness import ameasure
+
+# End-to-end benchmarks: requests go through the whole FastAPI stack
+# (routing, validation, database, serialization) with an in-process ASGI
+# client, so no server or network is involved. Needs the benchmark symbols
+# seeded with prices and indicators.
+
+
+async def bench_routes(symbols: list[str], requests: int, concurrency: int) -> list[dict]:
+    transport = httpx.ASGITransport(app=app)
+    results = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        position = 0
+
+        def next_symbol() -> str:
+            # Rotate through the symbols so per-symbol caches see a realistic mix
+            nonlocal position
+            position += 1
+            return symbols[position % len(symbols)]
+
+        async def get(url: str, **params):
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+
+        routes = [
+            ("GET /stocks/", lambda: get("/api/v1/stocks/", symbol=next_symbol(), limit=100)),
+            ("GET /stocks/{symbol}/indicators", lambda: get(f"/api/v1/stocks/{next_symbol()}/indicators", limit=100)),
+            ("GET /stocks/{symbol}/indicators/latest", lambda: get(f"/api/v1/stocks/{next_symbol()}/indicators/latest")),
+            ("GET /screener", lambda: get("/api/v1/screener", filter=["rsi_14<50", "close>sma_50"], sort="-volume", limit=100)),
+        ]
+        for name, call in routes:
+            results.append(await ameasure(name, call, requests, concurrency))
+
+        # Large pages: response model against the fields= fast path
+        large = [
+            ("GET /stocks/ limit=10000", lambda: get("/api/v1/stocks/", limit=10000)),
+            ("GET /stocks/ limit=10000 fields=*", lambda: get("/api/v1/stocks/", limit=10000, fields="*")),
+            ("GET /stocks/ limit=10000 fields=date,close", lambda: get("/api/v1/stocks/", limit=10000, fields="date,close")),
+        ]
+        for name, call in large:
+            results.append(await ameasure(name, call, max(requests // 10, 1), 1, warmup=1, rows=10000))
+
+        async def calculate():
+            response = await client.post(f"/api/v1/stocks/{next_symbol()}/indicators")
+            response.raise_for_status()
+
+        # Writes are much slower, a tenth of the requests is enough
+        results.append(await ameasure("POST /stocks/{symbol}/indicators", calculate, max(requests // 10, 1), 1, warmup=1))
+
+    return results
@@ -0,0 +1,112 @@
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+
+# Timing helpers shared by the micro and end-to-end benchmarks. Every result
+# is a flat dict (name, samples, rows, p50/p99/mean/min seconds, rows/s)
+# so two result files can be compared key by key (see compare.py).
+
+
+def summarize(name: str, samples: list[float], rows: Optional[int] = None, **extra) -> dict:
+    """
+    Latency percentiles of `samples` (seconds); `rows` processed per sample
+    gives the throughput at the median.
+    """
+    timings = np.asarray(samples, dtype=np.float64)
+    result = {
+        "name": name,
+        "samples": len(timings),
+        "p50_s": float(np.percentile(timings, 50)),
+        "p99_s": float(np.percentile(timings, 99)),
+        "mean_s": float(timings.mean()),
+        "min_s": float(timings.min()),
+        **extra
+    }
+    if rows is not None:
+        result["rows"] = rows
+        result["rows_per_s"] = rows / result["p50_s"] if result["p50_s"] > 0 else None
+    print(
+        f"{name:<40} p50 {result['p50_s'] * 1000:9.2f} ms  p99 {result['p99_s'] * 1000:9.2f} ms"
+        + (f"  {result['rows_per_s']:12.0f} rows/s" if result.get("rows_per_s") else "")
+    )
+    return result
+
+
+def measure(name: str, fn: Callable[[], Optional[int]], repeat: int = 5, warmup: int = 1,
+            setup: Optional[Callable[[], None]] = None, **extra) -> dict:
+    """
+    Call `fn` warmup + repeat times and summarize the timed calls.
+    `fn` may return the number of rows it processed; `setup` runs untimed
+    before every call.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples, rows = [], None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        rows = fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(name, samples, rows, **extra)
+
+
+async def ameasure(name: str, fn: Callable[[], Awaitable], requests: int, concurrency: int = 1, warmup: int = 5, **extra) -> dict:
+    """
+    Await `fn` `requests` times from `concurrency` concurrent workers and
+    summarize the per-call latencies, plus the overall calls per second.
+    """
+    import asyncio
+
+    for _ in range(warmup):
+        await fn()
+
+    samples = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await fn()
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    return summarize(name, samples, concurrency=concurrency, requests_per_s=requests / elapsed, **extra)
+
+
+def environment() -> dict:
+    """
+    Where the results come from: commit, interpreter and machine.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine()
+    }
+
+
+def write_results(path: str, params: dict, results: list[dict]):
+    Path(path).write_text(json.dumps(
+        {"environment": environment(), "params": params, "results": results},
+        indent=2
+    ))
+    print(f"\nResults written to {path}")
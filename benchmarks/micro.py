@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from app.services.alpha_vantage import AlphaVantageClient
+from app.services.indicator_registry import PUBLIC_INDICATORS, compute_indicators
+from app.services.price_parser import decode_json, parse_time_series
+from app.services.technical_indicator import compute_talib_indicators
+
+from benchmarks.harness import measure
+from benchmarks.synthetic import PREFIX, to_payload
+
+# Microbenchmarks of the hot paths: payload parsing, indicator computation
+# (pure CPU) and the database-backed calculate_indicators / save_indicators.
+
+
+def bench_parse(universe: dict, repeat: int) -> list[dict]:
+    payloads = [to_payload(symbol, columns) for symbol, columns in universe.items()]
+    client = AlphaVantageClient()
+    size = sum(map(len, payloads))
+
+    def dict_path():
+        return sum(len(client.parse_daily_prices(decode_json(payload))) for payload in payloads)
+
+    def columnar_path():
+        return sum(len(client.parse_daily_prices_columnar(decode_json(payload))) for payload in payloads)
+
+    def columnar_bytes():
+        return sum(len(parse_time_series(payload)) for payload in payloads)
+
+    return [
+        measure("parse_daily_prices", dict_path, repeat, payload_bytes=size),
+        measure("parse_daily_prices_columnar", columnar_path, repeat, payload_bytes=size),
+        measure("parse_time_series (bytes)", columnar_bytes, repeat, payload_bytes=size),
+    ]
+
+
+def bench_compute(universe: dict, repeat: int) -> list[dict]:
+    def core():
+        for columns in universe.values():
+            compute_talib_indicators(columns["close"])
+        return sum(len(columns["close"]) for columns in universe.values())
+
+    def registry():
+        for columns in universe.values():
+            compute_indicators(columns, PUBLIC_INDICATORS)
+        return sum(len(columns["close"]) for columns in universe.values())
+
+    return [
+        measure("compute_indicators (13 columns)", core, repeat),
+        measure(f"compute_indicators ({len(PUBLIC_INDICATORS)} registry)", registry, repeat),
+    ]
+
+
+def bench_calculate(db, symbols: list[str], days: int, repeat: int) -> tuple[list[dict], pd.DataFrame]:
+    """
+    TechnicalIndicatorsService.calculate_indicators (load + compute) for every
+    symbol; also returns the last frames for bench_save.
+    """
+    from app.services.technical_indicator import TechnicalIndicatorsService
+
+    service = TechnicalIndicatorsService(db)
+    frames = []
+
+    def calculate():
+        frames.clear()
+        for symbol in symbols:
+            frames.append(service.calculate_indicators(symbol, days=days))
+        return sum(len(frame) for frame in frames)
+
+    from app.core.price_store import price_store
+
+    # Every load reads Postgres, then the same with histories held in memory
+    enabled = price_store.enabled
+    price_store.enabled = False
+    try:
+        results = [measure(f"calculate_indicators (days={days}, database)", calculate, repeat)]
+    finally:
+        price_store.enabled = enabled
+    if enabled:
+        results.append(measure(f"calculate_indicators (days={days}, price store)", calculate, repeat))
+    return results, pd.concat(frames, ignore_index=True)
+
+
+def bench_save(db, df: pd.DataFrame, repeat: int) -> list[dict]:
+    from sqlalchemy import text
+    from app.crud.technical_indicator import save_indicators
+
+    def clear():
+        db.execute(text(
+            "DELETE FROM technical_indicators WHERE symbol_id IN (SELECT id FROM symbols WHERE symbol LIKE :prefix)"
+        ), {"prefix": f"{PREFIX}%"})
+        db.commit()
+
+    return [
+        measure("save_indicators (insert)", lambda: save_indicators(db, df), repeat, warmup=0, setup=clear),
+        measure("save_indicators (update)", lambda: save_indicators(db, df), repeat, warmup=0),
+    ]
+
+
+def bench_serialize(rows: int, repeat: int) -> list[dict]:
+    """
+    Response serialization of a `rows`-row indicator page: the regular path
+    (ORM objects validated by TechnicalIndicatorResponse with from_attributes,
+    then JSONResponse) against the fast path (plain rows, ORJSONResponse).
+    """
+    from typing import List
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from pydantic import TypeAdapter
+    from app.crud.technical_indicator import INDICATOR_COLUMNS
+    from app.models.technical_indicator import TechnicalIndicator
+    from app.schemas.technical_indicator import TechnicalIndicatorResponse
+
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(end="2025-12-31", periods=rows).date
+    values = rng.normal(100, 5, size=(rows, len(INDICATOR_COLUMNS))).tolist()
+    fields = ['id', 'symbol', 'date'] + INDICATOR_COLUMNS + ['extra']
+    tuples = [(i, f"{PREFIX}0000", day, *row, {}) for i, (day, row) in enumerate(zip(dates, values))]
+    objects = [TechnicalIndicator(**dict(zip(fields, row))) for row in tuples]
+    adapter = TypeAdapter(List[TechnicalIndicatorResponse])
+
+    def response_model():
+        content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode='json')
+        JSONResponse(content)
+        return rows
+
+    def fast_path():
+        ORJSONResponse([dict(zip(fields, row)) for row in tuples])
+        return rows
+
+    def fast_path_projected():
+        ORJSONResponse([{'date': row[2], 'rsi_14': row[8]} for row in tuples])
+        return rows
+
+    return [
+        measure(f"serialize {rows} rows (response model)", response_model, repeat),
+        measure(f"serialize {rows} rows (orjson)", fast_path, repeat),
+        measure(f"serialize {rows} rows (orjson, 2 fields)", fast_path_projected, repeat),
+    ]
@@ -0,0 +1,80 @@
+"""
+Reproducible benchmark suite.
+
+    python -m benchmarks.run --symbols 50 --years 5 --output results.json
+    python -m benchmarks.run --no-db            # parsing and computation only
+
+Generates synthetic OHLCV data (--symbols x --years), then runs:
+  - microbenchmarks of payload parsing, indicator computation and 10k-row
+    response serialization (no database)
+  - calculate_indicators and save_indicators against the configured database
+  - end-to-end route latencies through an in-process ASGI client
+
+Database benchmarks write BENCHxxxx symbols to DATABASE_URL (use a local
+Postgres, not production) and remove them afterwards. Results are written as
+JSON; compare two runs with `python -m benchmarks.compare old.json new.json`.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks import micro
+from benchmarks.harness import write_results
+from benchmarks.synthetic import cleanup, make_universe, seed_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion, indicators and read APIs")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per microbenchmark")
+    parser.add_argument("--days", type=int, default=200, help="days returned by calculate_indicators")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent requests per route")
+    parser.add_argument("--no-db", action="store_true", help="skip the database and route benchmarks")
+    parser.add_argument("--output", default="benchmark-results.json")
+    args = parser.parse_args()
+
+    universe = make_universe(args.symbols, args.years, args.seed)
+    bars = sum(len(columns["date"]) for columns in universe.values())
+    print(f"Synthetic universe: {args.symbols} symbols x {args.years:g} years ({bars} bars)\n")
+
+    results = micro.bench_parse(universe, args.repeat)
+    results += micro.bench_compute(universe, args.repeat)
+    results += micro.bench_serialize(10_000, args.repeat)
+
+    if not args.no_db:
+        from app.core.database import Session, dispose_async_engine
+        from benchmarks.e2e import bench_routes
+
+        symbols = list(universe)
+        db = Session()
+        try:
+            cleanup(db)
+            print(f"\nSeeded {seed_database(db, universe)} price rows\n")
+
+            calculated, df = micro.bench_calculate(db, symbols, args.days, args.repeat)
+            results += calculated
+            results += micro.bench_save(db, df, args.repeat)
+
+            async def routes():
+                try:
+                    return await bench_routes(symbols, args.requests, args.concurrency)
+                finally:
+                    await dispose_async_engine()
+
+            print()
+            results += asyncio.run(routes())
+        finally:
+            cleanup(db)
+            db.close()
+
+    write_results(args.output, vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
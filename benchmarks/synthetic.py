@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.services.price_parser import PriceColumns
+
+# Synthetic market data: reproducible random-walk OHLCV series, named
+# BENCH0000, BENCH0001, ... so benchmark rows can be told apart and removed.
+
+PREFIX = "BENCH"
+BARS_PER_YEAR = 252
+
+
+def symbol_name(i: int) -> str:
+    return f"{PREFIX}{i:04d}"
+
+
+def make_ohlcv(years: float, seed: int, end: str = "2025-12-31") -> dict:
+    """
+    One symbol's daily bars on business days ending at `end`, oldest first,
+    as PriceColumns-style arrays (date: datetime64[D], prices: float64,
+    volume: int64). Every bar satisfies low <= open, close <= high.
+    """
+    rng = np.random.default_rng(seed)
+    bars = int(years * BARS_PER_YEAR)
+    dates = pd.bdate_range(end=end, periods=bars).values.astype("datetime64[D]")
+
+    close = 20 + 80 * rng.random() * np.exp(np.cumsum(rng.normal(0.0003, 0.015, bars)))
+    open_ = np.concatenate(([close[0]], close[:-1])) * (1 + rng.normal(0, 0.003, bars))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.015, bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.015, bars))
+    volume = rng.integers(100_000, 20_000_000, bars, dtype=np.int64)
+
+    return {
+        "date": dates,
+        "open": np.round(open_, 4),
+        "high": np.round(high, 4),
+        "low": np.round(low, 4),
+        "close": np.round(close, 4),
+        "volume": volume
+    }
+
+
+def make_universe(symbols: int, years: float, seed: int = 0) -> dict[str, dict]:
+    """
+    `symbols` synthetic series of `years` years each: symbol -> columns.
+    """
+    return {symbol_name(i): make_ohlcv(years, seed + i) for i in range(symbols)}
+
+
+def to_price_columns(symbol: str, columns: dict) -> PriceColumns:
+    return PriceColumns(symbol, columns, [])
+
+
+def to_payload(symbol: str, columns: dict) -> bytes:
+    """
+    Raw bytes shaped like a TIME_SERIES_DAILY outputsize=full response
+    (newest bar first, every value a string).
+    """
+    series = {
+        str(day): {
+            "1. open": f"{o:.4f}",
+            "2. high": f"{h:.4f}",
+            "3. low": f"{l:.4f}",
+            "4. close": f"{c:.4f}",
+            "5. volume": str(v)
+        }
+        for day, o, h, l, c, v in zip(
+            columns["date"][::-1], columns["open"][::-1], columns["high"][::-1],
+            columns["low"][::-1], columns["close"][::-1], columns["volume"][::-1]
+        )
+    }
+    return json.dumps({
+        "Meta Data": {"2. Symbol": symbol},
+        "Time Series (Daily)": series
+    }).encode()
+
+
+def seed_database(db, universe: dict[str, dict]) -> int:
+    """
+    Write the synthetic prices with the ingestion upsert.
+
+    Returns:
+        Number of rows written
+    """
+    from app.crud.stock import upsert_stock_prices
+
+    written = 0
+    for symbol, columns in universe.items():
+        counts = upsert_stock_prices(db, to_price_columns(symbol, columns).to_records())
+        db.commit()
+        written += counts["inserted"] + counts["updated"]
+    return written
+
+
+def cleanup(db):
+    """
+    Remove every benchmark row (prices, indicators, rollups, snapshot, symbols).
+    """
+    from sqlalchemy import text
+
+    prefix = {"prefix": f"{PREFIX}%"}
+    # Fact tables reference the symbol dimension by id, the others store the ticker
+    for table in ("technical_indicators", "stock_prices", "price_rollups"):
+        db.execute(text(f"DELETE FROM {table} WHERE symbol_id IN (SELECT id FROM symbols WHERE symbol LIKE :prefix)"), prefix)
+    for table in ("latest_indicators", "indicator_states", "symbols"):
+        db.execute(text(f"DELETE FROM {table} WHERE symbol LIKE :prefix"), prefix)
+    db.commit()
@@ -0,0 +1,70 @@
+-- Schema as created by the former scripts/create_tables.py. Existing
+-- databases are adopted as they are (IF NOT EXISTS everywhere).
+
+CREATE TABLE IF NOT EXISTS stock_prices (
+    id SERIAL PRIMARY KEY,
+    symbol VARCHAR(10) NOT NULL,
+    date DATE NOT NULL,
+    open FLOAT NOT NULL,
+    high FLOAT NOT NULL,
+    low FLOAT NOT NULL,
+    close FLOAT NOT NULL,
+    volume INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_stock_prices_id ON stock_prices (id);
+
+-- Databases created before stock_prices had a (symbol, date) key: drop
+-- duplicated bars (keeping the first inserted one) and add the constraint
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uix_stock_prices_symbol_date') THEN
+        DELETE FROM stock_prices a
+        USING stock_prices b
+        WHERE a.symbol = b.symbol
+          AND a.date = b.date
+          AND a.id > b.id;
+        ALTER TABLE stock_prices ADD CONSTRAINT uix_stock_prices_symbol_date UNIQUE (symbol, date);
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS technical_indicators (
+    id SERIAL PRIMARY KEY,
+    symbol VARCHAR(10) NOT NULL,
+    date DATE NOT NULL,
+    sma_20 FLOAT,
+    sma_50 FLOAT,
+    sma_200 FLOAT,
+    ema_12 FLOAT,
+    ema_26 FLOAT,
+    rsi_14 FLOAT,
+    macd FLOAT,
+    macd_signal FLOAT,
+    macd_histogram FLOAT,
+    bb_upper FLOAT,
+    bb_middle FLOAT,
+    bb_lower FLOAT,
+    bb_width FLOAT,
+    CONSTRAINT uix_symbol_date UNIQUE (symbol, date)
+);
+CREATE INDEX IF NOT EXISTS ix_technical_indicators_id ON technical_indicators (id);
+CREATE INDEX IF NOT EXISTS ix_technical_indicators_date ON technical_indicators (date);
+
+CREATE TABLE IF NOT EXISTS indicator_states (
+    symbol VARCHAR(10) PRIMARY KEY,
+    date DATE NOT NULL,
+    state JSON NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    symbol VARCHAR(10) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    stages JSON NOT NULL,
+    result JSON,
+    error TEXT,
+    created_at TIMESTAMP NOT NULL,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_symbol ON jobs (symbol);
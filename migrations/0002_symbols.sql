@@ -0,0 +1,14 @@
+-- Symbol dimension, filled from the symbols already ingested. The fact
+-- tables reference it by id from 0003_partition_by_date on
+CREATE TABLE IF NOT EXISTS symbols (
+    id SERIAL PRIMARY KEY,
+    symbol VARCHAR(10) NOT NULL UNIQUE,
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+INSERT INTO symbols (symbol)
+SELECT symbol FROM stock_prices
+UNION
+SELECT symbol FROM technical_indicators
+ORDER BY symbol
+ON CONFLICT (symbol) DO NOTHING;
@@ -0,0 +1,89 @@
+from datetime import date
+
+from sqlalchemy import text
+
+from app.core.partitions import create_upcoming_partitions, ensure_partitions, is_partitioned
+
+# Rebuild stock_prices and technical_indicators as tables range partitioned
+# by date (PARTITION_INTERVAL). The symbol text becomes a symbol_id key into
+# the symbols dimension (0002_symbols): 4 bytes per row instead of up to 11
+# in the heap and in the (symbol_id, date) unique index. The 4-byte columns
+# come first, then the 8-byte ones (volume is a BIGINT: daily volumes of
+# heavily traded symbols overflow INTEGER over a full history).
+# Rows are copied into the new table, so on a large database run it during
+# a maintenance window.
+
+TABLES = {
+    "stock_prices": """
+        CREATE TABLE stock_prices (
+            id INTEGER NOT NULL DEFAULT nextval('stock_prices_id_seq'),
+            symbol_id INTEGER NOT NULL REFERENCES symbols (id),
+            date DATE NOT NULL,
+            volume BIGINT NOT NULL,
+            open FLOAT NOT NULL,
+            high FLOAT NOT NULL,
+            low FLOAT NOT NULL,
+            close FLOAT NOT NULL,
+            PRIMARY KEY (id, date),
+            CONSTRAINT uix_stock_prices_symbol_date UNIQUE (symbol_id, date)
+        ) PARTITION BY RANGE (date)
+    """,
+    "technical_indicators": """
+        CREATE TABLE technical_indicators (
+            id INTEGER NOT NULL DEFAULT nextval('technical_indicators_id_seq'),
+            symbol_id INTEGER NOT NULL REFERENCES symbols (id),
+            date DATE NOT NULL,
+            sma_20 FLOAT,
+            sma_50 FLOAT,
+            sma_200 FLOAT,
+            ema_12 FLOAT,
+            ema_26 FLOAT,
+            rsi_14 FLOAT,
+            macd FLOAT,
+            macd_signal FLOAT,
+            macd_histogram FLOAT,
+            bb_upper FLOAT,
+            bb_middle FLOAT,
+            bb_lower FLOAT,
+            bb_width FLOAT,
+            PRIMARY KEY (id, date),
+            CONSTRAINT uix_symbol_date UNIQUE (symbol_id, date)
+        ) PARTITION BY RANGE (date);
+        CREATE INDEX ix_technical_indicators_date ON technical_indicators (date)
+    """,
+}
+
+
+def upgrade(connection):
+    for table, ddl in TABLES.items():
+        if is_partitioned(connection, table):
+            continue
+
+        legacy = f"{table}_unpartitioned"
+        connection.execute(text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+        # Index (and constraint) names are unique per schema, free them for the new table
+        indexes = connection.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": legacy})
+        for index in indexes.scalars().all():
+            connection.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index}_unpartitioned"'))
+
+        for statement in ddl.split(";"):
+            if statement.strip():
+                connection.execute(text(statement))
+        # Keep the id sequence when the old table is dropped
+        connection.execute(text(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id"))
+
+        first, last = connection.execute(text(f"SELECT min(date), max(date) FROM {legacy}")).one()
+        today = date.today()
+        ensure_partitions(connection, table, first or today, max(last or today, today))
+
+        columns = [column for column in connection.execute(text(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = :table ORDER BY ordinal_position"
+        ), {"table": legacy}).scalars() if column != "symbol"]
+        connection.execute(text(
+            f"INSERT INTO {table} (symbol_id, {', '.join(columns)}) "
+            f"SELECT symbols.id, {', '.join(f'legacy.{column}' for column in columns)} "
+            f"FROM {legacy} legacy JOIN symbols ON symbols.symbol = legacy.symbol"
+        ))
+        connection.execute(text(f"DROP TABLE {legacy}"))
+
+    create_upcoming_partitions(connection)
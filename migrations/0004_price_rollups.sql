@@ -0,0 +1,29 @@
+-- Weekly / monthly / quarterly bars and their indicators, refreshed by
+-- app.services.rollups whenever daily prices are written
+CREATE TABLE IF NOT EXISTS price_rollups (
+    id SERIAL PRIMARY KEY,
+    symbol_id INTEGER NOT NULL REFERENCES symbols (id),
+    interval VARCHAR(4) NOT NULL,
+    date DATE NOT NULL,
+    period_end DATE NOT NULL,
+    open FLOAT NOT NULL,
+    high FLOAT NOT NULL,
+    low FLOAT NOT NULL,
+    close FLOAT NOT NULL,
+    volume BIGINT NOT NULL,
+    bars INTEGER NOT NULL,
+    sma_20 FLOAT,
+    sma_50 FLOAT,
+    sma_200 FLOAT,
+    ema_12 FLOAT,
+    ema_26 FLOAT,
+    rsi_14 FLOAT,
+    macd FLOAT,
+    macd_signal FLOAT,
+    macd_histogram FLOAT,
+    bb_upper FLOAT,
+    bb_middle FLOAT,
+    bb_lower FLOAT,
+    bb_width FLOAT,
+    CONSTRAINT uix_price_rollups_symbol_interval_date UNIQUE (symbol_id, interval, date)
+);
@@ -0,0 +1,2 @@
+-- Indicators defined in the registry without a dedicated column
+ALTER TABLE technical_indicators ADD COLUMN IF NOT EXISTS extra JSONB NOT NULL DEFAULT '{}'::jsonb;
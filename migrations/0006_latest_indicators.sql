@@ -0,0 +1,38 @@
+-- Latest indicators of every symbol (one row per symbol) for the screener,
+-- kept up to date by save_indicators
+CREATE TABLE IF NOT EXISTS latest_indicators (
+    symbol VARCHAR(10) PRIMARY KEY,
+    date DATE NOT NULL,
+    close FLOAT,
+    volume BIGINT,
+    sma_20 FLOAT,
+    sma_50 FLOAT,
+    sma_200 FLOAT,
+    ema_12 FLOAT,
+    ema_26 FLOAT,
+    rsi_14 FLOAT,
+    macd FLOAT,
+    macd_signal FLOAT,
+    macd_histogram FLOAT,
+    bb_upper FLOAT,
+    bb_middle FLOAT,
+    bb_lower FLOAT,
+    bb_width FLOAT,
+    extra JSONB NOT NULL DEFAULT '{}'::jsonb,
+    updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_latest_indicators_date ON latest_indicators (date);
+
+INSERT INTO latest_indicators (
+    symbol, date, close, volume, sma_20, sma_50, sma_200, ema_12, ema_26, rsi_14,
+    macd, macd_signal, macd_histogram, bb_upper, bb_middle, bb_lower, bb_width, extra
+)
+SELECT DISTINCT ON (s.symbol)
+    s.symbol, ti.date, sp.close, sp.volume, ti.sma_20, ti.sma_50, ti.sma_200, ti.ema_12, ti.ema_26, ti.rsi_14,
+    ti.macd, ti.macd_signal, ti.macd_histogram, ti.bb_upper, ti.bb_middle, ti.bb_lower, ti.bb_width, ti.extra
+FROM technical_indicators ti
+JOIN symbols s ON s.id = ti.symbol_id
+LEFT JOIN stock_prices sp ON sp.symbol_id = ti.symbol_id AND sp.date = ti.date
+ORDER BY s.symbol, ti.date DESC
+ON CONFLICT (symbol) DO NOTHING;
@@ -0,0 +1,4 @@
+-- Process running each job and when it last reported, so a starting
+-- process only fails jobs whose owner stopped
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS owner VARCHAR(64);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP;
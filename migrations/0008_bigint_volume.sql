@@ -0,0 +1,3 @@
+-- Databases partitioned before volume became a BIGINT (see 0003_partition_by_date);
+-- a no-op when the column already is one
+ALTER TABLE stock_prices ALTER COLUMN volume TYPE BIGINT;
@@ -0,0 +1,73 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.alpha_vantage import AlphaVantageClient
+from app.services.ingestion import validate_stock_prices
+from app.services.price_parser import parse_time_series
+
+# Synthetic workload: SYMBOLS full-history payloads of DAYS bars each
+SYMBOLS = 20
+DAYS = 5000
+REPEAT = 3
+
+def make_payload(symbol: str, days: int, seed: int) -> bytes:
+    """
+    Build raw bytes shaped like a TIME_SERIES_DAILY outputsize=full response
+    (newest bar first, every value a string).
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2025-12-31", periods=days)[::-1]
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    high = close * (1 + rng.uniform(0, 0.02, days))
+    low = close * (1 - rng.uniform(0, 0.02, days))
+    volume = rng.integers(100_000, 10_000_000, days)
+
+    series = {
+        day.strftime("%Y-%m-%d"): {
+            "1. open": f"{c:.4f}",
+            "2. high": f"{h:.4f}",
+            "3. low": f"{l:.4f}",
+            "4. close": f"{c:.4f}",
+            "5. volume": str(v)
+        }
+        for day, c, h, l, v in zip(dates, close, high, low, volume)
+    }
+    return json.dumps({
+        "Meta Data": {"2. Symbol": symbol},
+        "Time Series (Daily)": series
+    }).encode()
+
+def dict_path(payload: bytes) -> int:
+    parsed = AlphaVantageClient().parse_daily_prices(json.loads(payload))
+    records, errors = validate_stock_prices(parsed)
+    return len(records)
+
+def columnar_path(payload: bytes) -> int:
+    prices = parse_time_series(payload)
+    return len(prices.to_records())
+
+def columnar_arrays_only(payload: bytes) -> int:
+    return len(parse_time_series(payload))
+
+def run(name, fn, payloads):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        rows = sum(fn(payload) for payload in payloads)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<32} {rows:>8} rows  {best:8.3f}s  {rows / best:12.0f} rows/s")
+
+payloads = [make_payload(f"SYM{i:04d}", DAYS, i) for i in range(SYMBOLS)]
+print(f"Benchmarking payload parsing with {SYMBOLS} symbols x {DAYS} days "
+      f"({sum(map(len, payloads)) / 1e6:.1f} MB, best of {REPEAT})\n")
+
+run("dict + pydantic", dict_path, payloads)
+run("columnar (upsert records)", columnar_path, payloads)
+run("columnar (arrays only)", columnar_arrays_only, payloads)
@@ -0,0 +1,68 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.core.database import Session
+from app.models.symbol import Symbol
+from app.models.technical_indicator import TechnicalIndicator
+from app.crud.technical_indicator import INDICATOR_COLUMNS, save_indicators, save_indicators_rowwise
+
+# Synthetic workload: SYMBOLS x DAYS indicator rows
+SYMBOLS = 20
+DAYS = 200
+PREFIX = "BENCH"
+
+def make_indicators(symbols: int, days: int) -> pd.DataFrame:
+    """
+    Build a DataFrame shaped like TechnicalIndicatorsService output,
+    with random values and NaN warm-up rows like the real indicators.
+    """
+    rng = np.random.default_rng(42)
+    dates = pd.bdate_range(end="2025-12-31", periods=days)
+    frames = []
+
+    for i in range(symbols):
+        df = pd.DataFrame(rng.normal(100, 5, size=(days, len(INDICATOR_COLUMNS))), columns=INDICATOR_COLUMNS)
+        df.loc[:18, ['sma_20', 'rsi_14']] = np.nan
+        df.loc[:198, 'sma_200'] = np.nan
+        df['date'] = dates
+        df['symbol'] = f"{PREFIX}{i:04d}"
+        frames.append(df)
+
+    return pd.concat(frames, ignore_index=True)
+
+def cleanup(db):
+    prefixed = select(Symbol.id).where(Symbol.symbol.like(f"{PREFIX}%"))
+    db.query(TechnicalIndicator).filter(TechnicalIndicator.symbol_id.in_(prefixed)).delete(synchronize_session=False)
+    db.commit()
+
+def run(name, fn, db, df):
+    start = time.perf_counter()
+    saved = fn(db, df)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {saved:>7} rows  {elapsed:8.3f}s  {saved / elapsed:10.0f} rows/s")
+
+db = Session()
+
+try:
+    df = make_indicators(SYMBOLS, DAYS)
+    print(f"Benchmarking save_indicators with {len(df)} rows ({SYMBOLS} symbols x {DAYS} days)\n")
+
+    cleanup(db)
+    run("row-wise (insert)", save_indicators_rowwise, db, df)
+    run("row-wise (update)", save_indicators_rowwise, db, df)
+
+    cleanup(db)
+    run("bulk upsert (insert)", save_indicators, db, df)
+    run("bulk upsert (update)", save_indicators, db, df)
+
+finally:
+    cleanup(db)
+    db.close()
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+# Adjustment needed to import modules from parent subdirectories
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.partitions import create_upcoming_partitions
+
+# Run periodically (e.g. daily from cron): creates the partitions of the
+# current period and the next PARTITION_PREMAKE ones before data reaches them
+with engine.begin() as connection:
+    created = create_upcoming_partitions(connection)
+
+for name in created:
+    print(f"Created {name}")
+print(f"{len(created)} partitions created ({settings.PARTITION_INTERVAL}ly, {settings.PARTITION_PREMAKE} ahead)")
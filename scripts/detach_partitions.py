@@ -0,0 +1,25 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+# Adjustment needed to import modules from parent subdirectories
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import engine
+from app.core.partitions import detach_partitions_before
+
+# Detach the partitions holding only dates before a cutoff:
+#   python scripts/detach_partitions.py 2005-01-01 [--drop]
+# Detached partitions remain as standalone tables unless --drop is given.
+if len(sys.argv) < 2:
+    sys.exit("Usage: detach_partitions.py <cutoff YYYY-MM-DD> [--drop]")
+
+cutoff = date.fromisoformat(sys.argv[1])
+drop = "--drop" in sys.argv[2:]
+
+with engine.begin() as connection:
+    detached = detach_partitions_before(connection, cutoff, drop=drop)
+
+for name in detached:
+    print(f"{'Dropped' if drop else 'Detached'} {name}")
+print(f"{len(detached)} partitions older than {cutoff} {'dropped' if drop else 'detached'}")
@@ -0,0 +1,36 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Adjustment needed to import modules from parent subdirectories
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.ingestion import ingest_many_stock_data
+from app.services.market_data import LocalFileProvider
+
+# Bulk load a directory of CSV/Parquet dumps (one file or directory per symbol):
+#   python scripts/ingest_local.py /data/eod [full|delta|auto]
+root = sys.argv[1] if len(sys.argv) > 1 else settings.MARKET_DATA_DIR
+mode = sys.argv[2] if len(sys.argv) > 2 else "auto"
+if not root:
+    sys.exit("Usage: ingest_local.py <directory> [mode] (or set MARKET_DATA_DIR)")
+
+provider = LocalFileProvider(root, settings.MARKET_DATA_CHUNK_ROWS)
+symbols = provider.symbols()
+print(f"Loading {len(symbols)} symbols from {root} (mode={mode})")
+
+# Bounded batches keep the number of concurrent sessions under the pool size
+BATCH = settings.DATABASE_POOL_SIZE
+start = time.perf_counter()
+saved = errors = 0
+for i in range(0, len(symbols), BATCH):
+    for result in asyncio.run(ingest_many_stock_data(symbols[i:i + BATCH], mode, provider=provider)):
+        if result["status"] == "success":
+            saved += result["saved"]
+        else:
+            errors += 1
+
+elapsed = time.perf_counter() - start
+print(f"\n{saved} rows saved in {elapsed:.1f}s ({saved / elapsed:.0f} rows/s), {errors} symbols failed")
@@ -0,0 +1,12 @@
+import sys
+from pathlib import Path
+
+# Adjustment needed to import modules from parent subdirectories
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import engine
+from app.core.migrations import migrate
+
+# Create or upgrade the database schema (replaces create_tables.py)
+applied = migrate(engine)
+print(f"{len(applied)} migrations applied, schema is up to date!")
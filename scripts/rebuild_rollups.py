@@ -0,0 +1,25 @@
+import sys
+import time
+from pathlib import Path
+
+# Adjustment needed to import modules from parent subdirectories
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.cache import indicator_cache
+from app.core.database import Session
+from app.crud.symbol import list_symbols
+from app.services.rollups import refresh_rollups
+
+# Rebuild every weekly/monthly/quarterly rollup from the daily prices, e.g.
+# after the migration creating price_rollups. Ingestion keeps them up to date.
+#   python scripts/rebuild_rollups.py [SYMBOL ...]
+with Session() as db:
+    symbols = [symbol.upper() for symbol in sys.argv[1:]] or list_symbols(db)
+    start = time.perf_counter()
+    for symbol in symbols:
+        refreshed = refresh_rollups(db, symbol)
+        db.commit()
+        indicator_cache.invalidate(symbol)
+        print(f"{symbol}: " + ", ".join(f"{count} {interval}" for interval, count in refreshed.items()))
+
+print(f"\n{len(symbols)} symbols rebuilt in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,48 @@
+import sys
+import json
+from pathlib import Path
+
+import numpy as np
+import talib
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.rolling_indicator import RollingIndicators
+
+# Compare the incremental state against TA-Lib on a synthetic random walk,
+# serializing the state halfway through like the database round trip does.
+TOLERANCE = 1e-6
+BARS = 1000
+
+rng = np.random.default_rng(7)
+close = 100 * np.cumprod(1 + rng.normal(0, 0.01, BARS))
+
+expected = {
+    'sma_20': talib.SMA(close, timeperiod=20),
+    'sma_50': talib.SMA(close, timeperiod=50),
+    'sma_200': talib.SMA(close, timeperiod=200),
+    'ema_12': talib.EMA(close, timeperiod=12),
+    'ema_26': talib.EMA(close, timeperiod=26),
+    'rsi_14': talib.RSI(close, timeperiod=14),
+}
+expected['macd'], expected['macd_signal'], expected['macd_histogram'] = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
+expected['bb_upper'], expected['bb_middle'], expected['bb_lower'] = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
+expected['bb_width'] = (expected['bb_upper'] - expected['bb_lower']) / expected['bb_middle'] * 100
+
+state = RollingIndicators()
+rows = []
+for i, value in enumerate(close):
+    if i == BARS // 2:
+        state = RollingIndicators.from_dict(json.loads(json.dumps(state.to_dict())))
+    rows.append(state.update(float(value)))
+
+failed = False
+for name, values in expected.items():
+    actual = np.array([row[name] for row in rows])
+    same_nan = np.array_equal(np.isnan(actual), np.isnan(values))
+    max_diff = np.nanmax(np.abs(actual - values))
+    ok = same_nan and max_diff < TOLERANCE
+    failed |= not ok
+    print(f"{name:<16} max diff {max_diff:.2e}  {'OK' if ok else 'MISMATCH'}")
+
+print("\nIncremental indicators match TA-Lib" if not failed else "\nIncremental indicators differ from TA-Lib")
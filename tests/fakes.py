@@ -0,0 +1,52 @@
+import time
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the redis client calls used by RedisBackend
+    (get, set with ex=, incr), values stored as bytes like Redis returns them.
+    """
+
+    def __init__(self):
+        self.store: dict[str, tuple[float, bytes]] = {}
+
+    def get(self, key: str):
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self.store[key]
+            return None
+        return value
+
+    def set(self, key: str, value, ex=None):
+        expires = time.monotonic() + ex if ex is not None else float("inf")
+        self.store[key] = (expires, value if isinstance(value, bytes) else str(value).encode())
+
+    def incr(self, key: str) -> int:
+        value = int(self.get(key) or 0) + 1
+        self.set(key, value)
+        return value
+
+
+class FakeAsyncRedis:
+    """
+    redis.asyncio flavour of FakeRedis, optionally sharing its data.
+    """
+
+    def __init__(self, sync: FakeRedis = None):
+        self.sync = sync or FakeRedis()
+        self.closed = False
+
+    async def get(self, key: str):
+        return self.sync.get(key)
+
+    async def set(self, key: str, value, ex=None):
+        self.sync.set(key, value, ex=ex)
+
+    async def incr(self, key: str) -> int:
+        return self.sync.incr(key)
+
+    async def aclose(self):
+        self.closed = True
@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import alpha_vantage
+from app.services.alpha_vantage import AlphaVantageClient, TokenBucket
+from app.services.market_data import AlphaVantageProvider
+
+
+def test_calls_beyond_the_burst_wait_in_arrival_order():
+    bucket = TokenBucket(rate_per_minute=60)
+    bucket.tokens = 1.0
+
+    waits = [bucket._reserve() for _ in range(3)]
+
+    assert waits[0] == 0
+    assert waits[1] == pytest.approx(1.0, abs=0.05)
+    assert waits[2] == pytest.approx(2.0, abs=0.05)
+
+
+def test_sync_and_async_calls_share_the_daily_limit():
+    bucket = TokenBucket(rate_per_minute=60, daily_limit=2)
+
+    bucket.acquire_blocking()
+    asyncio.run(bucket.acquire())
+
+    with pytest.raises(ValueError, match="daily quota of 2"):
+        bucket.acquire_blocking()
+    with pytest.raises(ValueError, match="daily quota of 2"):
+        asyncio.run(bucket.acquire())
+    assert bucket.day_count == 2
+
+
+def test_provider_clients_share_one_bucket():
+    provider = AlphaVantageProvider()
+    assert provider.client.rate_limiter is provider.async_client.rate_limiter
+
+
+def test_sync_client_raises_on_http_errors(monkeypatch):
+    calls = []
+
+    def get(url, params, timeout):
+        calls.append(timeout)
+        return httpx.Response(503, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(alpha_vantage, "response_cache", None)
+    monkeypatch.setattr(alpha_vantage.httpx, "get", get)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        AlphaVantageClient(TokenBucket(rate_per_minute=60)).get_daily_prices("AAPL")
+    assert calls == [AlphaVantageClient.TIMEOUT]
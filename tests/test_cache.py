@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import MemoryBackend, QueryCache, RedisBackend
+from tests.fakes import FakeAsyncRedis, FakeRedis
+
+
+def _backend(kind: str):
+    if kind == "memory":
+        return MemoryBackend(1024 * 1024)
+    client = FakeRedis()
+    # Without an asyncio client, async reads go through a worker thread
+    return RedisBackend(client, FakeAsyncRedis(client) if kind == "redis-asyncio" else None)
+
+
+@pytest.fixture(params=["memory", "redis", "redis-asyncio"])
+def cache(request):
+    return QueryCache(_backend(request.param), ttl=60)
+
+
+def test_miss_then_hit(cache):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {"date": "2024-01-02", "rsi_14": 55.0}
+
+    assert cache.get_or_load("AAPL", "latest", {}, load) == {"date": "2024-01-02", "rsi_14": 55.0}
+    assert cache.get_or_load("AAPL", "latest", {}, load) == {"date": "2024-01-02", "rsi_14": 55.0}
+    assert len(calls) == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_keys_include_params(cache):
+    cache.get_or_load("AAPL", "range", {"limit": 10}, lambda: [1])
+    assert cache.get_or_load("AAPL", "range", {"limit": 20}, lambda: [2]) == [2]
+
+
+def test_invalidate_only_drops_symbol(cache):
+    cache.get_or_load("AAPL", "latest", {}, lambda: 1)
+    cache.get_or_load("MSFT", "latest", {}, lambda: 1)
+
+    cache.invalidate("AAPL")
+
+    assert cache.get_or_load("AAPL", "latest", {}, lambda: 2) == 2
+    assert cache.get_or_load("MSFT", "latest", {}, lambda: 2) == 1
+
+
+async def _load_async():
+    return [{"date": "2024-01-02"}]
+
+
+def test_async_loader(cache):
+    assert asyncio.run(cache.aget_or_load("AAPL", "range", {}, _load_async)) == [{"date": "2024-01-02"}]
+    assert asyncio.run(cache.aget_or_load("AAPL", "range", {}, _load_async)) == [{"date": "2024-01-02"}]
+    assert cache.stats()["hits"] == 1
+
+
+def test_invalidate_reaches_async_reads(cache):
+    async def read(value):
+        async def load():
+            return value
+        return await cache.aget_or_load("AAPL", "latest", {}, load)
+
+    assert asyncio.run(read(1)) == 1
+    cache.invalidate("AAPL")
+    assert asyncio.run(read(2)) == 2
+    assert asyncio.run(read(3)) == 2
+
+
+def test_aclose_closes_asyncio_client():
+    client = FakeAsyncRedis()
+    cache = QueryCache(RedisBackend(client.sync, client), ttl=60)
+    asyncio.run(cache.aclose())
+    assert client.closed
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_bytes=10)
+    backend.set("a", b"1234", ttl=60)
+    backend.set("b", b"1234", ttl=60)
+    backend.get("a")
+    backend.set("c", b"1234", ttl=60)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1234"
+    assert backend.evictions == 1
+    assert backend.size == 8
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryBackend(max_bytes=1024)
+    backend.set("a", b"1", ttl=-1)
+    assert backend.get("a") is None
+    assert backend.size == 0
+
+
+def test_disabled_cache_always_loads():
+    cache = QueryCache(MemoryBackend(1024), ttl=60, enabled=False)
+    assert cache.get_or_load("AAPL", "latest", {}, lambda: 1) == 1
+    assert cache.get_or_load("AAPL", "latest", {}, lambda: 2) == 2
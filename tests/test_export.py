@@ -0,0 +1,49 @@
+import json
+from datetime import date
+
+import pytest
+
+from app.crud.technical_indicator import EXTRA_INDICATORS, INDICATOR_COLUMNS
+from app.services.export import EXPORT_COLUMNS, _arrow_chunks, _csv_chunks, _export_row, _ndjson_chunks
+
+
+def row(extra):
+    return ("AAPL", date(2024, 1, 2), *[1.5] * len(INDICATOR_COLUMNS), extra)
+
+
+def test_extra_indicators_are_exported_as_columns():
+    assert "obv" in EXTRA_INDICATORS
+    assert EXPORT_COLUMNS[-len(EXTRA_INDICATORS):] == EXTRA_INDICATORS
+
+    values = dict(zip(EXPORT_COLUMNS, _export_row(row({"obv": 1200.0}))))
+
+    assert values["obv"] == 1200.0
+    assert values["rsi_14"] == 1.5
+    assert dict(zip(EXPORT_COLUMNS, _export_row(row(None))))["obv"] is None
+
+
+def test_ndjson_lines():
+    chunks = [[_export_row(row({"obv": 1200.0})), _export_row(row({}))]]
+
+    lines = b"".join(_ndjson_chunks(iter(chunks))).decode().splitlines()
+
+    assert [json.loads(line)["obv"] for line in lines] == [1200.0, None]
+    assert json.loads(lines[0])["date"] == "2024-01-02"
+
+
+def test_csv_header_matches_rows():
+    text = b"".join(_csv_chunks(iter([[_export_row(row({"obv": 1200.0}))]]))).decode()
+    header, line = text.splitlines()
+
+    assert header.split(",") == EXPORT_COLUMNS
+    assert line.split(",")[EXPORT_COLUMNS.index("obv")] == "1200.0"
+
+
+def test_arrow_schema_has_every_column():
+    pa = pytest.importorskip("pyarrow")
+
+    data = b"".join(_arrow_chunks(iter([[_export_row(row({"obv": 1200.0}))]])))
+    table = pa.ipc.open_stream(data).read_all()
+
+    assert table.column_names == EXPORT_COLUMNS
+    assert table.column("obv").to_pylist() == [1200.0]
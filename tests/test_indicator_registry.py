@@ -0,0 +1,36 @@
+import numpy as np
+
+from app.services.indicator_registry import (
+    DEFAULT_INDICATORS, PUBLIC_INDICATORS, compute_indicators, history_needed, required_inputs, resolve
+)
+
+
+def test_default_set_reads_a_bounded_window():
+    assert "obv" in PUBLIC_INDICATORS
+    assert "obv" not in DEFAULT_INDICATORS
+    assert history_needed(DEFAULT_INDICATORS) == 199
+
+
+def test_full_history_indicators_when_requested():
+    assert history_needed(["obv"]) is None
+    assert history_needed(["rsi_14", "obv"]) is None
+    assert required_inputs(["obv"]) == ["close", "volume"]
+
+
+def test_shared_intermediates_are_resolved_once():
+    order = resolve(["bb_width", "bb_upper", "sma_20"])
+    assert order.count("sma_20") == 1
+    assert order.index("sma_20") < order.index("bb_upper") < order.index("bb_width")
+
+
+def test_subset_matches_the_full_computation():
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, 300))
+    inputs = {"close": close, "high": close + 1, "low": close - 1, "volume": rng.integers(1, 1000, 300).astype(float)}
+
+    everything = compute_indicators(inputs, PUBLIC_INDICATORS)
+    subset = compute_indicators(inputs, ["bb_lower", "obv"])
+
+    assert list(subset) == ["bb_lower", "obv"]
+    for name, values in subset.items():
+        np.testing.assert_array_equal(values, everything[name])
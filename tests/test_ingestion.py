@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+from app.services import ingestion
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+class FakePrices:
+    errors = []
+    total = 2
+
+    def to_records(self):
+        return [{"symbol": "AAPL", "date": date(2024, 1, 2)}, {"symbol": "AAPL", "date": date(2024, 1, 3)}]
+
+    def columns(self):
+        return {}
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    written = []
+    counts = {"inserted": 1, "updated": 0, "unchanged": 1, "changed_from": date(2024, 1, 3)}
+    monkeypatch.setattr(ingestion, "upsert_stock_prices", lambda db, records: dict(counts))
+    monkeypatch.setattr(ingestion.price_store, "write_through", lambda symbol, columns: written.append(symbol))
+    return written
+
+
+def test_prices_and_rollups_commit_together(monkeypatch, writes):
+    refreshed = []
+    monkeypatch.setattr(ingestion, "refresh_rollups", lambda db, symbol, since: refreshed.append((symbol, since, db.commits)))
+    db = FakeSession()
+
+    result = ingestion.persist_stock_data(db, "AAPL", FakePrices())
+
+    assert refreshed == [("AAPL", date(2024, 1, 3), 0)]
+    assert db.commits == 1
+    assert writes == ["AAPL"]
+    assert result["saved"] == 1
+
+
+def test_failed_rollup_refresh_leaves_prices_uncommitted(monkeypatch, writes):
+    def fail(db, symbol, since):
+        raise RuntimeError("rollups failed")
+
+    monkeypatch.setattr(ingestion, "refresh_rollups", fail)
+    db = FakeSession()
+
+    with pytest.raises(RuntimeError):
+        ingestion.persist_stock_data(db, "AAPL", FakePrices())
+
+    # Rolled back with the session: a retry sees the same changed rows
+    assert db.commits == 0
+    assert writes == []
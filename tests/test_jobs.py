@@ -0,0 +1,133 @@
+import threading
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+
+from app.services import jobs
+from app.services.jobs import INTERRUPTED_ERROR, UNIVERSE, InMemoryJobStore, JobRunner, recompute_all_pipeline
+
+
+def _runner(store=None, max_retries=1):
+    return JobRunner(store or InMemoryJobStore(), workers=1, max_retries=max_retries, retry_delay=0)
+
+
+def _wait(runner, job):
+    runner._executor.shutdown(wait=True)
+    return runner.get(job['id'])
+
+
+def test_pipeline_runs_stages_in_order():
+    runner = _runner()
+
+    def first(context):
+        context['result']['first'] = 1
+
+    def second(context):
+        context['result']['second'] = context['result']['first'] + 1
+
+    job = runner.submit("test", "AAPL", [('first', first), ('second', second)])
+    assert job['status'] == 'queued'
+
+    job = _wait(runner, job)
+    assert job['status'] == 'succeeded'
+    assert job['result'] == {'first': 1, 'second': 2}
+    assert [info['status'] for info in job['stages'].values()] == ['succeeded', 'succeeded']
+
+
+def test_stage_is_retried_then_fails():
+    runner = _runner(max_retries=2)
+    calls = []
+
+    def flaky(context):
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    def never(context):
+        raise AssertionError("later stages must not run")
+
+    job = _wait(runner, runner.submit("test", "AAPL", [('flaky', flaky), ('never', never)]))
+    assert len(calls) == 3
+    assert job['status'] == 'failed'
+    assert job['stages']['flaky'] == {**job['stages']['flaky'], 'status': 'failed', 'attempts': 3, 'error': 'boom'}
+    assert job['stages']['never']['status'] == 'pending'
+
+
+def test_store_failure_marks_job_failed():
+    class FailingStore(InMemoryJobStore):
+        saves = 0
+
+        def save(self, job):
+            self.saves += 1
+            # Fail while recording the stage, the final save goes through
+            if job['status'] == 'running' and self.saves == 2:
+                raise RuntimeError("store down")
+            super().save(job)
+
+    runner = _runner(FailingStore())
+    job = _wait(runner, runner.submit("test", "AAPL", [('stage', lambda context: None)]))
+    assert job['status'] == 'failed'
+    assert "store down" in job['error']
+    assert job['finished_at'] is not None
+
+
+def test_recover_fails_only_jobs_without_a_recent_heartbeat():
+    store = InMemoryJobStore()
+    done = _runner(store)
+    finished = _wait(done, done.submit("test", "AAPL", [('stage', lambda context: None)]))
+
+    running = dict(finished, status='running', finished_at=None,
+                   stages={'stage': {'status': 'running', 'attempts': 1, 'seconds': None, 'error': None}})
+    # Owner stopped two minutes ago / owner still alive (another process)
+    store.create(dict(running, id='stuck', heartbeat_at=jobs._now() - timedelta(minutes=2)))
+    store.create(dict(running, id='alive', owner='other-process', heartbeat_at=jobs._now()))
+
+    assert _runner(store).recover() == 1
+    stuck = store.get('stuck')
+    assert stuck['status'] == 'failed'
+    assert stuck['error'] == INTERRUPTED_ERROR
+    assert stuck['stages']['stage']['status'] == 'failed'
+    assert store.get('alive')['status'] == 'running'
+    assert store.get(finished['id'])['status'] == 'succeeded'
+
+
+def test_heartbeat_keeps_long_jobs_alive():
+    store = InMemoryJobStore()
+    runner = JobRunner(store, workers=1, max_retries=0, retry_delay=0, heartbeat_interval=0.01, stale_after=0.05)
+    release = threading.Event()
+
+    job = runner.submit("test", "AAPL", [('slow', lambda context: release.wait(5))])
+    time.sleep(0.2)
+
+    # Silent for longer than stale_after, but its owner keeps beating
+    assert JobRunner(store, workers=1, max_retries=0, retry_delay=0, stale_after=0.05).recover() == 0
+    assert store.get(job['id'])['owner'] == runner.owner
+    release.set()
+    runner.shutdown()
+
+
+def test_recompute_all_commits_chunks_and_resumes_after_a_failure(monkeypatch):
+    chunks = []
+
+    class Service:
+        def __init__(self, db):
+            pass
+
+        def recompute_universe(self, symbols, days):
+            if symbols == ["C", "D"] and ["C", "D"] not in chunks:
+                chunks.append(symbols)
+                raise RuntimeError("database down")
+            chunks.append(symbols)
+            return {"symbols": len(symbols), "bars": 10 * len(symbols), "saved": 10 * len(symbols), "timings": {"load": 0.5}}
+
+    monkeypatch.setattr(jobs, "Session", nullcontext)
+    monkeypatch.setattr(jobs, "list_symbols", lambda db: ["A", "B", "C", "D", "E"])
+    monkeypatch.setattr(jobs, "TechnicalIndicatorsService", Service)
+    runner = _runner()
+
+    job = _wait(runner, runner.submit("recompute-all", UNIVERSE, recompute_all_pipeline(chunk_size=2)))
+
+    assert job['status'] == 'succeeded'
+    assert chunks == [["A", "B"], ["C", "D"], ["C", "D"], ["E"]]
+    assert job['result'] == {
+        'engine': 'panel', 'symbols': 5, 'bars': 50, 'saved': 50, 'chunks': 3, 'timings': {'load': 1.5}
+    }
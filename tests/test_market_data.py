@@ -0,0 +1,44 @@
+import pytest
+
+from app.services.market_data import LocalFileProvider, MarketDataProvider
+
+CSV = "Date,Open,High,Low,Close,Volume\n2024-01-02,10,11,9,10.5,1000\n2024-01-03,10.5,12,10,11.5,1200\n"
+
+
+@pytest.fixture
+def provider(tmp_path):
+    (tmp_path / "BRK.B.csv").write_text(CSV)
+    (tmp_path / "aapl.csv").write_text(CSV)
+    (tmp_path / "notes.txt").write_text("not market data")
+    (tmp_path / "msft").mkdir()
+    (tmp_path / "msft" / "2024.csv").write_text(CSV)
+    return LocalFileProvider(str(tmp_path))
+
+
+def test_symbols_keep_dots_and_ignore_other_files(provider):
+    assert provider.symbols() == ["AAPL", "BRK.B", "MSFT"]
+
+
+@pytest.mark.parametrize("symbol", ["AAPL", "aapl", "brk.b", "MSFT"])
+def test_files_are_found_whatever_their_case(provider, symbol):
+    prices = provider.fetch_daily(symbol)
+    assert prices.symbol == symbol.upper()
+    assert prices.close.tolist() == [10.5, 11.5]
+    assert prices.volume.tolist() == [1000, 1200]
+    assert prices.errors == []
+
+
+def test_unknown_symbol(provider):
+    with pytest.raises(ValueError, match="No local data"):
+        provider.fetch_daily("GOOG")
+
+
+@pytest.mark.parametrize("symbol", ["../x", "..", "msft/2024"])
+def test_symbols_cannot_escape_the_root(provider, symbol):
+    with pytest.raises(ValueError, match="Invalid symbol"):
+        provider.fetch_daily(symbol)
+
+
+def test_provider_base_is_abstract():
+    with pytest.raises(TypeError):
+        MarketDataProvider()
@@ -0,0 +1,86 @@
+from datetime import date
+
+import pytest
+
+from app.core import partitions
+from app.core.partitions import ensure_partitions, list_partitions, next_period, partition_name, period_start
+
+
+class FakeConnection:
+    """
+    Answers the pg_inherits query of list_partitions with `bounds`
+    (partition name -> (from, to)) and records the other statements.
+    """
+
+    def __init__(self, bounds: dict[str, tuple[str, str]]):
+        self.bounds = bounds
+        self.statements: list[str] = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "pg_inherits" in sql:
+            rows = [(name, f"FOR VALUES FROM ('{low}') TO ('{high}')") for name, (low, high) in self.bounds.items()]
+            return type("Result", (), {"all": lambda self: rows})()
+        self.statements.append(" ".join(sql.split()))
+
+
+@pytest.fixture(autouse=True)
+def forget_partitions(monkeypatch):
+    monkeypatch.setattr(partitions, "_covered", set())
+
+
+@pytest.mark.parametrize("interval, day, start", [
+    ("year", date(2024, 7, 15), date(2024, 1, 1)),
+    ("month", date(2024, 7, 15), date(2024, 7, 1)),
+    ("month", date(2024, 12, 31), date(2024, 12, 1)),
+])
+def test_period_start(interval, day, start):
+    assert period_start(day, interval) == start
+
+
+@pytest.mark.parametrize("interval, start, following", [
+    ("year", date(2024, 1, 1), date(2025, 1, 1)),
+    ("month", date(2024, 7, 1), date(2024, 8, 1)),
+    ("month", date(2024, 12, 1), date(2025, 1, 1)),
+])
+def test_next_period(interval, start, following):
+    assert next_period(start, interval) == following
+
+
+def test_partition_names():
+    assert partition_name("stock_prices", date(2024, 1, 1), "year") == "stock_prices_y2024"
+    assert partition_name("stock_prices", date(2024, 3, 1), "month") == "stock_prices_m2024_03"
+
+
+def test_list_partitions_parses_bounds_oldest_first():
+    connection = FakeConnection({
+        "stock_prices_y2025": ("2025-01-01", "2026-01-01"),
+        "stock_prices_y2024": ("2024-01-01", "2025-01-01"),
+    })
+    assert list_partitions(connection, "stock_prices") == [
+        ("stock_prices_y2024", date(2024, 1, 1), date(2025, 1, 1)),
+        ("stock_prices_y2025", date(2025, 1, 1), date(2026, 1, 1)),
+    ]
+
+
+def test_ensure_partitions_only_creates_missing_ones():
+    connection = FakeConnection({"stock_prices_m2024_02": ("2024-02-01", "2024-03-01")})
+
+    created = ensure_partitions(connection, "stock_prices", date(2024, 1, 31), date(2024, 3, 1), "month")
+
+    assert created == ["stock_prices_m2024_01", "stock_prices_m2024_03"]
+    assert connection.statements == [
+        "CREATE TABLE IF NOT EXISTS stock_prices_m2024_01 PARTITION OF stock_prices "
+        "FOR VALUES FROM ('2024-01-01') TO ('2024-02-01')",
+        "CREATE TABLE IF NOT EXISTS stock_prices_m2024_03 PARTITION OF stock_prices "
+        "FOR VALUES FROM ('2024-03-01') TO ('2024-04-01')",
+    ]
+
+
+def test_ensure_partitions_remembers_committed_partitions():
+    connection = FakeConnection({"stock_prices_y2024": ("2024-01-01", "2025-01-01")})
+    ensure_partitions(connection, "stock_prices", date(2024, 5, 1), date(2024, 6, 1), "year")
+
+    # Known to exist: no catalog query, no DDL
+    connection.execute = None
+    assert ensure_partitions(connection, "stock_prices", date(2024, 8, 1), date(2024, 9, 1), "year") == []
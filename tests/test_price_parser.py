@@ -0,0 +1,79 @@
+import json
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.services.price_parser import parse_time_series
+
+
+def bar(open_="10", high="11", low="9", close="10.5", volume="1000") -> dict:
+    return {"1. open": open_, "2. high": high, "3. low": low, "4. close": close, "5. volume": volume}
+
+
+def payload(series: dict, symbol: str = "AAPL") -> dict:
+    return {"Meta Data": {"2. Symbol": symbol}, "Time Series (Daily)": series}
+
+
+def test_valid_bars_in_date_order():
+    data = payload({"2024-01-03": bar(close="12"), "2024-01-02": bar()})
+
+    for raw in (data, json.dumps(data), json.dumps(data).encode()):
+        prices = parse_time_series(raw)
+        assert prices.symbol == "AAPL"
+        assert prices.date.tolist() == [date(2024, 1, 2), date(2024, 1, 3)]
+        assert prices.close.tolist() == [10.5, 12.0]
+        assert prices.volume.dtype == np.int64
+        assert prices.errors == []
+        assert prices.total == 2
+
+
+@pytest.mark.parametrize("row, message", [
+    (bar(open_="0"), "open: must be a positive number"),
+    (bar(close="abc"), "close: must be a positive number"),
+    (bar(volume="10.5"), "volume: must be a positive integer"),
+    (bar(high="8"), "high: lower than low"),
+    ({"1. open": "10"}, "high: must be a positive number"),
+])
+def test_invalid_rows_are_reported(row, message):
+    prices = parse_time_series(payload({"2024-01-02": bar(), "2024-01-03": row}))
+
+    assert len(prices) == 1
+    assert prices.total == 2
+    assert prices.errors[0]["row"]["date"] == "2024-01-03"
+    assert prices.errors[0]["error"] == message
+
+
+def test_invalid_dates_are_reported():
+    prices = parse_time_series(payload({"2024-13-01": bar(), "2024-01-02": bar()}))
+
+    assert prices.date.tolist() == [date(2024, 1, 2)]
+    assert prices.errors[0]["error"] == "date: not a valid date"
+
+
+def test_missing_symbol_rejects_every_row():
+    prices = parse_time_series(payload({"2024-01-02": bar()}, symbol=None))
+
+    assert len(prices) == 0
+    assert prices.errors[0]["error"].startswith("symbol:")
+
+
+def test_empty_payload():
+    prices = parse_time_series({})
+
+    assert len(prices) == 0
+    assert prices.to_records() == []
+
+
+def test_after_keeps_newer_bars_and_errors():
+    prices = parse_time_series(payload({
+        "2024-01-02": bar(), "2024-01-03": bar(), "2024-01-04": bar(), "2024-01-05": bar(low="20"),
+    }))
+
+    newer = prices.after(date(2024, 1, 3))
+
+    assert newer.date.tolist() == [date(2024, 1, 4)]
+    assert [error["row"]["date"] for error in newer.errors] == ["2024-01-05"]
+    assert newer.to_records() == [
+        {"symbol": "AAPL", "date": date(2024, 1, 4), "open": 10.0, "high": 11.0, "low": 9.0, "close": 10.5, "volume": 1000}
+    ]
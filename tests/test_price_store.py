@@ -0,0 +1,132 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.core.price_store import PriceStore, SymbolSeries
+
+
+def bars(start: str, count: int, close: float = 10.0) -> dict:
+    dates = np.arange(np.datetime64(start, "D"), np.datetime64(start, "D") + count)
+    prices = np.full(count, close) + np.arange(count)
+    return {"date": dates, "open": prices, "high": prices + 1, "low": prices - 1, "close": prices,
+            "volume": np.arange(count, dtype=np.int64) * 100}
+
+
+class Loader:
+    def __init__(self, columns: dict):
+        self.columns = columns
+        self.calls = []
+
+    def __call__(self, start_date, last_n):
+        self.calls.append((start_date, last_n))
+        return self.columns
+
+
+@pytest.fixture
+def store():
+    return PriceStore(max_bytes=10_000_000, ttl=3600)
+
+
+def test_append_and_corrections():
+    series = SymbolSeries(4, np.float64)
+    series.merge(bars("2024-01-01", 3))
+    series.merge(bars("2024-01-04", 2, close=20.0))
+    assert series.length == 5
+
+    correction = bars("2024-01-02", 1, close=99.0)
+    series.merge(correction)
+    selected = series.select()
+    assert series.length == 5
+    assert selected["close"].tolist() == [10.0, 99.0, 12.0, 20.0, 21.0]
+    assert selected["date"][0] == np.datetime64("2024-01-01")
+
+
+def test_select_window():
+    series = SymbolSeries(8, np.float32)
+    series.merge(bars("2024-01-01", 10))
+
+    assert series.select(start_date=date(2024, 1, 8))["close"].tolist() == [17.0, 18.0, 19.0]
+    assert series.select(last_n=2)["close"].tolist() == [18.0, 19.0]
+    assert series.select(start_date=date(2024, 1, 3), last_n=2)["close"].dtype == np.float64
+
+
+def test_miss_loads_the_whole_history_once(store):
+    loader = Loader(bars("2024-01-01", 10))
+
+    first = store.get_or_load("AAPL", loader, last_n=3)
+    second = store.get_or_load("AAPL", loader, start_date=date(2024, 1, 9))
+
+    assert loader.calls == [(None, None)]
+    assert first["close"].tolist() == [17.0, 18.0, 19.0]
+    assert second["close"].tolist() == [18.0, 19.0]
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_empty_history_is_not_kept(store):
+    loader = Loader(bars("2024-01-01", 0))
+
+    assert len(store.get_or_load("NONE", loader)["date"]) == 0
+    store.write_through("NONE", bars("2024-01-05", 1))
+    store.get_or_load("NONE", loader)
+
+    assert len(loader.calls) == 2
+    assert store.stats()["symbols"] == 0
+
+
+def test_write_through_updates_held_symbols(store):
+    store.get_or_load("AAPL", Loader(bars("2024-01-01", 3)))
+    store.write_through("AAPL", bars("2024-01-04", 1, close=50.0))
+
+    assert store.get_or_load("AAPL", Loader({}), last_n=1)["close"].tolist() == [50.0]
+
+
+def test_history_loaded_during_a_write_is_not_kept(store):
+    def loader(start_date, last_n):
+        store.write_through("AAPL", bars("2024-01-04", 1))
+        return bars("2024-01-01", 3)
+
+    store.get_or_load("AAPL", loader)
+
+    assert store.stats()["symbols"] == 0
+    assert store._loading == {} and store._writes == {}
+
+
+def test_writes_are_only_tracked_during_loads(store):
+    for i in range(100):
+        store.write_through(f"S{i}", bars("2024-01-01", 1))
+        store.invalidate(f"S{i}")
+
+    assert store._writes == {}
+
+
+def test_failed_load_releases_its_bookkeeping(store):
+    def loader(start_date, last_n):
+        raise RuntimeError("database down")
+
+    with pytest.raises(RuntimeError):
+        store.get_or_load("AAPL", loader)
+    assert store._loading == {}
+
+
+def test_least_recently_used_symbols_are_evicted():
+    one = SymbolSeries(256, np.float64).nbytes
+    store = PriceStore(max_bytes=2 * one, ttl=3600)
+    for symbol in ("A", "B"):
+        store.get_or_load(symbol, Loader(bars("2024-01-01", 10)))
+    store.get_or_load("A", Loader({}))
+    store.get_or_load("C", Loader(bars("2024-01-01", 10)))
+
+    assert list(store._series) == ["A", "C"]
+    assert store.evictions == 1
+    assert store.size == 2 * one
+
+
+def test_disabled_store_loads_the_requested_rows():
+    store = PriceStore(max_bytes=10_000_000, ttl=3600, enabled=False)
+    loader = Loader(bars("2024-01-01", 3))
+
+    store.get_or_load("AAPL", loader, last_n=2)
+
+    assert loader.calls == [(None, 2)]
+    assert store.stats()["symbols"] == 0
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.crud.projection import field_columns, parse_fields
+from app.crud.stock import _stock_prices_query
+from app.models.rollup import PriceRollup
+from app.models.stock import StockPrice
+from app.models.technical_indicator import TechnicalIndicator
+
+
+@pytest.mark.parametrize("model", [StockPrice, TechnicalIndicator, PriceRollup])
+def test_symbol_replaces_symbol_id(model):
+    fields = parse_fields(["*"], model)
+    assert fields[:2] == ["id", "symbol"]
+    assert "date" in fields
+    assert "symbol_id" not in fields
+
+
+def test_fields_keep_request_order_without_duplicates():
+    assert parse_fields(["close,date", "close"], StockPrice) == ["close", "date"]
+    assert parse_fields(None, StockPrice) is None
+
+
+def test_unknown_fields():
+    with pytest.raises(ValueError, match="symbol_id"):
+        parse_fields(["date,symbol_id"], StockPrice)
+
+
+def test_projected_symbol_is_read_from_the_dimension():
+    columns = field_columns(StockPrice)
+    query = _stock_prices_query("AAPL").with_only_columns(columns["symbol"], columns["date"])
+    sql = " ".join(str(query.compile(dialect=postgresql.dialect())).split())
+
+    assert "WHERE symbols.id = stock_prices.symbol_id" in sql
+    assert "stock_prices.symbol_id = (SELECT symbols.id FROM symbols WHERE symbols.symbol = " in sql
+    assert sql.index("ORDER BY stock_prices.symbol_id, stock_prices.date") > 0
+
+
+def test_fact_tables_are_keyed_by_symbol_id():
+    for model in (StockPrice, TechnicalIndicator, PriceRollup):
+        unique = next(c for c in model.__table__.constraints if c.name and c.name.startswith("uix_"))
+        assert [column.name for column in unique.columns][0] == "symbol_id"
+        assert [fk.target_fullname for fk in model.__table__.c.symbol_id.foreign_keys] == ["symbols.id"]
+    assert "symbol" not in select(StockPrice.__table__).selected_columns
@@ -0,0 +1,33 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.stock import StockIngestRequest
+from app.services.response_cache import RawResponseCache
+
+
+def test_put_then_get(tmp_path):
+    cache = RawResponseCache(str(tmp_path))
+    cache.put("TIME_SERIES_DAILY", "brk.b", "full", date(2024, 1, 2), b'{"ok": true}')
+
+    assert cache.get("TIME_SERIES_DAILY", "BRK.B", "full", date(2024, 1, 2)) == b'{"ok": true}'
+    assert cache.get("TIME_SERIES_DAILY", "BRK.B", "full", date(2024, 1, 3)) is None
+    assert cache.get_latest("TIME_SERIES_DAILY", "BRK.B", "full") == b'{"ok": true}'
+    assert (tmp_path / "TIME_SERIES_DAILY" / "full" / "BRK.B" / "2024-01-02.json.gz").exists()
+
+
+@pytest.mark.parametrize("symbol", ["../../x", "..", "AAPL/..", "", "A" * 11])
+def test_symbols_cannot_escape_the_root(tmp_path, symbol):
+    cache = RawResponseCache(str(tmp_path / "cache"))
+    with pytest.raises(ValueError):
+        cache.put("TIME_SERIES_DAILY", symbol, "full", date(2024, 1, 2), b"{}")
+    with pytest.raises(ValueError):
+        cache.get_latest("TIME_SERIES_DAILY", symbol, "full")
+    assert not (tmp_path / "x").exists()
+
+
+def test_ingest_request_rejects_invalid_symbols():
+    assert StockIngestRequest(symbols=["aapl", "BRK.B", "BF-B"]).symbols == ["aapl", "BRK.B", "BF-B"]
+    with pytest.raises(ValidationError):
+        StockIngestRequest(symbols=["AAPL", "../../x"])
@@ -0,0 +1,18 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.stock import is_valid_symbol
+from app.schemas.technical_indicator import IndicatorBatchRequest
+
+
+def test_batch_symbols_are_validated():
+    assert IndicatorBatchRequest(symbols=["aapl", "BRK.B"]).symbols == ["aapl", "BRK.B"]
+    with pytest.raises(ValidationError):
+        IndicatorBatchRequest(symbols=["../x"])
+
+
+@pytest.mark.parametrize("symbol", ["AAPL\n", "AAPL\nX", "", ".A", "A" * 11])
+def test_invalid_symbols(symbol):
+    assert not is_valid_symbol(symbol)
+    with pytest.raises(ValidationError):
+        IndicatorBatchRequest(symbols=[symbol])
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.crud.screener import _screener_query
+from app.services.screener import ScreenerFilter, parse_filter, parse_filters, parse_sort
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("rsi_14 < 30", ScreenerFilter("rsi_14", "<", 30.0)),
+    ("RSI_14<=30.5", ScreenerFilter("rsi_14", "<=", 30.5)),
+    ("close > sma_200", ScreenerFilter("close", ">", "sma_200")),
+    ("volume >= 1e6", ScreenerFilter("volume", ">=", 1e6)),
+    ("macd != 0", ScreenerFilter("macd", "!=", 0.0)),
+    ("obv > -5", ScreenerFilter("obv", ">", -5.0)),
+])
+def test_parse_filter(expression, expected):
+    assert parse_filter(expression) == expected
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("rsi_14 30", "Invalid filter"),
+    ("rsi_14 << 30", "Invalid filter"),
+    ("price > 30", "Unknown field 'price'"),
+    ("close > sma_7", "Unknown field 'sma_7'"),
+    ("symbol = 1", "Unknown field 'symbol'"),
+])
+def test_invalid_filters(expression, message):
+    with pytest.raises(ValueError, match=message):
+        parse_filter(expression)
+
+
+def test_parse_filters_without_expressions():
+    assert parse_filters(None) == []
+
+
+@pytest.mark.parametrize("sort, expected", [
+    (None, ("symbol", False)),
+    ("rsi_14", ("rsi_14", False)),
+    ("-RSI_14", ("rsi_14", True)),
+    ("+close", ("close", False)),
+])
+def test_parse_sort(sort, expected):
+    assert parse_sort(sort) == expected
+
+
+def test_unknown_sort_field():
+    with pytest.raises(ValueError, match="Unknown sort field"):
+        parse_sort("-price")
+
+
+def test_extra_indicators_are_read_from_jsonb():
+    query = _screener_query([parse_filter("obv > close")], "obv", True, 10, None)
+    sql = " ".join(str(query.compile(dialect=postgresql.dialect())).split())
+
+    assert "CAST((latest_indicators.extra ->> %(extra_1)s) AS FLOAT) > latest_indicators.close" in sql
+    assert "ORDER BY CAST(latest_indicators.extra ->> %(extra_2)s AS FLOAT) DESC NULLS LAST, latest_indicators.symbol" in sql